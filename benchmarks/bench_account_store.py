@@ -0,0 +1,91 @@
+"""Benchmark for the JSON and SQLite account stores.
+
+Adds N accounts, updates each account's quota once and lists all
+accounts with metadata, timing each phase per backend. Passwords go to
+keyring's null backend so only the metadata store is measured.
+
+Write-through JSON rewrites (and fsyncs) the whole file per change, so
+it is O(N^2) overall and only run up to WRITE_THROUGH_MAX accounts.
+SQLite only beats write-through JSON: write-behind JSON (the default)
+is faster in every phase, e.g. at 1000 accounts add 0.014 s vs 0.048 s
+and list x10 0.002 s vs 0.038 s. SQLite is chosen for durability, as
+it commits each change instead of coalescing them.
+
+Run with: python benchmarks/bench_account_store.py [N]   (default 10000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import keyring
+from keyring.backends import null
+
+from config import CONFIG_FILENAME
+from credentials import CredentialManager, SQLiteCredentialManager
+
+# 2000 accounts already take ~30 s with write-through
+WRITE_THROUGH_MAX = 1000
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(factory, count: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / CONFIG_FILENAME
+        CredentialManager._get_config_path = lambda self: config_path
+        manager = factory()
+        users = [f"user{i:05d}" for i in range(count)]
+
+        def add():
+            for user in users:
+                manager.add_account(user, "pw")
+            manager.flush()
+
+        def update():
+            for user in users:
+                manager.update_account_metadata(user, "32764.83 MB")
+            manager.flush()
+
+        def listing():
+            for _ in range(10):
+                assert len(manager.get_accounts_with_metadata()) == count
+
+        result = {"add": _timed(add), "update": _timed(update), "list x10": _timed(listing)}
+        if hasattr(manager, "close"):
+            manager.close()
+        return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    keyring.set_keyring(null.Keyring())
+
+    backends = {
+        # Write-through JSON rewrites the whole file per change: O(N^2) overall
+        "json (write-through)": lambda: CredentialManager(save_delay=0),
+        "json (write-behind)": lambda: CredentialManager(save_delay=60),
+        "sqlite": lambda: SQLiteCredentialManager(save_delay=0),
+    }
+
+    print(f"{count} accounts")
+    print(f"{'backend':<22} {'add (s)':>9} {'update (s)':>11} {'list x10 (s)':>13}")
+    for name, factory in backends.items():
+        if "write-through" in name and count > WRITE_THROUGH_MAX:
+            print(f"{name:<22} {'skipped (N > ' + str(WRITE_THROUGH_MAX) + ')':>35}")
+            continue
+        r = run(factory, count)
+        print(f"{name:<22} {r['add']:>9.3f} {r['update']:>11.3f} {r['list x10']:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark for CredentialManager config persistence.
+
+Counts file writes for a typical GUI login flow (open app, select the
+account, connect, show dashboard) with write-through saving
+(save_delay=0, one write per mutation as before) and with the default
+write-behind delay. File operations are counted with an audit hook.
+
+Run with: python benchmarks/bench_config_writes.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import keyring
+from keyring.backends import null
+
+from config import CONFIG_FILENAME, CONFIG_SAVE_DELAY
+from credentials import CredentialManager
+
+COUNTERS = {"open_read": 0, "open_write": 0, "rename": 0}
+_WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_CREAT
+
+
+def _audit(event, args):
+    if event == "open" and str(args[0]).find(CONFIG_FILENAME) != -1:
+        mode, flags = args[1], args[2]
+        writing = (mode and any(c in mode for c in "wax+")) or (flags & _WRITE_FLAGS)
+        COUNTERS["open_write" if writing else "open_read"] += 1
+    elif event == "os.rename" and str(args[1]).endswith(CONFIG_FILENAME):
+        COUNTERS["rename"] += 1
+
+
+def login_flow(manager: CredentialManager, username: str) -> None:
+    """Mirror the CredentialManager calls made by the GUI during a login."""
+    manager.get_accounts_with_metadata()  # LoginFrame._load_accounts
+    manager.get_last_used()
+    manager.set_last_used(username)       # LoginFrame._on_account_selected
+    manager.get_password(username)
+    manager.add_account(username, "pw")   # LoginFrame._on_connect
+    manager.get_last_used()               # DashboardFrame.__init__
+    manager.update_account_metadata(username, "32764.83 MB")
+    manager.get_accounts_with_metadata()  # DashboardFrame._setup_dropdown
+    manager.flush()                       # atexit
+
+
+def run(save_delay: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / CONFIG_FILENAME
+        CredentialManager._get_config_path = lambda self: config_path
+        manager = CredentialManager(save_delay=save_delay)
+        manager.add_account("user0", "pw")
+        manager.flush()
+
+        for key in COUNTERS:
+            COUNTERS[key] = 0
+        login_flow(manager, "user0")
+        return dict(COUNTERS)
+
+
+def main():
+    keyring.set_keyring(null.Keyring())
+    sys.addaudithook(_audit)
+
+    print(f"{'mode':<24} {'reads':>6} {'writes':>7} {'renames':>8}")
+    for name, delay in (("write-through", 0), (f"write-behind ({CONFIG_SAVE_DELAY}s)", CONFIG_SAVE_DELAY)):
+        c = run(delay)
+        print(f"{name:<24} {c['open_read']:>6} {c['open_write']:>7} {c['rename']:>8}")
+
+
+if __name__ == "__main__":
+    main()
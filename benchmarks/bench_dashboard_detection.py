@@ -0,0 +1,76 @@
+"""Benchmark for dashboard detection on raw response bytes.
+
+Compares the bytes-level connection._dashboard_html against the previous
+`"Quota" in response.text` check followed by parsing response.text again
+(two decodes, the first possibly with charset detection). Pages are
+served by the stand-in portal's templates at realistic sizes and wrapped
+in real requests.Response objects, with and without a charset header.
+
+Run with: python benchmarks/bench_dashboard_detection.py
+"""
+
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+import requests
+
+from connection import _dashboard_html, _parse_dashboard
+from portal_server import DASHBOARD_PAGE, LOGIN_PAGE, _padding
+
+
+def _page(size: int) -> str:
+    return DASHBOARD_PAGE.format(
+        last_login="02.01.2026 23:34", quota="32764.83", total_quota="32768.0",
+        padding=_padding(size), view_state="123:456",
+    )
+
+
+def _response(html: str, content_type) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = html.encode("utf-8")
+    if content_type:
+        response.headers["Content-Type"] = content_type
+    return response
+
+
+def _text_detection(response):
+    """Reference copy of the previous str-based check and parse."""
+    if "Quota" in response.text or "Hoşgeldiniz" in response.text:
+        return _parse_dashboard(response.text)
+    return None
+
+
+def _bytes_detection(response):
+    html = _dashboard_html(response)
+    return _parse_dashboard(html) if html is not None else None
+
+
+def main():
+    pages = {
+        "login": LOGIN_PAGE,
+        "dash-2KB": _page(0),
+        "dash-50KB": _page(50_000),
+        "dash-500KB": _page(500_000),
+    }
+    headers = {"charset": "text/html;charset=UTF-8", "no-header": None}
+
+    print(f"{'page':<12} {'headers':<10} {'text (us)':>12} {'bytes (us)':>12} {'speedup':>9}")
+    for name, html in pages.items():
+        for header_name, content_type in headers.items():
+            response = _response(html, content_type)
+            assert _text_detection(response) == _bytes_detection(response), name
+
+            number = 20 if len(html) > 100_000 else 200
+            text_t = min(timeit.repeat(lambda: _text_detection(response), number=number, repeat=5)) / number
+            bytes_t = min(timeit.repeat(lambda: _bytes_detection(response), number=number, repeat=5)) / number
+            print(f"{name:<12} {header_name:<10} {text_t * 1e6:>12.1f} {bytes_t * 1e6:>12.1f} {text_t / bytes_t:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark for the dashboard HTML extractor.
+
+Compares the single-pass streaming extractor in connection._parse_dashboard
+against the previous BeautifulSoup implementation (four full-tree label
+scans) on the fixtures from tests/test_connection.py.
+
+Run with: python benchmarks/bench_parse_dashboard.py
+"""
+
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from bs4 import BeautifulSoup
+
+from config import LABEL_REMAINING_QUOTA, LABEL_TOTAL_QUOTA, LABEL_NEXT_REFRESH, LABEL_LAST_LOGIN
+from connection import _parse_dashboard
+from test_connection import SAMPLE_DASHBOARD_HTML, EMPTY_HTML
+
+
+def _parse_dashboard_soup(html_content: str) -> dict:
+    """Reference copy of the previous BeautifulSoup-based parser."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    data = {
+        "quota": "Not Found",
+        "total_quota": "Not Found",
+        "date": "Not Found",
+        "last_login": "Not Found"
+    }
+
+    def sibling_value(label_text):
+        label = soup.find('label', string=lambda t: t and label_text in t)
+        if label:
+            parent_td = label.find_parent('td')
+            if parent_td:
+                sibling_td = parent_td.find_next_sibling('td')
+                if sibling_td:
+                    value_label = sibling_td.find('label')
+                    if value_label:
+                        return value_label.text.strip()
+        return None
+
+    quota = sibling_value(LABEL_REMAINING_QUOTA)
+    if quota is not None:
+        data["quota"] = f"{quota} MB"
+    total = sibling_value(LABEL_TOTAL_QUOTA)
+    if total is not None:
+        data["total_quota"] = f"{total} MB"
+    full_date = sibling_value(LABEL_NEXT_REFRESH)
+    if full_date is not None:
+        data["date"] = full_date.split(" ")[0] if " " in full_date else full_date
+
+    login_label = soup.find('label', string=lambda t: t and LABEL_LAST_LOGIN in t)
+    if login_label:
+        data["last_login"] = login_label.text.replace(f"{LABEL_LAST_LOGIN}:", "").strip()
+
+    return data
+
+
+def _padded_dashboard(rows: int) -> str:
+    """Approximate a real dashboard: the fixture plus a long service table."""
+    filler = "".join(
+        f"<tr><td><label>Service {i}</label></td><td><label>{i}.0</label></td></tr>"
+        for i in range(rows)
+    )
+    return SAMPLE_DASHBOARD_HTML.replace("</table>", f"</table><table>{filler}</table>")
+
+
+def main():
+    fixtures = {
+        "sample": SAMPLE_DASHBOARD_HTML,
+        "empty": EMPTY_HTML,
+        "padded-500": _padded_dashboard(500),
+    }
+
+    print(f"{'fixture':<12} {'soup (us)':>12} {'stream (us)':>12} {'speedup':>9}")
+    for name, html in fixtures.items():
+        assert _parse_dashboard(html) == _parse_dashboard_soup(html), name
+
+        number = 2000 if len(html) < 10_000 else 50
+        soup_t = min(timeit.repeat(lambda: _parse_dashboard_soup(html), number=number, repeat=5)) / number
+        fast_t = min(timeit.repeat(lambda: _parse_dashboard(html), number=number, repeat=5)) / number
+        print(f"{name:<12} {soup_t * 1e6:>12.1f} {fast_t * 1e6:>12.1f} {soup_t / fast_t:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""End-to-end latency benchmarks against the local stand-in portal.
+
+Starts tests/portal_server.py in-process, points the client at it with
+GSB_PORTAL_BASE_URL and times the public connection API. Reports
+p50/p95/p99 latency and throughput for:
+
+    status    check_connection_status(max_age=0) while logged in
+    status-cached  check_connection_status() answered within the TTL
+    connect   connect_to_wifi() from a logged-out state
+    logout    logout() from a logged-in state
+    switch    logout() + connect_to_wifi() for another account
+    overlap-* logged-out-to-session inside this process, for the
+              sequential startup, the StartupPipeline and the pipeline in
+              race mode. Imports are already done, so this is only the
+              overlap of the probe, keyring read and icon decoding
+    spawn-*   the same startups in a fresh Python process, timed from
+              spawn to exit: interpreter start and imports included. Tk
+              init is not (it needs a display), so the real window start
+              is longer by that much for every variant
+
+Run with: python benchmarks/bench_portal.py [--iterations 200] [--latency 0.02]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from portal_server import StandInPortal
+
+
+class _SlowKeyringManager:
+    """CredentialManager stand-in whose keyring lookup takes `delay` seconds."""
+
+    def __init__(self, delay: float, username: str, password: str):
+        self.delay = delay
+        self.credentials = (username, password)
+
+    def get_last_credentials(self):
+        time.sleep(self.delay)
+        return self.credentials
+
+    def prefetch_passwords(self):
+        pass
+
+
+def startup(mode: str, keyring_latency: float, user: str, password: str) -> None:
+    """Go from logged out to a session the way the app starts up.
+    
+    mode is "seq" (WindowMain before the pipeline: probe, then keyring,
+    then login, then icons), "pipeline" or "race".
+    """
+    from connection import check_connection_status, connect_to_wifi
+    from startup import StartupPipeline, _preload_icons
+    
+    def manager():
+        return _SlowKeyringManager(keyring_latency, user, password)
+    
+    if mode == "seq":
+        if not check_connection_status(max_age=0).success:
+            connect_to_wifi(*manager().get_last_credentials())
+        _preload_icons()
+        return
+    pipeline = StartupPipeline(manager_factory=manager, race=mode == "race").start()
+    if mode == "race":
+        assert pipeline.session.result().success
+    elif not pipeline.status.result().success:
+        connect_to_wifi(*pipeline.wait_credentials())
+    pipeline.icons.result()
+
+
+def _spawn_startup(mode: str, keyring_latency: float, user: str, password: str):
+    """Return an op that runs startup() in a new process with an empty app data dir."""
+    def run():
+        with tempfile.TemporaryDirectory() as home:
+            # No cookie jar or snapshots: the child starts logged out
+            env = dict(os.environ, HOME=home, LOCALAPPDATA=home)
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--spawned", mode,
+                 "--keyring-latency", str(keyring_latency), user, password],
+                env=env, check=True,
+            )
+    return run
+
+
+def _measure(iterations: int, op, setup=None) -> list:
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        op()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _report(name: str, samples: list) -> None:
+    q = statistics.quantiles(samples, n=100, method="inclusive")
+    throughput = len(samples) / sum(samples)
+    print(f"{name:<18} {q[49] * 1e3:>9.2f} {q[94] * 1e3:>9.2f} {q[98] * 1e3:>9.2f} {throughput:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02, help="portal latency per request (s)")
+    parser.add_argument("--jitter", type=float, default=0.005, help="extra random portal latency (s)")
+    parser.add_argument("--page-size", type=int, default=0, help="extra dashboard bytes")
+    parser.add_argument("--keyring-latency", type=float, default=0.05, help="simulated keyring lookup (s)")
+    parser.add_argument("--spawned", choices=("seq", "pipeline", "race"), help=argparse.SUPPRESS)
+    parser.add_argument("credentials", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.spawned:
+        # Child of _spawn_startup; the portal URL comes from the environment
+        startup(args.spawned, args.keyring_latency, *args.credentials)
+        return
+
+    portal = StandInPortal(latency=args.latency, jitter=args.jitter, page_size=args.page_size, seed=1)
+    os.environ["GSB_PORTAL_BASE_URL"] = portal.start()
+
+    # Imported after the base URL override so config picks it up
+    from connection import check_connection_status, connect_to_wifi, logout
+
+    users = list(portal.accounts.items())
+    user, password = users[0]
+    other = users[1]
+    turn = [0]
+
+    def switch():
+        name, pwd = users[turn[0] % 2]
+        turn[0] += 1
+        logout()
+        connect_to_wifi(name, pwd)
+
+    n = args.iterations
+    print(f"stand-in portal: latency={args.latency}s jitter={args.jitter}s page_size={args.page_size}B, {n} iterations")
+    print(f"{'operation':<18} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'ops/s':>10}")
+
+    connect_to_wifi(user, password)
+    _report("status", _measure(n, lambda: check_connection_status(max_age=0)))
+    _report("status-cached", _measure(n, check_connection_status))
+    _report("connect", _measure(n, lambda: connect_to_wifi(user, password), setup=logout))
+    _report("logout", _measure(n, logout, setup=lambda: connect_to_wifi(*other)))
+    _report("switch", _measure(n, switch))
+
+    startup_n = max(n // 10, 10)
+    for mode in ("seq", "pipeline", "race"):
+        _report(f"overlap-{mode}", _measure(
+            startup_n, lambda: startup(mode, args.keyring_latency, user, password), setup=logout
+        ))
+    for mode in ("seq", "pipeline", "race"):
+        _report(f"spawn-{mode}", _measure(startup_n, _spawn_startup(mode, args.keyring_latency, user, password)))
+
+    print(f"portal requests: {dict(portal.requests)}")
+    portal.stop()
+
+
+if __name__ == "__main__":
+    main()
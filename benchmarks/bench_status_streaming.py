@@ -0,0 +1,87 @@
+"""Benchmark for the streaming status check on large dashboard pages.
+
+Logs in to the local stand-in portal and compares check_status() with
+stream_status=True (stop reading once the quota fields are parsed)
+against the full-download path, for growing dashboard sizes. Reports
+body bytes read per check, new connections per check and p50/p95
+latency. Checks run back to back, so a check that dropped its
+connection makes the next one pay a new handshake; use --https to see
+that cost with TLS (needs the openssl command for a throwaway cert).
+
+Run with: python benchmarks/bench_status_streaming.py [--iterations 100] [--latency 0.0] [--https]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from config import STATUS_TIMEOUT_FLOOR, INITIAL_REQUEST_TIMEOUT
+from connection import PortalClient, _stream_dashboard
+from portal_server import StandInPortal
+
+
+def _self_signed_cert(directory: str) -> tuple:
+    certfile, keyfile = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", keyfile, "-out", certfile],
+        check=True, capture_output=True,
+    )
+    return certfile, keyfile
+
+
+def _bytes_read(client: PortalClient) -> int:
+    """Body bytes one status check reads."""
+    response = client._request(
+        "GET", "status", client.index_url, STATUS_TIMEOUT_FLOOR, INITIAL_REQUEST_TIMEOUT,
+        stream=client.stream_status,
+    )
+    if client.stream_status:
+        return _stream_dashboard(response).bytes_read
+    return len(response.content)
+
+
+def _latencies(client: PortalClient, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        assert client.check_status(max_age=0).success
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0, help="portal latency per request (s)")
+    parser.add_argument("--https", action="store_true", help="serve the stand-in portal over TLS")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        certfile, keyfile = _self_signed_cert(tmp) if args.https else (None, None)
+        print(f"{'page':>10} {'mode':<7} {'bytes read':>11} {'conns':>6} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+        for page_size in (0, 50_000, 500_000, 2_000_000):
+            portal = StandInPortal(latency=args.latency, page_size=page_size, certfile=certfile, keyfile=keyfile)
+            with portal:
+                for stream in (False, True):
+                    client = PortalClient(base_url=portal.base_url, stream_status=stream, verify_ssl=False)
+                    client.login("user1", "pass1")
+                    read = _bytes_read(client)
+                    before = portal.connections
+                    q = statistics.quantiles(_latencies(client, args.iterations), n=100, method="inclusive")
+                    conns = (portal.connections - before) / args.iterations
+                    mode = "stream" if stream else "full"
+                    print(f"{page_size:>10} {mode:<7} {read:>11} {conns:>6.2f} {q[49] * 1e3:>9.2f} {q[94] * 1e3:>9.2f}")
+                    client.close()
+
+
+if __name__ == "__main__":
+    main()
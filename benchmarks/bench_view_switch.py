@@ -0,0 +1,113 @@
+"""Benchmark for switching between the login and dashboard views.
+
+Measures main-thread time per view switch (including the redraw Tk does
+in update_idletasks) for the previous approach, destroying the current
+frame and building the next one, against raising the kept frames and
+updating them in place. Sessions alternate so every dashboard switch
+has new quota text to show.
+
+Needs a display (run under xvfb-run on headless Linux).
+
+Run with: python benchmarks/bench_view_switch.py [--iterations 50]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+os.chdir(ROOT)  # resource_path() resolves the icons from here
+
+import keyring
+from keyring.backends import null
+
+from config import CONFIG_FILENAME
+from credentials import AsyncCredentialManager, CredentialManager
+from models import SessionInfo
+from session_cache import SessionCache
+
+SESSIONS = [
+    SessionInfo(True, "Already Connected", "30000.00 MB", "40000.00 MB", "01/02/2026", "02.01.2026 23:34"),
+    SessionInfo(True, "Already Connected", "29876.54 MB", "40000.00 MB", "01/02/2026", "02.01.2026 23:34"),
+]
+
+
+def _switch_times(switch, root, iterations: int) -> list:
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        switch(i)
+        root.update_idletasks()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        sys.exit("No display available; run under xvfb-run.")
+
+    import customtkinter as ctk
+    from ui.app import WindowMain
+    from ui.frames import LoginFrame, DashboardFrame
+    from ui.tasks import TaskRunner
+
+    keyring.set_keyring(null.Keyring())
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / CONFIG_FILENAME
+        CredentialManager._get_config_path = lambda self: config_path
+        creds = CredentialManager()
+        for n in range(5):
+            creds.add_account(f"user{n}", "secret")
+        creds.set_last_used("user0")
+        accounts = AsyncCredentialManager(creds)
+
+        root = ctk.CTk()
+        tasks = TaskRunner(root)
+        container = ctk.CTkFrame(root)
+        container.pack(fill="both", expand=True)
+
+        def rebuild(i):
+            for w in container.winfo_children(): w.destroy()
+            if i % 2:
+                LoginFrame(container, accounts, None, tasks).pack(fill="both", expand=True)
+            else:
+                DashboardFrame(container, SESSIONS[i // 2 % 2], accounts, None, None, tasks).pack(fill="both", expand=True)
+
+        # A WindowMain without __init__: only the view switching is used
+        window = WindowMain.__new__(WindowMain)
+        window.root, window.container, window.tasks, window.accounts = root, container, tasks, accounts
+        window.sessions = Future()
+        window.sessions.set_result(SessionCache())  # in memory only
+
+        def in_place(i):
+            if i % 2:
+                window.show_login()
+            else:
+                window.show_dash(SESSIONS[i // 2 % 2])
+
+        print(f"{'mode':<10} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+        for name, switch in (("rebuild", rebuild), ("in-place", in_place)):
+            for w in container.winfo_children(): w.destroy()
+            window.login_view = window.dash = window.current = None
+            window.lbl_loading = ctk.CTkLabel(container)
+            switch(0); switch(1)  # warm up: first build of each view
+            q = statistics.quantiles(_switch_times(switch, root, args.iterations), n=100, method="inclusive")
+            print(f"{name:<10} {q[49] * 1e3:>9.2f} {q[94] * 1e3:>9.2f}")
+
+        tasks.shutdown()
+        accounts.shutdown()
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
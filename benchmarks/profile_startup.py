@@ -0,0 +1,49 @@
+"""Import-time profile of the GUI startup path.
+
+Runs the imports main.py performs before the first window paint (the
+startup pipeline, then the ui package) under -X importtime and writes
+the modules sorted by cumulative import time to
+benchmarks/startup_importtime.txt. Modules imported later, on
+background threads (requests, keyring, ui.frames), are not in the
+profile by design.
+
+Run with: python benchmarks/profile_startup.py
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT = os.path.join(ROOT, "benchmarks", "startup_importtime.txt")
+
+# Same import order as src/main.py up to WindowMain()
+SNIPPET = "import startup; import ui"
+
+
+def main():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SNIPPET],
+        cwd=os.path.join(ROOT, "src"), capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    rows.sort(reverse=True)
+
+    with open(OUTPUT, "w", encoding="utf-8") as f:
+        f.write(f"# python -X importtime -c \"{SNIPPET}\"  (cwd: src/, Python {sys.version.split()[0]})\n")
+        f.write(f"# {'cumulative_us':>13} {'self_us':>9}  module\n")
+        for cumulative_us, self_us, name in rows:
+            f.write(f"{cumulative_us:>15} {self_us:>9}  {name}\n")
+
+    print(f"Wrote {len(rows)} modules to {OUTPUT}")
+    for cumulative_us, _, name in rows[:15]:
+        print(f"{cumulative_us / 1000:>8.1f} ms  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
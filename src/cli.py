@@ -0,0 +1,135 @@
+"""Headless command line entry point.
+
+Runs the portal actions without the GUI, for machines that only need to
+connect unattended (e.g. at boot). Only the modules a command needs are
+imported: customtkinter, PIL and tkinter are never loaded, and the
+keyring is only touched by commands that need a password.
+
+Example:
+    $ python cli.py status
+    $ python cli.py connect [--user USERNAME]
+    $ python cli.py logout
+    $ python cli.py daemon [--interval 60]
+"""
+
+import argparse
+import sys
+
+from config import WATCHDOG_CHECK_INTERVAL
+from connection import check_connection_status, connect_to_wifi, logout, WifiConnectionError
+
+
+def _print_session(session) -> None:
+    print(session.message)
+    if session.success:
+        print(f"  Remaining: {session.remaining_quota} / {session.total_quota}")
+        print(f"  Renews:    {session.quota_renewal_date}")
+        print(f"  Last login: {session.last_login}")
+
+
+def _login(username=None):
+    """Log in the given (or last used) saved account.
+
+    Returns:
+        SessionInfo of the successful login.
+    """
+    from credentials import create_credential_manager
+
+    creds = create_credential_manager()
+    username = username or creds.get_last_used()
+    if not username:
+        raise WifiConnectionError("No saved account. Add one in the GUI first.")
+    password = creds.get_password(username)
+    if not password:
+        raise WifiConnectionError(f"No saved password for '{username}'.")
+
+    session = connect_to_wifi(username, password)
+    creds.set_last_used(username)
+    creds.update_account_session(username, session)
+    creds.flush()
+    return session
+
+
+def cmd_status(args) -> int:
+    session = check_connection_status()
+    _print_session(session)
+    return 0 if session.success else 1
+
+
+def cmd_connect(args) -> int:
+    if not args.force:
+        session = check_connection_status()
+        if session.success:
+            _print_session(session)
+            return 0
+    try:
+        _print_session(_login(args.user))
+        return 0
+    except (WifiConnectionError, ValueError) as e:
+        print(f"Connection failed: {e}", file=sys.stderr)
+        return 1
+
+
+def cmd_logout(args) -> int:
+    if logout():
+        print("Logged out")
+        return 0
+    print("Logout failed", file=sys.stderr)
+    return 1
+
+
+def cmd_daemon(args) -> int:
+    """Keep the connection alive, re-logging in whenever it drops."""
+    from credentials import create_credential_manager
+    from session_watchdog import ConnectivityWatchdog
+
+    creds = create_credential_manager()
+    if args.user:
+        creds.set_last_used(args.user)
+
+    def on_reconnect(downtime, session):
+        creds.update_account_session(creds.get_last_used(), session)
+        print(f"Reconnected after {downtime:.1f}s: {session.remaining_quota}", flush=True)
+
+    watchdog = ConnectivityWatchdog(creds, on_reconnect=on_reconnect, check_interval=args.interval)
+    print(f"Watching connection ({type(watchdog.monitor).__name__})", flush=True)
+    try:
+        watchdog.run_forever()
+    finally:
+        creds.flush()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="gsbwifi", description="GSB WiFi Auto Connect (headless)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    status = commands.add_parser("status", help="show whether we are logged in")
+    status.set_defaults(func=cmd_status)
+
+    connect = commands.add_parser("connect", help="log in the last used (or given) account")
+    connect.add_argument("--user", help="saved account to use instead of the last used one")
+    connect.add_argument("--force", action="store_true", help="log in even if already connected")
+    connect.set_defaults(func=cmd_connect)
+
+    logout_cmd = commands.add_parser("logout", help="end the current portal session")
+    logout_cmd.set_defaults(func=cmd_logout)
+
+    daemon = commands.add_parser("daemon", help="stay running and re-login when the session drops")
+    daemon.add_argument("--user", help="saved account to use instead of the last used one")
+    daemon.add_argument("--interval", type=float, default=WATCHDOG_CHECK_INTERVAL, help="seconds between idle status checks")
+    daemon.set_defaults(func=cmd_daemon)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,19 +5,102 @@ throughout the application. Edit this file to customize behavior
 without modifying core logic.
 """
 
+import os
+
 # --- Network Configuration ---
 
 # GSB WiFi Portal URLs
-PORTAL_BASE_URL = "https://wifi.gsb.gov.tr"
+# GSB_PORTAL_BASE_URL points the app at another server (e.g. the local
+# stand-in portal in tests/portal_server.py used for benchmarks)
+PORTAL_BASE_URL = os.environ.get("GSB_PORTAL_BASE_URL", "https://wifi.gsb.gov.tr")
 LOGIN_ENDPOINT = "/login/j_spring_security_check"
+INDEX_ENDPOINT = "/index.html"
 LOGIN_URL = f"{PORTAL_BASE_URL}{LOGIN_ENDPOINT}"
-URL_INDEX = f"{PORTAL_BASE_URL}/index.html"
+URL_INDEX = f"{PORTAL_BASE_URL}{INDEX_ENDPOINT}"
 
 # Request timeouts (in seconds)
 # Reduced for faster response times
 INITIAL_REQUEST_TIMEOUT = 3 
 LOGIN_REQUEST_TIMEOUT = 10
 
+# Adaptive timeouts: once enough responses were measured, timeouts follow
+# the portal's observed latency. The values above become the ceilings and
+# these the floors (status/preflight GETs, login/logout POSTs).
+ADAPTIVE_TIMEOUTS = True
+STATUS_TIMEOUT_FLOOR = 0.3
+LOGIN_TIMEOUT_FLOOR = 1.0
+TIMEOUT_LATENCY_MULTIPLIER = 3   # timeout >= p99 latency * this
+LATENCY_EWMA_ALPHA = 0.2
+LATENCY_WINDOW_SIZE = 64         # recent samples kept for percentiles
+LATENCY_MIN_SAMPLES = 5          # use the ceilings until this many samples
+
+# Startup "race" mode: run the status probe and the auto-login for the
+# last used account at the same time instead of one after the other
+STARTUP_RACE_MODE = False
+
+# Session watchdog (daemon and GUI): seconds between status checks when
+# idle, re-login backoff range, and pause after a network change event
+WATCHDOG_CHECK_INTERVAL = 60
+WATCHDOG_BACKOFF_INITIAL = 2
+WATCHDOG_BACKOFF_MAX = 60
+WATCHDOG_SETTLE_DELAY = 1
+# How often the GUI picks up the watchdog thread's re-login requests (ms);
+# they are submitted from the Tk thread like every other session action
+WATCHDOG_UI_POLL_MS = 500
+
+# Retries for portal requests: timeouts, dropped connections and these
+# HTTP statuses are retried with jittered exponential backoff (in seconds).
+# 500 is left out on purpose: the portal answers an expired JSF ViewState
+# with it, and sending the same form again cannot succeed.
+RETRY_MAX_ATTEMPTS = 3
+STATUS_MAX_ATTEMPTS = 2          # status probes should fail fast off-network
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 2.0
+RETRY_STATUS_CODES = (502, 503, 504)
+
+# Circuit breaker: after this many failed requests in a row, stop calling
+# the portal for CIRCUIT_RESET_TIMEOUT seconds instead of piling on
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 10
+
+# Portal cookies are persisted so a reconnect can skip the preflight GET
+# that only fetches a session cookie. A cookie counts as fresh for this
+# many seconds after the portal last answered (its session timeout).
+PORTAL_SESSION_COOKIE = "JSESSIONID"
+COOKIE_MAX_AGE = 1800
+
+# Status checks read the dashboard in chunks of this many bytes and stop
+# once the quota fields are parsed. If at most STREAM_DRAIN_LIMIT bytes of
+# the page are left, they are read anyway so the keep-alive connection
+# goes back to the pool; only a longer rest is cut off by closing the
+# connection, where a new TCP+TLS handshake is cheaper than the download.
+STREAM_STATUS_PAGE = True
+STREAM_CHUNK_SIZE = 8192
+STREAM_DRAIN_LIMIT = 64 * 1024
+
+# Status answers are reused for this many seconds (0 = always ask the
+# portal), so polling tools cost at most one portal request per TTL
+STATUS_CACHE_TTL = 5
+
+# Keep-alive connections kept open to the portal (shared by all UI threads)
+POOL_MAXSIZE = 4
+
+# UI worker pool: threads shared by all frames, and how often (in ms) the
+# Tk main thread picks up finished results while work is in flight
+UI_MAX_WORKERS = 2
+UI_DISPATCH_INTERVAL_MS = 16
+
+# Dashboard auto-refresh (in seconds): the quota is re-read often enough
+# to see about QUOTA_REFRESH_STEP of the total used between refreshes,
+# within [MIN, MAX]; at or below QUOTA_LOW_FRACTION left, at least every
+# QUOTA_REFRESH_LOW_INTERVAL. The usage rate is an EWMA over refreshes.
+QUOTA_REFRESH_MIN_INTERVAL = 15
+QUOTA_REFRESH_MAX_INTERVAL = 300
+QUOTA_REFRESH_LOW_INTERVAL = 30
+QUOTA_REFRESH_STEP = 0.01
+QUOTA_LOW_FRACTION = 0.2
+QUOTA_RATE_EWMA_ALPHA = 0.5
+
 # SSL verification (set to True if GSB fixes their certificate)
 SKIP_SSL_VERIFICATION = True
 
@@ -28,11 +111,36 @@ LABEL_TOTAL_QUOTA = "Total Quota (MB)"
 LABEL_NEXT_REFRESH = "Next Refresh Date"
 LABEL_LAST_LOGIN = "Last Login"
 
+# Text that only appears on the logged-in dashboard ("Welcome" in Turkish)
+DASHBOARD_MARKERS = ("Quota", "Hoşgeldiniz")
+
+# Pages are decoded with this when the response names no charset; the
+# byte patterns of the markers are also matched in PORTAL_FALLBACK_ENCODING
+PORTAL_ENCODING = "utf-8"
+PORTAL_FALLBACK_ENCODING = "iso-8859-9"
+
+# Text of the dashboard's "End Session" button (English / Turkish UI)
+LOGOUT_BUTTON_TEXTS = ("End Session", "Oturumu Sonlandır")
+
 
 # --- Credential Storage ---
 KEYRING_SERVICE_ID = "GSB_Wifi_Auto_Connect"
 APP_DATA_FOLDER = "GSB_Wifi_Connect_App"
 CONFIG_FILENAME = "user_preferences.json"
+LATENCY_STATS_FILENAME = "latency_stats.json"
+COOKIE_JAR_FILENAME = "portal_cookies.txt"
+SESSION_CACHE_FILENAME = "session_cache.json"
+
+# Config writes are delayed and coalesced (in seconds, 0 = write immediately)
+CONFIG_SAVE_DELAY = 0.5
+
+# Account metadata storage: "json" (user_preferences.json) or "sqlite"
+# (commits every change at once; more durable, but slower than "json")
+ACCOUNT_STORE_BACKEND = "json"
+ACCOUNT_DB_FILENAME = "accounts.db"
+
+# Passwords read from the OS keyring are cached in memory (in seconds)
+PASSWORD_CACHE_TTL = 300
 
 
 # --- UI Configuration (Midnight Zen - Sharp Edition) ---
@@ -81,3 +189,16 @@ ICON_CONNECTED = "icons/connected.png"
 ICON_GITHUB = "icons/github.png"
 ICON_INSTAGRAM = "icons/instagram.png"
 ICON_LINKEDIN = "icons/linkedin.png"
+
+# Display sizes (in logical pixels) each icon is decoded and scaled to
+# once, at startup; frames share the resulting images
+ICON_SIZES = {
+    ICON_DISCONNECTED: [(32, 32)],
+    ICON_CONNECTED: [(32, 32)],
+    ICON_GITHUB: [(20, 20)],
+    ICON_INSTAGRAM: [(20, 20)],
+    ICON_LINKEDIN: [(20, 20)],
+}
+# Icons are pre-scaled to this multiple of their display size so they
+# stay sharp up to 200% UI scaling (CTkImage only ever downsizes them)
+ICON_PRESCALE = 2
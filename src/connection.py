@@ -4,22 +4,55 @@ This module handles authentication with the GSB WiFi captive portal
 and extracts session information (quota, dates) from the dashboard HTML.
 """
 
+import atexit
+import codecs
+import os
+import tempfile
+import threading
+import time
+from dataclasses import replace
+from http.cookiejar import LWPCookieJar
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import urllib3
 
 from models import SessionInfo
+from latency import LatencyTracker
+from resilience import RetryPolicy, CircuitBreaker
 from config import (
     PORTAL_BASE_URL,
-    LOGIN_URL,
-    URL_INDEX,
+    LOGIN_ENDPOINT,
+    INDEX_ENDPOINT,
     INITIAL_REQUEST_TIMEOUT,
     LOGIN_REQUEST_TIMEOUT,
+    STATUS_TIMEOUT_FLOOR,
+    LOGIN_TIMEOUT_FLOOR,
+    ADAPTIVE_TIMEOUTS,
+    LATENCY_STATS_FILENAME,
+    COOKIE_JAR_FILENAME,
+    PORTAL_SESSION_COOKIE,
+    COOKIE_MAX_AGE,
+    POOL_MAXSIZE,
+    STATUS_MAX_ATTEMPTS,
+    RETRY_STATUS_CODES,
     SKIP_SSL_VERIFICATION,
     LABEL_REMAINING_QUOTA,
     LABEL_TOTAL_QUOTA,
     LABEL_NEXT_REFRESH,
     LABEL_LAST_LOGIN,
+    LOGOUT_BUTTON_TEXTS,
+    DASHBOARD_MARKERS,
+    PORTAL_ENCODING,
+    PORTAL_FALLBACK_ENCODING,
+    STREAM_STATUS_PAGE,
+    STREAM_CHUNK_SIZE,
+    STREAM_DRAIN_LIMIT,
+    STATUS_CACHE_TTL,
 )
 
 # Suppress SSL warnings if verification is disabled
@@ -44,215 +77,886 @@ class NetworkTimeoutError(WifiConnectionError):
     pass
 
 
+class CircuitOpenError(WifiConnectionError):
+    """Raised without contacting the portal after repeated failures."""
+    pass
+
+
+class ClientClosedError(WifiConnectionError):
+    """Raised instead of sending a request on a closed PortalClient."""
+    pass
+
+
 # --- HTML Parsing ---
 
-def _parse_dashboard(html_content: str) -> dict:
-    """Extract quota and date information from the dashboard HTML.
-    
-    The GSB portal uses dynamically generated element IDs (JSF framework),
-    so we search by label text instead. This is more fragile but necessary.
+class _ExtractionComplete(Exception):
+    """Raised internally to stop feeding once every field is extracted."""
+    pass
+
+
+# Elements without an end tag
+_VOID_TAGS = frozenset((
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr",
+))
+
+
+def _soup_string(children: list) -> Optional[str]:
+    """BeautifulSoup's .string of an element given its children.
     
-    Args:
-        html_content: Raw HTML string from the dashboard page.
-        
-    Returns:
-        Dictionary with keys: 'quota', 'total_quota', 'date', 'last_login'.
-        Values default to "Not Found" if parsing fails.
+    Descends while an element has exactly one child and returns the text
+    reached. Unlike soup, a lone comment does not count as text.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    data = {
-        "quota": "Not Found",
-        "total_quota": "Not Found",
-        "date": "Not Found",
-        "last_login": "Not Found"
-    }
+    while len(children) == 1:
+        child = children[0]
+        if not isinstance(child, list):
+            return child
+        children = child
+    return None
 
-    try:
-        # 1. Find Remaining Quota
-        quota_label = soup.find('label', string=lambda t: t and LABEL_REMAINING_QUOTA in t)
-        if quota_label:
-            parent_td = quota_label.find_parent('td')
-            if parent_td:
-                sibling_td = parent_td.find_next_sibling('td')
-                if sibling_td:
-                    value_label = sibling_td.find('label')
-                    if value_label:
-                        data["quota"] = f"{value_label.text.strip()} MB"
-
-        # 2. Find Total Quota (New)
-        total_label = soup.find('label', string=lambda t: t and LABEL_TOTAL_QUOTA in t)
-        if total_label:
-            parent_td = total_label.find_parent('td')
-            if parent_td:
-                sibling_td = parent_td.find_next_sibling('td')
-                if sibling_td:
-                    value_label = sibling_td.find('label')
-                    if value_label:
-                        data["total_quota"] = f"{value_label.text.strip()} MB"
-
-        # 3. Find Next Refresh Date
-        date_label = soup.find('label', string=lambda t: t and LABEL_NEXT_REFRESH in t)
-        if date_label:
-            parent_td = date_label.find_parent('td')
-            if parent_td:
-                sibling_td = parent_td.find_next_sibling('td')
-                if sibling_td:
-                    value_label = sibling_td.find('label')
-                    if value_label:
-                        full_date = value_label.text.strip()
-                        # Extract just the date part (e.g., "01/02/2026" from "01/02/2026 00:00:00")
-                        data["date"] = full_date.split(" ")[0] if " " in full_date else full_date
-
-        # 4. Find Last Login (in page header)
-        login_label = soup.find('label', string=lambda t: t and LABEL_LAST_LOGIN in t)
-        if login_label:
-            text = login_label.text.replace(f"{LABEL_LAST_LOGIN}:", "").strip()
-            data["last_login"] = text
 
+class _DashboardExtractor(HTMLParser):
+    """Single-pass, streaming extractor for the dashboard fields.
+
+    Instead of building a full DOM and scanning it once per label, this
+    parser walks the token stream exactly once. For the table fields it
+    remembers the <td> holding the matched label and captures the first
+    <label> inside the next sibling <td>, which mirrors the old
+    find_parent('td') / find_next_sibling('td') / find('label') walk.
+    """
+
+    # Dashboard keys whose value lives in the next sibling <td>
+    _TABLE_FIELDS = (
+        ("quota", LABEL_REMAINING_QUOTA),
+        ("total_quota", LABEL_TOTAL_QUOTA),
+        ("date", LABEL_NEXT_REFRESH),
+    )
+
+    def __init__(self, want_logout_form: bool = False):
+        super().__init__(convert_charrefs=True)
+        self.want_logout_form = want_logout_form
+        self.data = {
+            "quota": "Not Found",
+            "total_quota": "Not Found",
+            "date": "Not Found",
+            "last_login": "Not Found"
+        }
+        self._remaining = {"quota", "total_quota", "date", "last_login"}
+        self._unmatched = set(self._remaining)
+        self._td_stack = []          # ids of currently open <td> elements
+        self._next_td_id = 0
+        self._label_depth = 0        # nesting depth of open <label> tags
+        self._label_text = []
+        # Children of the open label as nested lists: str for text, None for
+        # a comment, a list for a child tag (to compute soup's .string)
+        self._label_tree = []
+        self._label_open = []        # children lists of the open elements
+        self._label_td = None        # <td> that contains the current label
+        # key -> [depth of the label's <td>, that <td>'s id, sibling <td> id]
+        self._pending = {}
+        
+        # Logout form (JSF ViewState and "End Session" button name)
+        self.view_state = None
+        self.view_state_found = False
+        self._logout_button = None
+        self._fallback_button = None
+        self._button = None          # [name, text parts, text only?] of open <button>
+
+    @property
+    def done(self) -> bool:
+        """True once every wanted field has been resolved (found or given up)."""
+        if self.want_logout_form and not (self.view_state_found and self._logout_button):
+            return False
+        return not self._remaining
+
+    @property
+    def logout_button(self):
+        """Name of the "End Session" button, or of the known-ID fallback."""
+        return self._logout_button or self._fallback_button
+
+    def handle_starttag(self, tag, attrs):
+        if self._button is not None:
+            self._button[2] = False
+        if self._label_depth and tag != "label":
+            self._label_child(tag)
+        
+        if tag == "input":
+            attributes = dict(attrs)
+            if not self.view_state_found and attributes.get("name") == "javax.faces.ViewState":
+                self.view_state_found = True
+                self.view_state = attributes.get("value")
+            return
+        if tag == "button":
+            attributes = dict(attrs)
+            # Fallback: common GSB ID 'servisUpdateForm:j_idt159' (risky as IDs change)
+            if self._fallback_button is None and "j_idt159" in (attributes.get("id") or ""):
+                self._fallback_button = attributes.get("name")
+            self._button = [attributes.get("name"), [], True]
+            return
+        
+        if tag == "td":
+            self._next_td_id += 1
+            depth = len(self._td_stack)
+            for state in self._pending.values():
+                # First sibling <td> after the label's cell closed
+                if state[1] is None and state[0] == depth:
+                    state[2] = self._next_td_id
+            self._td_stack.append(self._next_td_id)
+        elif tag == "label":
+            if self._label_depth:
+                self._label_child(tag)
+            else:
+                self._label_text = []
+                self._label_tree = []
+                self._label_open = [self._label_tree]
+                self._label_td = self._td_stack[-1] if self._td_stack else None
+            self._label_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag == "button":
+            self._on_button()
+            return
+        
+        if tag == "label":
+            if self._label_depth:
+                self._label_depth -= 1
+                if not self._label_depth:
+                    self._on_label("".join(self._label_text), _soup_string(self._label_tree))
+                elif len(self._label_open) > 1:
+                    self._label_open.pop()
+            return
+        if self._label_depth and len(self._label_open) > 1 and tag not in _VOID_TAGS:
+            self._label_open.pop()
+
+        if tag == "td" and self._td_stack:
+            closed = self._td_stack.pop()
+            for key, state in list(self._pending.items()):
+                if state[1] == closed:
+                    state[1] = None  # Label's cell closed, wait for a sibling
+                elif state[2] == closed:
+                    self._give_up(key)  # Sibling cell held no label
+        elif tag in ("tr", "table"):
+            # Leaving the row: no sibling cell can follow anymore
+            depth = len(self._td_stack)
+            for key, state in list(self._pending.items()):
+                if state[0] >= depth:
+                    self._give_up(key)
+        
+        if self.done:
+            raise _ExtractionComplete()
+
+    def handle_data(self, data):
+        if self._label_depth:
+            self._label_text.append(data)
+            children = self._label_open[-1]
+            if children and isinstance(children[-1], str):
+                # Text split across feed() calls is still one string
+                children[-1] += data
+            else:
+                children.append(data)
+        if self._button is not None:
+            self._button[1].append(data)
+
+    def handle_comment(self, data):
+        if self._label_depth:
+            self._label_open[-1].append(None)
+
+    def _label_child(self, tag: str) -> None:
+        """Add a child tag to the open label (void tags have no end tag)."""
+        children = []
+        self._label_open[-1].append(children)
+        if tag not in _VOID_TAGS:
+            self._label_open.append(children)
+
+    def _on_button(self) -> None:
+        """Check whether the closed <button> is the logout button."""
+        if self._button is None:
+            return
+        name, text, is_simple = self._button
+        self._button = None
+        
+        # We look for a button containing "End Session" or "Oturumu Sonlandır"
+        text = "".join(text)
+        if self._logout_button is None and is_simple and any(m in text for m in LOGOUT_BUTTON_TEXTS):
+            self._logout_button = name
+            if self.done:
+                raise _ExtractionComplete()
+
+    def _on_label(self, text: str, string: Optional[str]) -> None:
+        """Process a complete top-level <label> element.
+        
+        Args:
+            text: All text of the label (soup's .text).
+            string: Its single text descendant (soup's .string), or None.
+        """
+        # The first label inside an awaited sibling cell is the value
+        for key, state in list(self._pending.items()):
+            if state[2] is not None and state[2] in self._td_stack:
+                del self._pending[key]
+                self._set_value(key, text.strip())
+
+        # Like soup.find(string=...), the marker must be in the label's .string
+        if string is not None:
+            if "last_login" in self._unmatched and LABEL_LAST_LOGIN in string:
+                self._unmatched.discard("last_login")
+                self._set_value("last_login", text.replace(f"{LABEL_LAST_LOGIN}:", "").strip())
+
+            for key, marker in self._TABLE_FIELDS:
+                if key in self._unmatched and marker in string:
+                    # Only the first matching label counts, as with soup.find
+                    self._unmatched.discard(key)
+                    if self._label_td is None:
+                        self._give_up(key)
+                    else:
+                        depth = self._td_stack.index(self._label_td)
+                        self._pending[key] = [depth, self._label_td, None]
+
+        if self.done:
+            raise _ExtractionComplete()
+
+    def _give_up(self, key: str) -> None:
+        self._pending.pop(key, None)
+        self._remaining.discard(key)
+
+    def _set_value(self, key: str, value: str) -> None:
+        if key == "date":
+            # Extract just the date part (e.g., "01/02/2026" from "01/02/2026 00:00:00")
+            value = value.split(" ")[0] if " " in value else value
+        elif key in ("quota", "total_quota"):
+            value = f"{value} MB"
+        self.data[key] = value
+        self._remaining.discard(key)
+
+
+def _extract_dashboard(html_content: str, want_logout_form: bool = False) -> _DashboardExtractor:
+    """Run the streaming extractor over a dashboard page."""
+    extractor = _DashboardExtractor(want_logout_form=want_logout_form)
+
+    try:
+        extractor.feed(html_content)
+        extractor.close()
+    except _ExtractionComplete:
+        pass
     except Exception as e:
         # TODO: Replace with proper logging
         print(f"Parse error: {e}")
     
-    return data
+    return extractor
 
 
-# --- Main Connection Logic ---
+# Byte patterns of the dashboard markers in every encoding the portal may use
+_MARKER_PATTERNS = {
+    encoding: tuple(marker.encode(encoding) for marker in DASHBOARD_MARKERS)
+    for encoding in (PORTAL_ENCODING, PORTAL_FALLBACK_ENCODING)
+}
 
-def check_connection_status() -> SessionInfo:
-    """Check if we are already connected to GSB WiFi.
+
+def _marker_encoding(content: bytes) -> Optional[str]:
+    """Encoding whose dashboard marker bytes occur in `content`, or None."""
+    for encoding, patterns in _MARKER_PATTERNS.items():
+        for pattern in patterns:
+            if pattern in content:
+                return encoding
+    return None
+
+
+def _is_dashboard(content: bytes) -> bool:
+    """True if the page is the logged-in dashboard ("Quota" or "Welcome")."""
+    return _marker_encoding(content) is not None
+
+
+_LONGEST_MARKER = max(len(p) for patterns in _MARKER_PATTERNS.values() for p in patterns)
+
+
+def _response_charset(response) -> Optional[str]:
+    """Charset named in the Content-Type header, if Python knows it."""
+    content_type = response.headers.get("Content-Type", "")
+    charset = content_type.partition("charset=")[2].split(";")[0].strip().strip('"')
+    try:
+        return codecs.lookup(charset).name if charset else None
+    except LookupError:
+        return None
+
+
+def _dashboard_html(response) -> Optional[str]:
+    """Decoded dashboard page of `response`, or None if it is not one.
     
-    Attempts to access the dashboard page. If redirected to login,
-    we are not connected. If we see dashboard content, we are connected.
+    Works on the raw bytes so requests never has to guess the charset
+    (charset_normalizer over the whole body) for `.text`. Pages without
+    the markers are not decoded at all; dashboards are decoded once,
+    with the charset from Content-Type or the one the markers matched in.
+    """
+    content = response.content
+    encoding = _marker_encoding(content)
+    if encoding is None:
+        return None
+    return content.decode(_response_charset(response) or encoding, errors="replace")
+
+
+def _stream_dashboard(response, want_logout_form: bool = False) -> Optional[_DashboardExtractor]:
+    """Run the extractor over a `stream=True` response as its body arrives.
+    
+    Chunks are buffered only until a dashboard marker shows up, then
+    decoded incrementally and fed to the extractor. Parsing stops as soon
+    as the extractor is done; the rest of the body is drained if it is
+    short (see _drain_rest) and the response is closed. The number of
+    body bytes read is left in the extractor's `bytes_read`.
+    
+    With `want_logout_form`, the logout form is also looked for in the
+    drained rest. The rest is not run through the parser: parsing starts
+    at its first <form, so filler between the fields and the form costs
+    only a string search. On a page whose rest is too long to drain,
+    the form is not found.
     
     Returns:
-        SessionInfo object with success=True if connected, False otherwise.
+        The extractor, or None if the page is not the dashboard.
     """
-    session = requests.Session()
-    verify_ssl = not SKIP_SSL_VERIFICATION
+    extractor = _DashboardExtractor()
+    extractor.bytes_read = 0
+    head = bytearray()
+    decoder = None
+    text = ""
     
+    chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
     try:
-        response = session.get(URL_INDEX, verify=verify_ssl, timeout=INITIAL_REQUEST_TIMEOUT)
+        for chunk in chunks:
+            extractor.bytes_read += len(chunk)
+            if decoder is None:
+                # Overlap the previous chunk so markers split between chunks are found
+                start = max(0, len(head) - _LONGEST_MARKER + 1)
+                head += chunk
+                encoding = _marker_encoding(bytes(head[start:]))
+                if encoding is None:
+                    continue
+                decoder = codecs.getincrementaldecoder(_response_charset(response) or encoding)(errors="replace")
+                chunk = bytes(head)
+            text = decoder.decode(chunk)
+            extractor.feed(text)
         
-        # If we see "Quota" or "Welcome", we are logged in
-        if "Quota" in response.text or "Hoşgeldiniz" in response.text:
-            parsed_data = _parse_dashboard(response.text)
-            return SessionInfo(
-                success=True,
-                message="Already Connected",
-                remaining_quota=parsed_data["quota"],
-                total_quota=parsed_data["total_quota"],
-                quota_renewal_date=parsed_data["date"],
-                last_login=parsed_data["last_login"]
-            )
-        else:
-            return SessionInfo(success=False, message="Not Connected")
-            
-    except Exception:
-        return SessionInfo(success=False, message="Connection Error")
+        if decoder is None:
+            return None
+        extractor.feed(decoder.decode(b"", final=True))
+        extractor.close()
+    except _ExtractionComplete:
+        rest = []
+        extractor.bytes_read += _drain_rest(response, chunks, extractor.bytes_read, rest)
+        if want_logout_form and not (extractor.view_state_found and extractor.logout_button):
+            # The form follows the fields: in the chunk they ended in, or later
+            _find_logout_form(extractor, text + decoder.decode(b"".join(rest), final=True))
+    except requests.exceptions.RequestException:
+        raise
+    except Exception as e:
+        print(f"Parse error: {e}")
+    finally:
+        response.close()
+    
+    return extractor
 
 
-def logout() -> bool:
-    """Terminate the current session.
+def _find_logout_form(extractor: _DashboardExtractor, html: str) -> None:
+    """Parse the logout form in `html` into `extractor`, from its first <form on."""
+    start = html.lower().find("<form")
+    if start < 0:
+        return
+    form = _extract_dashboard(html[start:], want_logout_form=True)
+    extractor.view_state_found, extractor.view_state = form.view_state_found, form.view_state
+    extractor._logout_button, extractor._fallback_button = form._logout_button, form._fallback_button
+
+
+def _drain_rest(response, chunks, bytes_read: int, drained_chunks: Optional[list] = None) -> int:
+    """Read the unread body if it is short, so the connection can be reused.
+    
+    urllib3 returns a connection to the pool only once its response was
+    read to the end; closing it earlier drops the connection and the next
+    portal request pays a new TCP+TLS handshake. Up to STREAM_DRAIN_LIMIT
+    bytes are read; a longer rest (known from Content-Length, or found
+    while draining) is abandoned. The chunks read are appended to
+    `drained_chunks` if given.
     
-    Scrapes the dashboard for the view state and submit button ID,
-    then posts to trigger the logout action.
+    Returns:
+        The number of bytes drained.
     """
-    session = requests.Session()
-    verify_ssl = not SKIP_SSL_VERIFICATION
+    try:
+        length = int(response.headers.get("Content-Length"))
+    except (TypeError, ValueError):
+        length = None
+    if length is not None and length - bytes_read > STREAM_DRAIN_LIMIT:
+        return 0
     
+    drained = 0
     try:
-        # 1. Get the dashboard page to find the ViewState and Button ID
-        response = session.get(URL_INDEX, verify=verify_ssl, timeout=INITIAL_REQUEST_TIMEOUT)
+        for chunk in chunks:
+            drained += len(chunk)
+            if drained > STREAM_DRAIN_LIMIT:
+                break
+            if drained_chunks is not None:
+                drained_chunks.append(chunk)
+    except requests.exceptions.RequestException:
+        # The answer is already parsed; the connection is just not reused
+        pass
+    return drained
+
+
+def _parse_dashboard(html_content: str) -> dict:
+    """Extract quota and date information from the dashboard HTML.
+    
+    The GSB portal uses dynamically generated element IDs (JSF framework),
+    so we search by label text instead. This is more fragile but necessary.
+    All four fields are collected in a single streaming pass, and parsing
+    stops as soon as the last one is found.
+    
+    Args:
+        html_content: Raw HTML string from the dashboard page.
         
-        if response.status_code != 200:
-            return False
-            
-        soup = BeautifulSoup(response.text, 'html.parser')
+    Returns:
+        Dictionary with keys: 'quota', 'total_quota', 'date', 'last_login'.
+        Values default to "Not Found" if parsing fails.
+    """
+    return _extract_dashboard(html_content).data
+
+
+# --- Portal Client ---
+
+class PortalClient:
+    """Long-lived HTTP client for the GSB captive portal.
+    
+    A single requests.Session is kept for the lifetime of the process, so
+    the keep-alive connection pool (and with it the TLS session) and the
+    cookie jar are shared by every status check, login and logout. Portal
+    operations are serialized with a lock because the portal session is
+    stateful and the UI calls in from several worker threads.
+    
+    Transient failures (timeouts, dropped connections, 502/503/504) are
+    retried according to `retry`, and `breaker` stops contacting the
+    portal for a while once it keeps failing.
+    
+    Status answers are reused for `status_ttl` seconds, so polling
+    callers cost at most one portal request per TTL.
+    
+    With `stream_status` the status check stops downloading the
+    dashboard once the quota fields are parsed (see _stream_dashboard).
+    
+    With a `cookie_path` the cookie jar is loaded from and saved to that
+    file, so a login after a restart can reuse the portal session cookie.
+    """
+
+    def __init__(
+        self,
+        base_url: str = PORTAL_BASE_URL,
+        verify_ssl: bool = not SKIP_SSL_VERIFICATION,
+        latency: Optional[LatencyTracker] = None,
+        stream_status: bool = STREAM_STATUS_PAGE,
+        status_ttl: float = STATUS_CACHE_TTL,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        cookie_path: Optional[Path] = None,
+    ):
+        self.latency = latency or LatencyTracker()
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.base_url = base_url.rstrip("/")
+        self.login_url = f"{self.base_url}{LOGIN_ENDPOINT}"
+        self.index_url = f"{self.base_url}{INDEX_ENDPOINT}"
+        self.verify_ssl = verify_ssl
+        self.stream_status = stream_status
+        self.status_ttl = status_ttl
+        self._lock = threading.RLock()
+        self._session = requests.Session()
+        
+        # One host, so a small pool is enough; retries are done in _request
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        
+        # (ViewState, logout button name) of the last dashboard page seen
+        self._logout_form = None
+        self._closed = False
+        # (monotonic time, SessionInfo) of the last definite status answer
+        self._status = None
         
-        # Find ViewState
-        view_state_input = soup.find('input', {'name': 'javax.faces.ViewState'})
-        if not view_state_input:
+        # Wall-clock time the portal last answered with our session cookie
+        self._cookie_seen_at: Optional[float] = None
+        self.cookie_path = cookie_path
+        if cookie_path is not None:
+            self._load_cookies()
+            atexit.register(self.save_cookies)
+
+    def close(self) -> None:
+        """Close all pooled connections and stop sending requests.
+        
+        Deliberately not serialized with the lock, so another thread can
+        cancel a login in progress. A request already on the wire still
+        completes, but nothing after it is sent (no retry, no login POST
+        after the preflight) and the cookie jar is no longer written.
+        """
+        self._closed = True
+        self._session.close()
+        if self.cookie_path is not None:
+            atexit.unregister(self.save_cookies)
+
+    def _load_cookies(self) -> None:
+        try:
+            jar = LWPCookieJar()
+            jar.load(str(self.cookie_path), ignore_discard=True)
+            for cookie in jar:
+                self._session.cookies.set_cookie(cookie)
+            # save_cookies() stamps the file with the time the cookies were last used
+            self._cookie_seen_at = os.stat(self.cookie_path).st_mtime
+        except (IOError, OSError):
+            pass
+
+    def save_cookies(self) -> None:
+        """Write the portal cookies to `cookie_path` (session cookies included).
+        
+        No-op once the client is closed: a replaced or cancelled client
+        must not overwrite the jar of the client in use.
+        """
+        if self.cookie_path is None or self._closed:
+            return
+        jar = LWPCookieJar()
+        for cookie in self._session.cookies:
+            jar.set_cookie(cookie)
+        
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.cookie_path.parent, prefix=f".{self.cookie_path.name}.", suffix=".tmp"
+            )
+            os.close(fd)
+            jar.save(tmp_path, ignore_discard=True)
+            if self._cookie_seen_at is not None:
+                os.utime(tmp_path, (self._cookie_seen_at, self._cookie_seen_at))
+            os.replace(tmp_path, self.cookie_path)
+        except (IOError, OSError) as e:
+            print(f"Failed to write cookies: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _has_fresh_cookie(self) -> bool:
+        """True if we hold a portal session cookie the portal used recently."""
+        if self._cookie_seen_at is None or time.time() - self._cookie_seen_at > COOKIE_MAX_AGE:
             return False
-        view_state = view_state_input.get('value')
+        host = urlparse(self.base_url).hostname or ""
+        for cookie in self._session.cookies:
+            domain = cookie.domain.lstrip(".")
+            if cookie.name == PORTAL_SESSION_COOKIE and (host == domain or host.endswith("." + domain)):
+                return True
+        return False
+
+    def _request(
+        self, method: str, endpoint: str, url: str, floor: float, ceiling: float,
+        attempts: Optional[int] = None, **kwargs
+    ):
+        """Send a request with retries, an adaptive timeout and latency tracking.
         
-        # Find Logout Button (End Session)
-        # Based on HTML: <button ...>End Session</button>
-        # We look for a button containing "End Session" or "Oturumu Sonlandır"
-        logout_btn = soup.find('button', string=lambda t: t and ("End Session" in t or "Oturumu Sonlandır" in t))
+        Timed-out requests are recorded with the timeout that was used,
+        so a slowing portal pushes the next timeout up towards the ceiling.
+        Timeouts, connection errors and RETRY_STATUS_CODES responses are
+        retried up to `attempts` times (default: the retry policy's). If
+        every attempt fails, the last exception is raised or the last
+        response returned.
+        
+        Raises:
+            CircuitOpenError: The circuit breaker is open.
+            ClientClosedError: The client was closed before an attempt.
+        """
+        # Keyed by portal so e.g. a local stand-in does not skew the real estimates
+        endpoint = f"{self.base_url} {endpoint}"
+        attempts = attempts or self.retry.max_attempts
+        # Fixed for all attempts, so retries are not slowed down by the
+        # timeouts recorded for the previous attempts
+        timeout = self.latency.timeout(endpoint, floor, ceiling) if ADAPTIVE_TIMEOUTS else ceiling
         
-        if not logout_btn:
-            # Fallback: try finding by common GSB ID 'servisUpdateForm:j_idt159'
-            # (This is risky as IDs change, but serves as fallback)
-            logout_btn = soup.find('button', id=lambda i: i and 'j_idt159' in i)
+        for attempt in range(1, attempts + 1):
+            if self._closed:
+                raise ClientClosedError("The connection to the portal was closed.")
+            if not self.breaker.allow():
+                raise CircuitOpenError(
+                    f"Portal is not responding. Try again in {self.breaker.retry_after():.0f} seconds."
+                )
             
-        if not logout_btn:
-            return False
+            started = time.monotonic()
+            try:
+                response = self._session.request(method, url, verify=self.verify_ssl, timeout=timeout, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if isinstance(e, requests.exceptions.Timeout):
+                    self.latency.record(endpoint, timeout)
+                self.breaker.record_failure()
+                if attempt == attempts or self._closed:
+                    raise
+            except Exception:
+                # Not a portal failure (e.g. a malformed URL); just release a half-open trial
+                self.breaker.record_success()
+                raise
+            else:
+                self.latency.record(endpoint, time.monotonic() - started)
+                self._cookie_seen_at = time.time()
+                if response.status_code not in RETRY_STATUS_CODES:
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure()
+                if attempt == attempts or self._closed:
+                    return response
+                response.close()
             
-        btn_name = logout_btn.get('name')
+            time.sleep(self.retry.delay(attempt))
+
+    def _session_from_dashboard(self, html: str, message: str) -> SessionInfo:
+        """Parse a dashboard page and remember its logout form for later."""
+        extractor = _extract_dashboard(html, want_logout_form=True)
+        self._remember_logout_form(extractor)
+        return self._session_from_extractor(extractor, message)
+
+    def _remember_logout_form(self, extractor: _DashboardExtractor) -> None:
+        # Every dashboard page has a fresh ViewState; an old one may have expired
+        if extractor.view_state_found and extractor.logout_button:
+            self._logout_form = (extractor.view_state, extractor.logout_button)
+        else:
+            self._logout_form = None
+
+    @staticmethod
+    def _session_from_extractor(extractor: _DashboardExtractor, message: str) -> SessionInfo:
+        parsed_data = extractor.data
+        return SessionInfo(
+            success=True,
+            message=message,
+            remaining_quota=parsed_data["quota"],
+            total_quota=parsed_data["total_quota"],
+            quota_renewal_date=parsed_data["date"],
+            last_login=parsed_data["last_login"]
+        )
+
+    def check_status(self, max_age: Optional[float] = None) -> SessionInfo:
+        """Check if we are already connected to GSB WiFi.
         
-        # 2. Post the logout request
+        Attempts to access the dashboard page. If redirected to login,
+        we are not connected. If we see dashboard content, we are connected.
+        
+        Args:
+            max_age: Accept a remembered answer up to this many seconds
+                old (default `status_ttl`, 0 always asks the portal).
+                Connection errors are never remembered.
+        
+        Returns:
+            SessionInfo object with success=True if connected, False otherwise.
+        """
+        max_age = self.status_ttl if max_age is None else max_age
+        with self._lock:
+            if self._status is not None and time.monotonic() - self._status[0] < max_age:
+                return self._status[1]
+            
+            session = self._fetch_status()
+            if session.message != "Connection Error":
+                self._status = (time.monotonic(), session)
+            return session
+
+    def _fetch_status(self) -> SessionInfo:
+        with self._lock:
+            try:
+                response = self._request(
+                    "GET", "status", self.index_url, STATUS_TIMEOUT_FLOOR, INITIAL_REQUEST_TIMEOUT,
+                    attempts=STATUS_MAX_ATTEMPTS, stream=self.stream_status,
+                )
+                
+                if self.stream_status:
+                    # Take the logout form from the drained rest too, so
+                    # logout() keeps a current ViewState across auto-refreshes
+                    extractor = _stream_dashboard(response, want_logout_form=True)
+                    if extractor is not None:
+                        self._remember_logout_form(extractor)
+                        return self._session_from_extractor(extractor, "Already Connected")
+                    self._logout_form = None
+                    return SessionInfo(success=False, message="Not Connected")
+                
+                # If we see "Quota" or "Welcome", we are logged in
+                html = _dashboard_html(response)
+                if html is not None:
+                    return self._session_from_dashboard(html, "Already Connected")
+                else:
+                    self._logout_form = None
+                    return SessionInfo(success=False, message="Not Connected")
+                    
+            except Exception:
+                return SessionInfo(success=False, message="Connection Error")
+
+    def _post_logout(self, view_state: str, btn_name: str):
+        """Post the logout form (the "End Session" button click)."""
         post_data = {
             'javax.faces.ViewState': view_state,
             btn_name: btn_name, # The button clicked
             'servisUpdateForm': 'servisUpdateForm' # The form name
         }
+        return self._request(
+            "POST", "logout", self.index_url, LOGIN_TIMEOUT_FLOOR, LOGIN_REQUEST_TIMEOUT, data=post_data
+        )
+
+    def logout(self) -> bool:
+        """Terminate the current session.
         
-        res = session.post(URL_INDEX, data=post_data, verify=verify_ssl, timeout=LOGIN_REQUEST_TIMEOUT)
-        return res.status_code == 200
+        Uses the ViewState and button name remembered from the last
+        dashboard page, which makes logout a single POST. Only if that is
+        rejected (no cached form, expired view, still on the dashboard)
+        is the dashboard fetched and scraped again.
+        """
+        with self._lock:
+            self._status = None
+            try:
+                cached, self._logout_form = self._logout_form, None
+                if cached:
+                    res = self._post_logout(*cached)
+                    if res.status_code == 200 and not _is_dashboard(res.content):
+                        return True
+                
+                # 1. Get the dashboard page to find the ViewState and Button ID
+                response = self._request(
+                    "GET", "status", self.index_url, STATUS_TIMEOUT_FLOOR, INITIAL_REQUEST_TIMEOUT
+                )
+                
+                html = _dashboard_html(response)
+                if response.status_code != 200 or html is None:
+                    return False
+                
+                extractor = _extract_dashboard(html, want_logout_form=True)
+                if not extractor.view_state_found or not extractor.logout_button:
+                    return False
+                
+                # 2. Post the logout request
+                res = self._post_logout(extractor.view_state, extractor.logout_button)
+                return res.status_code == 200
 
-    except Exception:
-        return False
+            except Exception:
+                return False
 
+    def _preflight(self) -> None:
+        """GET the login page to obtain a session cookie (best effort, not retried)."""
+        try:
+            self._request(
+                "GET", "preflight", self.base_url, STATUS_TIMEOUT_FLOOR, INITIAL_REQUEST_TIMEOUT, attempts=1
+            )
+        except (CircuitOpenError, ClientClosedError):
+            raise
+        except Exception:
+            pass
 
-def connect_to_wifi(username: str, password: str) -> SessionInfo:
-    """Authenticate with the GSB WiFi portal and return session info."""
-    if not username or not password:
-        raise ValueError("Username and password cannot be empty.")
+    def login(self, username: str, password: str) -> SessionInfo:
+        """Authenticate with the GSB WiFi portal and return session info.
+        
+        The preflight GET for a session cookie is skipped while a fresh
+        one is held (e.g. reconnecting after a short Wi-Fi drop). If the
+        portal rejects the login posted with that cookie, the preflight
+        is done after all and the login posted once more.
+        """
+        if not username or not password:
+            raise ValueError("Username and password cannot be empty.")
 
-    session = requests.Session()
-    verify_ssl = not SKIP_SSL_VERIFICATION
-    
-    # Step 1: Initial request
-    try:
-        session.get(PORTAL_BASE_URL, verify=verify_ssl, timeout=INITIAL_REQUEST_TIMEOUT)
-    except Exception:
-        pass
+        with self._lock:
+            self._status = None
+            
+            # Step 1: Initial request
+            reuse_cookie = self._has_fresh_cookie()
+            if not reuse_cookie:
+                self._preflight()
 
-    # Step 2: Login
-    form_data = {"j_username": username, "j_password": password}
+            # Step 2: Login
+            form_data = {"j_username": username, "j_password": password}
 
-    try:
-        response = session.post(
-            LOGIN_URL, 
-            data=form_data, 
-            verify=verify_ssl, 
-            timeout=LOGIN_REQUEST_TIMEOUT
-        )
-        
-        if response.status_code == 200:
-            if "Quota" in response.text or "Hoşgeldiniz" in response.text:
-                parsed_data = _parse_dashboard(response.text)
-                return SessionInfo(
-                    success=True,
-                    message="Login Successful",
-                    remaining_quota=parsed_data["quota"],
-                    total_quota=parsed_data["total_quota"], # New field
-                    quota_renewal_date=parsed_data["date"],
-                    last_login=parsed_data["last_login"]
+            try:
+                response = self._request(
+                    "POST", "login", self.login_url, LOGIN_TIMEOUT_FLOOR, LOGIN_REQUEST_TIMEOUT, data=form_data
                 )
-            else:
-                raise AuthenticationError("Login failed. Username or password may be incorrect.")
-            
-        elif response.status_code in (401, 403):
-            raise AuthenticationError("Invalid username or password.")
-        else:
-            raise WifiConnectionError(f"Server error: {response.status_code}")
+                
+                html = _dashboard_html(response)
+                if reuse_cookie and html is None and response.status_code in (200, 401, 403):
+                    self._preflight()
+                    response = self._request(
+                        "POST", "login", self.login_url, LOGIN_TIMEOUT_FLOOR, LOGIN_REQUEST_TIMEOUT, data=form_data
+                    )
+                    html = _dashboard_html(response)
+                
+                if response.status_code == 200:
+                    if html is not None:
+                        session = self._session_from_dashboard(html, "Login Successful")
+                        self._status = (time.monotonic(), replace(session, message="Already Connected"))
+                        self.save_cookies()
+                        return session
+                    else:
+                        raise AuthenticationError("Login failed. Username or password may be incorrect.")
+                    
+                elif response.status_code in (401, 403):
+                    raise AuthenticationError("Invalid username or password.")
+                else:
+                    raise WifiConnectionError(f"Server error: {response.status_code}")
 
-    except requests.exceptions.Timeout:
-        raise NetworkTimeoutError("Request timed out. Are you connected to the GSB network?")
-    except requests.exceptions.ConnectionError:
-        raise WifiConnectionError("Cannot reach server. Check your WiFi connection.")
-    except (AuthenticationError, NetworkTimeoutError, WifiConnectionError):
-        raise
-    except Exception as e:
-        raise WifiConnectionError(f"Unexpected error: {str(e)}")
\ No newline at end of file
+            except requests.exceptions.Timeout:
+                raise NetworkTimeoutError("Request timed out. Are you connected to the GSB network?")
+            except requests.exceptions.ConnectionError:
+                raise WifiConnectionError("Cannot reach server. Check your WiFi connection.")
+            except (AuthenticationError, NetworkTimeoutError, WifiConnectionError):
+                raise
+            except Exception as e:
+                raise WifiConnectionError(f"Unexpected error: {str(e)}")
+
+
+_client = None
+_client_lock = threading.Lock()
+_latency = None
+_latency_lock = threading.Lock()
+
+
+def create_client() -> PortalClient:
+    """Build a PortalClient on the app's cookie jar and shared latency stats.
+    
+    Every client of the process (the shared one and a raced startup login)
+    starts from the persisted cookies and feeds one LatencyTracker, so
+    whichever client ends up shared keeps both up to date.
+    """
+    global _latency
+    from credentials import get_app_data_dir
+    app_dir = get_app_data_dir()
+    with _latency_lock:
+        if _latency is None:
+            _latency = LatencyTracker(app_dir / LATENCY_STATS_FILENAME)
+    return PortalClient(latency=_latency, cookie_path=app_dir / COOKIE_JAR_FILENAME)
+
+
+def get_client() -> PortalClient:
+    """Return the process-wide PortalClient, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client()
+    return _client
+
+
+def use_client(client: PortalClient) -> None:
+    """Make `client` the process-wide PortalClient (e.g. after a raced login)."""
+    global _client
+    with _client_lock:
+        old, _client = _client, client
+    if old is not None and old is not client:
+        old.close()
+
+
+# --- Main Connection Logic ---
+
+def check_connection_status(max_age: Optional[float] = None) -> SessionInfo:
+    """Check if we are already connected to GSB WiFi.
+    
+    Args:
+        max_age: Oldest remembered answer to accept, in seconds
+            (default STATUS_CACHE_TTL, 0 always asks the portal).
+    
+    Returns:
+        SessionInfo object with success=True if connected, False otherwise.
+    """
+    return get_client().check_status(max_age)
+
+
+def logout() -> bool:
+    """Terminate the current session."""
+    return get_client().logout()
+
+
+def connect_to_wifi(username: str, password: str) -> SessionInfo:
+    """Authenticate with the GSB WiFi portal and return session info."""
+    return get_client().login(username, password)
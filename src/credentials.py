@@ -5,15 +5,57 @@ and stores non-sensitive preferences in a local JSON config file.
 Supports multiple accounts with metadata (quota, last update).
 """
 
+import atexit
+import copy
 import json
 import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Union
 import datetime
+import sqlite3
 
-import keyring
+from config import (
+    KEYRING_SERVICE_ID,
+    APP_DATA_FOLDER,
+    CONFIG_FILENAME,
+    CONFIG_SAVE_DELAY,
+    ACCOUNT_STORE_BACKEND,
+    ACCOUNT_DB_FILENAME,
+    PASSWORD_CACHE_TTL,
+)
+from models import SessionInfo
 
-from config import KEYRING_SERVICE_ID, APP_DATA_FOLDER, CONFIG_FILENAME
+# The keyring package is imported on first use: importing it runs backend
+# discovery (entry points, D-Bus on Linux), which is slow at startup.
+keyring = None
+
+
+def _keyring():
+    """Return the keyring module, importing it on first call."""
+    global keyring
+    if keyring is None:
+        import keyring as keyring_module
+        keyring = keyring_module
+    return keyring
+
+
+def get_app_data_dir() -> Path:
+    """Return (and create) the per-user app data folder for this OS."""
+    if os.name == 'nt':  # Windows
+        base_path = os.getenv('LOCALAPPDATA')
+        if not base_path:
+            base_path = os.path.expanduser("~")
+        base_dir = Path(base_path)
+    else:  # Linux / Mac
+        base_dir = Path.home() / ".config"
+
+    app_dir = base_dir / APP_DATA_FOLDER
+    app_dir.mkdir(parents=True, exist_ok=True)
+    return app_dir
 
 
 class CredentialManager:
@@ -38,25 +80,34 @@ class CredentialManager:
     }
     """
 
-    def __init__(self):
-        """Initialize the credential manager and resolve config path."""
+    def __init__(self, save_delay: float = CONFIG_SAVE_DELAY):
+        """Initialize the credential manager and resolve config path.
+        
+        Args:
+            save_delay: Seconds to wait before writing changes, so bursts
+                of updates become one write. 0 writes synchronously.
+        """
         self.config_path = self._get_config_path()
+        self.save_delay = save_delay
+        
+        # Parsed config, reused until the file's (mtime, size) changes
+        self._lock = threading.RLock()
+        self._cache: Optional[dict] = None
+        self._cache_stamp: Optional[Tuple[int, int]] = None
+        
+        # Keyring cache: username -> (password or None, expiry on monotonic clock)
+        self._password_cache: Dict[str, Tuple[Optional[str], float]] = {}
+        
+        # Write-behind state
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+        
         self._migrate_legacy_config()
 
     def _get_config_path(self) -> Path:
         """Determine the appropriate config file path based on the OS."""
-        if os.name == 'nt':  # Windows
-            base_path = os.getenv('LOCALAPPDATA')
-            if not base_path:
-                base_path = os.path.expanduser("~")
-            base_dir = Path(base_path)
-        else:  # Linux / Mac
-            base_dir = Path.home() / ".config"
-
-        app_dir = base_dir / APP_DATA_FOLDER
-        app_dir.mkdir(parents=True, exist_ok=True)
-        
-        return app_dir / CONFIG_FILENAME
+        return get_app_data_dir() / CONFIG_FILENAME
 
     def _migrate_legacy_config(self) -> None:
         """Migrate old formats to the new dictionary-based account structure."""
@@ -96,107 +147,261 @@ class CredentialManager:
         except (json.JSONDecodeError, IOError):
             pass
 
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the config file, or None if missing."""
+        try:
+            st = self.config_path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
     def _load_config(self) -> dict:
-        """Load config from file."""
-        if not self.config_path.exists():
-            return {"accounts": {}, "last_used": None}
+        """Load config, re-reading the file only if it changed on disk.
         
-        try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                
-                # Ensure structure integrity if file was manually edited
-                if "accounts" not in data or not isinstance(data["accounts"], dict):
-                    data["accounts"] = {}
+        The returned dict is the shared in-memory copy: callers must hold
+        self._lock while they read or mutate it (the write-behind timer
+        snapshots it under the lock), and pass a mutated one to _save_config.
+        """
+        with self._lock:
+            # Unsaved changes are newer than anything on disk
+            if self._dirty:
+                return self._cache
+
+            stamp = self._file_stamp()
+            if stamp is None:
+                self._cache, self._cache_stamp = None, None
+                return {"accounts": {}, "last_used": None}
+            
+            if self._cache is not None and stamp == self._cache_stamp:
+                return self._cache
+            
+            try:
+                with open(self.config_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
                     
-                return data
-        except (json.JSONDecodeError, IOError):
-            return {"accounts": {}, "last_used": None}
+                    # Ensure structure integrity if file was manually edited
+                    if "accounts" not in data or not isinstance(data["accounts"], dict):
+                        data["accounts"] = {}
+            except (json.JSONDecodeError, IOError):
+                return {"accounts": {}, "last_used": None}
+            
+            self._cache, self._cache_stamp = data, stamp
+            return data
 
     def _save_config(self, config: dict) -> None:
-        """Save config to file."""
-        try:
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=2)
-        except IOError as e:
-            print(f"Failed to write config file: {e}")
+        """Schedule config to be written to file.
+        
+        The in-memory copy is updated immediately. The file write is
+        delayed by save_delay so that several changes in a row (e.g.
+        select account, connect, update quota) end up as a single write.
+        """
+        with self._lock:
+            self._cache = config
+            self._dirty = True
+            
+            if self.save_delay <= 0:
+                self.flush()
+            elif self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self) -> None:
+        """Write pending changes to disk now.
+        
+        The file is replaced atomically (temp file + fsync + rename), so a
+        crash mid-write leaves the previous config intact. What is written
+        is a deep copy taken under the lock, never the live dict. Runs on
+        the write-behind timer thread, so errors are reported, not raised.
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            
+            tmp_path = None
+            try:
+                snapshot = copy.deepcopy(self._cache)
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=self.config_path.parent, prefix=f".{self.config_path.name}.", suffix=".tmp"
+                )
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.config_path)
+            except Exception as e:
+                # Changes stay dirty and are retried by the next flush
+                print(f"Failed to write config file: {e}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+            
+            self._dirty = False
+            self._cache_stamp = self._file_stamp()
 
     def get_all_accounts(self) -> List[str]:
         """Get list of all saved account usernames."""
-        config = self._load_config()
-        return list(config.get("accounts", {}).keys())
+        with self._lock:
+            config = self._load_config()
+            return list(config.get("accounts", {}).keys())
 
     def get_account_metadata(self, username: str) -> Dict[str, Any]:
         """Get metadata (quota, date) for a specific account."""
-        config = self._load_config()
-        return config.get("accounts", {}).get(username, {})
+        with self._lock:
+            config = self._load_config()
+            return dict(config.get("accounts", {}).get(username, {}))
+
+    def get_accounts_with_metadata(self) -> Dict[str, Dict[str, Any]]:
+        """Get all accounts and their metadata in a single lookup.
+        
+        Returns:
+            Dict mapping username to metadata, in saved order.
+        """
+        with self._lock:
+            config = self._load_config()
+            return {user: dict(meta) for user, meta in config.get("accounts", {}).items()}
 
     def update_account_metadata(self, username: str, quota: str) -> None:
         """Update quota and timestamp for an account."""
-        config = self._load_config()
-        if username in config["accounts"]:
-            now_str = datetime.datetime.now().strftime("%d.%m.%Y %H:%M")
-            config["accounts"][username]["quota"] = quota
-            config["accounts"][username]["last_update"] = now_str
-            self._save_config(config)
+        with self._lock:
+            config = self._load_config()
+            if username in config["accounts"]:
+                now_str = datetime.datetime.now().strftime("%d.%m.%Y %H:%M")
+                config["accounts"][username]["quota"] = quota
+                config["accounts"][username]["last_update"] = now_str
+                self._save_config(config)
+
+    def update_account_session(self, username: str, session: SessionInfo) -> None:
+        """Store the quota of a fetched session, with its typed fields.
+        
+        Besides the "quota" display string this keeps remaining_bytes and
+        total_bytes (ints) and renewal_date / last_login (ISO strings), so
+        aggregating over accounts needs no string parsing.
+        """
+        with self._lock:
+            config = self._load_config()
+            if username in config["accounts"]:
+                meta = config["accounts"][username]
+                meta.update(session.to_metadata())
+                meta["last_update"] = datetime.datetime.now().strftime("%d.%m.%Y %H:%M")
+                self._save_config(config)
 
     def add_account(self, username: str, password: str) -> None:
         """Add a new account or update existing account password."""
         if not username or not password:
             raise ValueError("Username and password cannot be empty.")
 
-        # Store password in secure keyring
-        try:
-            keyring.set_password(KEYRING_SERVICE_ID, username, password)
-        except Exception as e:
-            print(f"Keyring error: {e}")
-            raise e
+        self._store_password(username, password)
 
         # Update config
-        config = self._load_config()
-        
-        # If new account, initialize metadata
-        if username not in config["accounts"]:
-            config["accounts"][username] = {"quota": "---", "last_update": "---"}
+        with self._lock:
+            config = self._load_config()
             
-        config["last_used"] = username
-        self._save_config(config)
+            # If new account, initialize metadata
+            if username not in config["accounts"]:
+                config["accounts"][username] = {"quota": "---", "last_update": "---"}
+                
+            config["last_used"] = username
+            self._save_config(config)
 
     def remove_account(self, username: str) -> None:
         """Remove an account from the saved list."""
+        self._delete_password(username)
+
+        with self._lock:
+            config = self._load_config()
+            if username in config["accounts"]:
+                del config["accounts"][username]
+            
+            if config["last_used"] == username:
+                remaining = list(config["accounts"].keys())
+                config["last_used"] = remaining[0] if remaining else None
+            
+            self._save_config(config)
+
+    def _store_password(self, username: str, password: str) -> None:
+        """Store password in secure keyring."""
         try:
-            keyring.delete_password(KEYRING_SERVICE_ID, username)
+            _keyring().set_password(KEYRING_SERVICE_ID, username, password)
+        except Exception as e:
+            print(f"Keyring error: {e}")
+            self.invalidate_password_cache(username)
+            raise e
+        self._cache_password(username, password)
+
+    def _delete_password(self, username: str) -> None:
+        """Remove password from keyring, ignoring missing entries."""
+        self.invalidate_password_cache(username)
+        try:
+            _keyring().delete_password(KEYRING_SERVICE_ID, username)
         except Exception:
             pass
 
-        config = self._load_config()
-        if username in config["accounts"]:
-            del config["accounts"][username]
-        
-        if config["last_used"] == username:
-            remaining = list(config["accounts"].keys())
-            config["last_used"] = remaining[0] if remaining else None
-        
-        self._save_config(config)
+    def _cache_password(self, username: str, password: Optional[str]) -> None:
+        with self._lock:
+            self._password_cache[username] = (password, time.monotonic() + PASSWORD_CACHE_TTL)
+
+    def invalidate_password_cache(self, username: Optional[str] = None) -> None:
+        """Drop cached passwords for one account, or all if username is None."""
+        with self._lock:
+            if username is None:
+                self._password_cache.clear()
+            else:
+                self._password_cache.pop(username, None)
 
     def get_password(self, username: str) -> Optional[str]:
-        """Get password for a specific username."""
+        """Get password for a specific username.
+        
+        Served from the in-memory cache when a fresh entry exists, so
+        only the first lookup per PASSWORD_CACHE_TTL reaches the keyring.
+        """
+        with self._lock:
+            entry = self._password_cache.get(username)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        
         try:
-            return keyring.get_password(KEYRING_SERVICE_ID, username)
+            password = _keyring().get_password(KEYRING_SERVICE_ID, username)
         except Exception:
             return None
+        self._cache_password(username, password)
+        return password
+
+    def prefetch_passwords(self, usernames: Optional[List[str]] = None) -> threading.Thread:
+        """Load passwords for all (or the given) accounts on a background thread.
+        
+        Later get_password calls for these accounts then return from the
+        cache without blocking on the keyring.
+        
+        Returns:
+            The started daemon thread, so callers can join it if needed.
+        """
+        if usernames is None:
+            usernames = self.get_all_accounts()
+        
+        def worker():
+            for user in usernames:
+                self.get_password(user)
+        
+        thread = threading.Thread(target=worker, name="keyring-prefetch", daemon=True)
+        thread.start()
+        return thread
 
     def set_last_used(self, username: str) -> None:
         """Set the last used account."""
-        config = self._load_config()
-        if username in config["accounts"]:
-            config["last_used"] = username
-            self._save_config(config)
+        with self._lock:
+            config = self._load_config()
+            if username in config["accounts"]:
+                config["last_used"] = username
+                self._save_config(config)
 
     def get_last_used(self) -> Optional[str]:
         """Get the last used account username."""
-        config = self._load_config()
-        return config.get("last_used")
+        with self._lock:
+            return self._load_config().get("last_used")
     
     # --- Legacy API Support ---
     
@@ -211,4 +416,295 @@ class CredentialManager:
         return username, password if password else ""
 
     def delete_credentials(self, username: str) -> None:
-        self.remove_account(username)
\ No newline at end of file
+        self.remove_account(username)
+
+
+def _update_epoch(last_update: str) -> Optional[float]:
+    """Epoch seconds of a "last_update" display string, None if unknown."""
+    try:
+        return datetime.datetime.strptime(last_update, "%d.%m.%Y %H:%M").timestamp()
+    except (ValueError, TypeError):
+        return None
+
+
+class SQLiteCredentialManager(CredentialManager):
+    """CredentialManager that keeps account metadata in SQLite.
+    
+    An opt-in for durability, not a speedup: every update is committed
+    as its own single-row transaction, so a crash loses nothing, while
+    the default JSON store may lose the last CONFIG_SAVE_DELAY seconds
+    of changes. The write-behind JSON store is faster at every size
+    (see benchmarks/bench_account_store.py). Passwords still live in
+    the OS keyring. On first use, accounts from an existing
+    JSON config (after the usual legacy migration) are imported.
+    
+    Schema:
+        accounts(username PRIMARY KEY, quota, last_update, remaining_bytes,
+                 total_bytes, renewal_date, last_login, updated_at)
+        settings(key PRIMARY KEY, value)   -- holds "last_used"
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS accounts (
+            username    TEXT PRIMARY KEY,
+            quota       TEXT NOT NULL DEFAULT '---',
+            last_update TEXT NOT NULL DEFAULT '---'
+        );
+        CREATE TABLE IF NOT EXISTS settings (
+            key   TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, save_delay: float = CONFIG_SAVE_DELAY):
+        """Initialize the store, creating and importing the DB if needed."""
+        super().__init__(save_delay=save_delay)
+        self.db_path = self.config_path.with_name(ACCOUNT_DB_FILENAME)
+        
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self._SCHEMA)
+        self._add_session_columns()
+        self._index_updated_at()
+        self._import_json_config()
+
+    # Typed session fields, added to databases created before they existed
+    _SESSION_COLUMNS = (
+        ("remaining_bytes", "INTEGER"),
+        ("total_bytes", "INTEGER"),
+        ("renewal_date", "TEXT"),
+        ("last_login", "TEXT"),
+    )
+
+    def _add_session_columns(self) -> None:
+        existing = {row[1] for row in self._db.execute("PRAGMA table_info(accounts)")}
+        for name, sql_type in self._SESSION_COLUMNS + (("updated_at", "REAL"),):
+            if name not in existing:
+                self._db.execute(f"ALTER TABLE accounts ADD COLUMN {name} {sql_type}")
+
+    def _index_updated_at(self) -> None:
+        # last_update is a display string ("%d.%m.%Y %H:%M") that does not
+        # sort chronologically; recency queries use the epoch column instead
+        self._db.execute("DROP INDEX IF EXISTS idx_accounts_last_update")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_accounts_updated_at ON accounts(updated_at)")
+        rows = self._db.execute(
+            "SELECT username, last_update FROM accounts WHERE updated_at IS NULL AND last_update != '---'"
+        ).fetchall()
+        with self._db:
+            self._db.executemany(
+                "UPDATE accounts SET updated_at = ? WHERE username = ?",
+                [(_update_epoch(text), user) for user, text in rows]
+            )
+
+    def _import_json_config(self) -> None:
+        """Copy accounts from the JSON config into an empty database once."""
+        with self._lock:
+            if self._get_setting("json_imported"):
+                return
+            
+            config = self._load_config()
+            with self._db:
+                self._db.execute("BEGIN")
+                session_columns = [name for name, _ in self._SESSION_COLUMNS]
+                columns = ["username", "quota", "last_update", "updated_at"] + session_columns
+                self._db.executemany(
+                    f"INSERT OR IGNORE INTO accounts ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    [
+                        (user, meta.get("quota", "---"), meta.get("last_update", "---"),
+                         _update_epoch(meta.get("last_update", "---")))
+                        + tuple(meta.get(name) for name in session_columns)
+                        for user, meta in config["accounts"].items()
+                    ]
+                )
+                if config.get("last_used"):
+                    self._set_setting("last_used", config["last_used"])
+                self._set_setting("json_imported", "1")
+
+    def _get_setting(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_setting(self, key: str, value: Optional[str]) -> None:
+        self._db.execute(
+            "INSERT INTO settings (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
+
+    def _account_exists(self, username: str) -> bool:
+        return self._db.execute(
+            "SELECT 1 FROM accounts WHERE username = ?", (username,)
+        ).fetchone() is not None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def get_all_accounts(self) -> List[str]:
+        """Get list of all saved account usernames."""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT username FROM accounts ORDER BY rowid")]
+
+    _METADATA_COLUMNS = ("quota", "last_update") + tuple(name for name, _ in _SESSION_COLUMNS)
+
+    @classmethod
+    def _metadata(cls, row) -> Dict[str, Any]:
+        # Typed fields are left out until a session was stored, like in the JSON store
+        return {
+            key: value for key, value in zip(cls._METADATA_COLUMNS, row)
+            if value is not None or key in ("quota", "last_update")
+        }
+
+    def get_account_metadata(self, username: str) -> Dict[str, Any]:
+        """Get metadata (quota, date) for a specific account."""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(self._METADATA_COLUMNS)} FROM accounts WHERE username = ?", (username,)
+            ).fetchone()
+        return self._metadata(row) if row else {}
+
+    def get_accounts_with_metadata(self) -> Dict[str, Dict[str, Any]]:
+        """Get all accounts and their metadata in a single query."""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT username, {', '.join(self._METADATA_COLUMNS)} FROM accounts ORDER BY rowid"
+            ).fetchall()
+        return {row[0]: self._metadata(row[1:]) for row in rows}
+
+    def update_account_metadata(self, username: str, quota: str) -> None:
+        """Update quota and timestamp for an account."""
+        now = datetime.datetime.now()
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE accounts SET quota = ?, last_update = ?, updated_at = ? WHERE username = ?",
+                (quota, now.strftime("%d.%m.%Y %H:%M"), now.timestamp(), username)
+            )
+
+    def update_account_session(self, username: str, session: SessionInfo) -> None:
+        """Store the quota of a fetched session, with its typed fields."""
+        meta = session.to_metadata()
+        now = datetime.datetime.now()
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE accounts SET quota = ?, last_update = ?, updated_at = ?, remaining_bytes = ?, "
+                "total_bytes = ?, renewal_date = ?, last_login = ? WHERE username = ?",
+                (meta["quota"], now.strftime("%d.%m.%Y %H:%M"), now.timestamp(), meta["remaining_bytes"],
+                 meta["total_bytes"], meta["renewal_date"], meta["last_login"], username)
+            )
+
+    def add_account(self, username: str, password: str) -> None:
+        """Add a new account or update existing account password."""
+        if not username or not password:
+            raise ValueError("Username and password cannot be empty.")
+
+        self._store_password(username, password)
+
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            self._db.execute("INSERT OR IGNORE INTO accounts (username) VALUES (?)", (username,))
+            self._set_setting("last_used", username)
+
+    def remove_account(self, username: str) -> None:
+        """Remove an account from the saved list."""
+        self._delete_password(username)
+
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            self._db.execute("DELETE FROM accounts WHERE username = ?", (username,))
+            if self._get_setting("last_used") == username:
+                row = self._db.execute("SELECT username FROM accounts ORDER BY rowid LIMIT 1").fetchone()
+                self._set_setting("last_used", row[0] if row else None)
+
+    def set_last_used(self, username: str) -> None:
+        """Set the last used account."""
+        with self._lock, self._db:
+            if self._account_exists(username):
+                self._set_setting("last_used", username)
+
+    def get_last_used(self) -> Optional[str]:
+        """Get the last used account username."""
+        with self._lock:
+            return self._get_setting("last_used")
+
+
+class AsyncCredentialManager:
+    """Runs CredentialManager calls on a background worker.
+    
+    For the UI: keyring backends (Secret Service on Linux) and config
+    writes can block for hundreds of milliseconds, so the frames never
+    call the manager directly. Every method submits the call and returns
+    a Future right away; the frames consume it through TaskRunner.watch().
+    
+    Calls run one at a time in submission order, so a read submitted
+    after a write sees that write.
+    
+    Args:
+        manager: The wrapped CredentialManager (still usable directly
+            from worker threads, e.g. the CLI or startup), or a Future of
+            it that is still being built; it is then awaited on the worker.
+    """
+
+    def __init__(self, manager: Union[CredentialManager, Future]):
+        self._manager = manager
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="credentials")
+
+    @property
+    def manager(self) -> CredentialManager:
+        """The wrapped manager; blocks while a Future of it is pending."""
+        if isinstance(self._manager, Future):
+            return self._manager.result()
+        return self._manager
+
+    def _submit(self, fn, *args) -> Future:
+        return self._executor.submit(fn, *args)
+
+    def _call(self, method: str, *args) -> Future:
+        """Submit manager.<method>(*args), resolving the manager on the worker."""
+        return self._submit(lambda: getattr(self.manager, method)(*args))
+
+    def get_accounts(self) -> Future:
+        """Future[(accounts with metadata, last used username)]."""
+        return self._submit(lambda: (self.manager.get_accounts_with_metadata(), self.manager.get_last_used()))
+
+    def get_last_used(self) -> Future:
+        return self._call("get_last_used")
+
+    def get_password(self, username: str) -> Future:
+        return self._call("get_password", username)
+
+    def select_account(self, username: str) -> Future:
+        """Make `username` the last used account. Future[password or None]."""
+        def select():
+            self.manager.set_last_used(username)
+            return self.manager.get_password(username)
+        return self._submit(select)
+
+    def set_last_used(self, username: str) -> Future:
+        return self._call("set_last_used", username)
+
+    def add_account(self, username: str, password: str) -> Future:
+        return self._call("add_account", username, password)
+
+    def remove_account(self, username: str) -> Future:
+        return self._call("remove_account", username)
+
+    def record_session(self, session: SessionInfo) -> Future:
+        """Store `session` as the metadata of the last used account."""
+        def record():
+            username = self.manager.get_last_used()
+            if username:
+                self.manager.update_account_session(username, session)
+        return self._submit(record)
+
+    def shutdown(self) -> None:
+        """Finish the queued calls in the background and accept no more."""
+        self._executor.shutdown(wait=False)
+
+
+def create_credential_manager() -> CredentialManager:
+    """Create the credential manager for the configured storage backend."""
+    if ACCOUNT_STORE_BACKEND == "sqlite":
+        return SQLiteCredentialManager()
+    return CredentialManager()
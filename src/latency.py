@@ -0,0 +1,140 @@
+"""Rolling latency estimates and adaptive request timeouts.
+
+The portal's response time varies a lot between dormitories and times
+of day, so fixed timeouts are either too long (waiting 10 s for a dead
+portal) or too short. LatencyTracker keeps a per-endpoint estimate
+(EWMA plus a sliding-window percentile sketch) and derives each
+request's timeout from it, clamped to configured floors and ceilings.
+The estimates are persisted next to user_preferences.json so they
+survive restarts.
+"""
+
+import atexit
+import json
+import math
+import os
+import tempfile
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import (
+    LATENCY_EWMA_ALPHA,
+    LATENCY_WINDOW_SIZE,
+    LATENCY_MIN_SAMPLES,
+    TIMEOUT_LATENCY_MULTIPLIER,
+)
+
+
+class EndpointLatency:
+    """Latency statistics for one endpoint.
+
+    Attributes:
+        ewma: Exponentially weighted moving average in seconds.
+        ewmvar: Exponentially weighted variance in seconds^2.
+        samples: The last LATENCY_WINDOW_SIZE samples (percentile sketch).
+    """
+
+    def __init__(self, ewma: Optional[float] = None, ewmvar: float = 0.0, samples=()):
+        self.ewma = ewma
+        self.ewmvar = ewmvar
+        self.samples = deque(samples, maxlen=LATENCY_WINDOW_SIZE)
+
+    def add(self, seconds: float) -> None:
+        if self.ewma is None:
+            self.ewma = seconds
+        else:
+            diff = seconds - self.ewma
+            self.ewma += LATENCY_EWMA_ALPHA * diff
+            self.ewmvar = (1 - LATENCY_EWMA_ALPHA) * (self.ewmvar + LATENCY_EWMA_ALPHA * diff * diff)
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile (0 < q <= 1) of the recent samples."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+    def to_dict(self) -> dict:
+        return {"ewma": self.ewma, "ewmvar": self.ewmvar, "samples": list(self.samples)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EndpointLatency":
+        return cls(data.get("ewma"), data.get("ewmvar", 0.0), data.get("samples", ()))
+
+
+class LatencyTracker:
+    """Thread-safe per-endpoint latency estimates with optional persistence.
+
+    Args:
+        path: JSON file to load from and save to. None keeps the
+            estimates in memory only.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, EndpointLatency] = {}
+        self._dirty = False
+        if path is not None:
+            self._load()
+            atexit.register(self.save)
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        """Add a response time sample (or the timeout, for timed-out requests)."""
+        with self._lock:
+            self._endpoints.setdefault(endpoint, EndpointLatency()).add(seconds)
+            self._dirty = True
+
+    def stats(self, endpoint: str) -> Optional[EndpointLatency]:
+        with self._lock:
+            return self._endpoints.get(endpoint)
+
+    def timeout(self, endpoint: str, floor: float, ceiling: float) -> float:
+        """Timeout for the next request to `endpoint`.
+
+        Until LATENCY_MIN_SAMPLES responses were seen this is `ceiling`
+        (the old fixed timeout). Afterwards it is the larger of
+        p99 * TIMEOUT_LATENCY_MULTIPLIER and EWMA + 4 standard deviations,
+        clamped to [floor, ceiling].
+        """
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None or len(stats.samples) < LATENCY_MIN_SAMPLES:
+                return ceiling
+            estimate = max(
+                stats.percentile(0.99) * TIMEOUT_LATENCY_MULTIPLIER,
+                stats.ewma + 4 * math.sqrt(stats.ewmvar),
+            )
+        return min(ceiling, max(floor, estimate))
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._endpoints = {name: EndpointLatency.from_dict(d) for name, d in data.items()}
+        except (json.JSONDecodeError, IOError, AttributeError, TypeError):
+            self._endpoints = {}
+
+    def save(self) -> None:
+        """Write the estimates to disk if anything changed."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {name: stats.to_dict() for name, stats in self._endpoints.items()}
+            self._dirty = False
+
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except (IOError, OSError) as e:
+            print(f"Failed to write latency stats: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -8,10 +8,15 @@ Example:
     $ python main.py
 """
 
-from ui import WindowMain
-from connection import connect_to_wifi
+from startup import StartupPipeline
 
 if __name__ == "__main__":
-    # connect_to_wifi is passed but handled internally by new UI controller
-    ui = WindowMain(connect_to_wifi)
+    # Probe the portal and load credentials while Tk initializes
+    startup = StartupPipeline().start()
+
+    # Imported afterwards so the pipeline overlaps with the GUI imports;
+    # connecting is handled internally by the UI controller
+    from ui import WindowMain
+
+    ui = WindowMain(startup=startup)
     ui.run()
@@ -1,12 +1,49 @@
 """Data models for the GSB WiFi Auto Connect application."""
 
-from dataclasses import dataclass
+import datetime
+from dataclasses import dataclass, fields
+from decimal import Decimal, InvalidOperation
+from typing import Optional
 
+# The portal reports quotas in MB (binary megabytes)
+BYTES_PER_MB = 1024 * 1024
 
-@dataclass
+
+def parse_quota(text: str) -> Optional[int]:
+    """Parse a quota string like "32764.83 MB" into bytes."""
+    try:
+        return int(Decimal(text.split(" ")[0]) * BYTES_PER_MB)
+    except (InvalidOperation, ValueError, OverflowError, IndexError, AttributeError):
+        # ValueError / OverflowError: "NaN MB" / "Infinity MB"
+        return None
+
+
+def parse_renewal_date(text: str) -> Optional[datetime.date]:
+    """Parse the portal's renewal date ("01/02/2026", day first)."""
+    try:
+        return datetime.datetime.strptime(text, "%d/%m/%Y").date()
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_last_login(text: str) -> Optional[datetime.datetime]:
+    """Parse the portal's last login timestamp ("02.01.2026 23:34")."""
+    for fmt in ("%d.%m.%Y %H:%M", "%d.%m.%Y %H:%M:%S"):
+        try:
+            return datetime.datetime.strptime(text, fmt)
+        except (ValueError, TypeError):
+            continue
+    return None
+
+
+@dataclass(slots=True)
 class SessionInfo:
     """Data class representing session information after login.
-    
+
+    The string fields are what the portal showed and are used for
+    display. The typed fields are parsed from them once, when the
+    session is created, unless given explicitly.
+
     Attributes:
         success: Whether the login was successful.
         message: Status message from the server or application.
@@ -14,6 +51,10 @@ class SessionInfo:
         total_quota: Total data quota in MB.
         quota_renewal_date: Date when the quota will be renewed.
         last_login: Timestamp of the last successful login.
+        remaining_bytes: Remaining quota in bytes, None if unknown.
+        total_bytes: Total quota in bytes, None if unknown.
+        renewal_date: Parsed quota_renewal_date, None if unknown.
+        last_login_at: Parsed last_login, None if unknown.
     """
     success: bool
     message: str
@@ -21,26 +62,57 @@ class SessionInfo:
     total_quota: str = "---"
     quota_renewal_date: str = "---"
     last_login: str = "---"
-    
+    remaining_bytes: Optional[int] = None
+    total_bytes: Optional[int] = None
+    renewal_date: Optional[datetime.date] = None
+    last_login_at: Optional[datetime.datetime] = None
+
+    def __post_init__(self):
+        if self.remaining_bytes is None:
+            self.remaining_bytes = parse_quota(self.remaining_quota)
+        if self.total_bytes is None:
+            self.total_bytes = parse_quota(self.total_quota)
+        if self.renewal_date is None:
+            self.renewal_date = parse_renewal_date(self.quota_renewal_date)
+        if self.last_login_at is None:
+            self.last_login_at = parse_last_login(self.last_login)
+
     @property
     def quota_percent(self) -> float:
         """Calculate the percentage of quota used.
-        
+
         Returns:
             Float between 0.0 and 1.0 representing usage.
-            Returns 0.0 if parsing fails.
+            Returns 0.0 if the quotas are unknown.
         """
-        try:
-            # Parse strings like "32764.83 MB" -> 32764.83
-            rem_str = self.remaining_quota.split(" ")[0]
-            tot_str = self.total_quota.split(" ")[0]
-            
-            remaining = float(rem_str)
-            total = float(tot_str)
-            
-            if total <= 0:
-                return 0.0
-                
-            return remaining / total
-        except (ValueError, IndexError):
-            return 0.0
\ No newline at end of file
+        if self.remaining_bytes is None or not self.total_bytes or self.total_bytes <= 0:
+            return 0.0
+        return self.remaining_bytes / self.total_bytes
+
+    def to_metadata(self) -> dict:
+        """Account metadata fields for the credential store (JSON-safe)."""
+        return {
+            "quota": self.remaining_quota,
+            "remaining_bytes": self.remaining_bytes,
+            "total_bytes": self.total_bytes,
+            "renewal_date": self.renewal_date.isoformat() if self.renewal_date else None,
+            "last_login": self.last_login_at.isoformat() if self.last_login_at else None,
+        }
+
+    def to_dict(self) -> dict:
+        """All fields as a JSON-safe dict (dates in ISO format)."""
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        for key in ("renewal_date", "last_login_at"):
+            if data[key] is not None:
+                data[key] = data[key].isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SessionInfo":
+        """Inverse of to_dict(). Raises TypeError/ValueError for bad data."""
+        data = dict(data)
+        if data.get("renewal_date"):
+            data["renewal_date"] = datetime.date.fromisoformat(data["renewal_date"])
+        if data.get("last_login_at"):
+            data["last_login_at"] = datetime.datetime.fromisoformat(data["last_login_at"])
+        return cls(**data)
@@ -0,0 +1,78 @@
+"""Adaptive interval for refreshing the dashboard quota.
+
+The dashboard re-reads the portal's status page on a timer. Polling at
+a fixed rate is either wasteful (an idle account for hours) or too slow
+(a download eating the last gigabytes). RefreshSchedule estimates the
+consumption rate from successive refreshes and picks the next delay so
+that about QUOTA_REFRESH_STEP of the total quota is used in between,
+refreshing faster once the quota is low.
+"""
+
+import time
+from typing import Optional
+
+from config import (
+    QUOTA_REFRESH_MIN_INTERVAL,
+    QUOTA_REFRESH_MAX_INTERVAL,
+    QUOTA_REFRESH_LOW_INTERVAL,
+    QUOTA_REFRESH_STEP,
+    QUOTA_LOW_FRACTION,
+    QUOTA_RATE_EWMA_ALPHA,
+)
+from models import SessionInfo
+
+
+class RefreshSchedule:
+    """Picks the delay before the next quota refresh of one account.
+
+    Not thread-safe; the dashboard only uses it from the Tk main thread.
+
+    Attributes:
+        rate: Smoothed consumption in bytes per second, None until two
+            refreshes with known quotas have been seen.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = QUOTA_REFRESH_MIN_INTERVAL,
+        max_interval: float = QUOTA_REFRESH_MAX_INTERVAL,
+        low_interval: float = QUOTA_REFRESH_LOW_INTERVAL,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.low_interval = low_interval
+        self.rate: Optional[float] = None
+        self._last: Optional[tuple] = None   # (monotonic time, remaining bytes)
+
+    def reset(self) -> None:
+        """Forget the history (e.g. after switching accounts)."""
+        self.rate = None
+        self._last = None
+
+    def observe(self, session: SessionInfo, now: Optional[float] = None) -> float:
+        """Record a fresh session and return seconds until the next refresh."""
+        now = time.monotonic() if now is None else now
+        remaining = session.remaining_bytes
+        if remaining is None or not session.total_bytes:
+            # Nothing to measure; check back at the idle pace
+            return self.max_interval
+
+        if self._last is not None:
+            then, previous = self._last
+            if remaining > previous:
+                # Quota was renewed; the old rate says nothing anymore
+                self.rate = None
+            elif now > then:
+                sample = (previous - remaining) / (now - then)
+                self.rate = sample if self.rate is None else (
+                    QUOTA_RATE_EWMA_ALPHA * sample + (1 - QUOTA_RATE_EWMA_ALPHA) * self.rate
+                )
+        self._last = (now, remaining)
+
+        if self.rate:
+            interval = QUOTA_REFRESH_STEP * session.total_bytes / self.rate
+        else:
+            interval = self.max_interval
+        if session.quota_percent <= QUOTA_LOW_FRACTION:
+            interval = min(interval, self.low_interval)
+        return max(self.min_interval, min(self.max_interval, interval))
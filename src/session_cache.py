@@ -0,0 +1,127 @@
+"""Last known dashboard per account, for stale-while-revalidate rendering.
+
+WindowMain shows the snapshot of the last used account as soon as the
+window opens, marked stale, and replaces it in place once the background
+status check answers. Snapshots are persisted next to
+user_preferences.json with the time they were taken, write-behind like
+the config: a change is written save_delay seconds later, together with
+any other change made in the meantime.
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from config import CONFIG_SAVE_DELAY
+from models import SessionInfo
+
+
+class SessionCache:
+    """Thread-safe username -> (SessionInfo, timestamp) store.
+
+    Args:
+        path: JSON file to load from and save to. None keeps the
+            snapshots in memory only.
+        save_delay: Seconds to wait before writing changes. 0 writes
+            synchronously.
+    """
+
+    def __init__(self, path: Optional[Path] = None, save_delay: float = CONFIG_SAVE_DELAY):
+        self.path = path
+        self.save_delay = save_delay
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        if path is not None:
+            self._load()
+            atexit.register(self.save)
+
+    def put(self, username: str, session: SessionInfo) -> None:
+        """Remember a freshly fetched, successful session of `username`."""
+        if not username or not session.success:
+            return
+        with self._lock:
+            self._entries[username] = {"time": time.time(), "session": session.to_dict()}
+        self._schedule_save()
+
+    def get(self, username: Optional[str]) -> Optional[Tuple[SessionInfo, float]]:
+        """Return (snapshot, age in seconds) of `username`, or None."""
+        with self._lock:
+            entry = self._entries.get(username) if username else None
+            if entry is None:
+                return None
+            try:
+                session = SessionInfo.from_dict(entry["session"])
+            except (TypeError, ValueError):
+                # Written by an older version with different fields
+                return None
+            return session, max(0.0, time.time() - entry["time"])
+
+    def discard(self, username: str) -> None:
+        """Forget the snapshot of `username`, e.g. when the account is removed."""
+        with self._lock:
+            if self._entries.pop(username, None) is None:
+                return
+        self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        """Mark the snapshots changed and write them after save_delay."""
+        with self._lock:
+            self._dirty = True
+            write_now = self.save_delay <= 0
+            if not write_now and self.path is not None and self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self.save)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+        if write_now:
+            self.save()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._entries = {
+                name: entry for name, entry in data.items()
+                if isinstance(entry, dict) and "time" in entry and isinstance(entry.get("session"), dict)
+            }
+        except (json.JSONDecodeError, IOError, AttributeError):
+            self._entries = {}
+
+    def save(self) -> None:
+        """Write the snapshots to disk now if anything changed.
+        
+        The file is replaced atomically (temp file + rename). Writes are
+        serialized, so an older snapshot never replaces a newer one.
+        """
+        if self.path is None:
+            return
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if not self._dirty:
+                    return
+                data = dict(self._entries)
+                self._dirty = False
+
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except (IOError, OSError) as e:
+                print(f"Failed to write session cache: {e}")
+                with self._lock:
+                    # Retried by the next save
+                    self._dirty = True
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
@@ -0,0 +1,229 @@
+"""Connectivity watchdog with automatic re-login.
+
+Keeps the portal session alive without busy polling: the watchdog
+thread sleeps until either the periodic check interval expires or the
+OS reports a network change (Linux netlink route/link/address events),
+then checks the session and re-logs in the last used account with
+exponential backoff if it was lost.
+
+Worst-case time from session loss to the next re-login attempt is
+bounded by WATCHDOG_CHECK_INTERVAL (loss without a network event) plus
+WATCHDOG_BACKOFF_MAX per failed attempt. Downtime is reported from the
+first check that found the session missing.
+"""
+
+import functools
+import os
+import select
+import socket
+import threading
+import time
+from typing import Callable, Optional
+
+from config import (
+    WATCHDOG_CHECK_INTERVAL,
+    WATCHDOG_BACKOFF_INITIAL,
+    WATCHDOG_BACKOFF_MAX,
+    WATCHDOG_SETTLE_DELAY,
+)
+from models import SessionInfo
+
+# rtnetlink multicast groups (linux/rtnetlink.h)
+_RTMGRP_LINK = 0x1
+_RTMGRP_IPV4_IFADDR = 0x10
+_RTMGRP_IPV4_ROUTE = 0x40
+_RTMGRP_IPV6_IFADDR = 0x100
+_NETLINK_ROUTE = 0
+
+
+# --- Network Change Monitors ---
+
+class PollingMonitor:
+    """Fallback monitor without OS events: wait() simply times out."""
+
+    def __init__(self):
+        self._wakeup = threading.Event()
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to `timeout` seconds. Returns True if a network event arrived."""
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+        return False
+
+    def wakeup(self) -> None:
+        """Interrupt a pending wait() (used on shutdown)."""
+        self._wakeup.set()
+
+    def close(self) -> None:
+        pass
+
+
+class NetlinkMonitor:
+    """Linux monitor that wakes on link, address and route changes."""
+
+    def __init__(self):
+        groups = _RTMGRP_LINK | _RTMGRP_IPV4_IFADDR | _RTMGRP_IPV4_ROUTE | _RTMGRP_IPV6_IFADDR
+        self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, _NETLINK_ROUTE)
+        self._sock.bind((0, groups))
+        self._sock.setblocking(False)
+        self._wake_r, self._wake_w = os.pipe()
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to `timeout` seconds. Returns True if a network event arrived."""
+        ready, _, _ = select.select([self._sock, self._wake_r], [], [], timeout)
+        if self._wake_r in ready:
+            os.read(self._wake_r, 512)
+        if self._sock in ready:
+            self._drain()
+            return True
+        return False
+
+    def _drain(self) -> None:
+        """Discard queued messages; one wakeup per burst of changes is enough."""
+        while True:
+            try:
+                self._sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # ENOBUFS: the kernel dropped messages during a burst. The
+                # change itself was seen, which is all the watchdog needs.
+                return
+
+    def wakeup(self) -> None:
+        os.write(self._wake_w, b"x")
+
+    def close(self) -> None:
+        self._sock.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+
+def create_network_monitor():
+    """Return a NetlinkMonitor where supported, else a PollingMonitor."""
+    try:
+        return NetlinkMonitor()
+    except (AttributeError, OSError):
+        # Not Linux (no AF_NETLINK) or netlink not permitted
+        return PollingMonitor()
+
+
+# --- Watchdog ---
+
+class ConnectivityWatchdog:
+    """Background service that re-logs in when the portal session is lost.
+
+    Args:
+        creds: CredentialManager used to look up the last used account.
+        check: Status probe, defaults to connection.check_connection_status.
+        connect: Login call, defaults to connection.connect_to_wifi.
+        monitor: Network change monitor, defaults to create_network_monitor().
+        on_reconnect: Called with (downtime_seconds, SessionInfo) after a
+            successful re-login, from the watchdog thread.
+    """
+
+    def __init__(
+        self,
+        creds,
+        check: Optional[Callable[[], SessionInfo]] = None,
+        connect: Optional[Callable[[str, str], SessionInfo]] = None,
+        monitor=None,
+        on_reconnect: Optional[Callable[[float, SessionInfo], None]] = None,
+        check_interval: float = WATCHDOG_CHECK_INTERVAL,
+        backoff_initial: float = WATCHDOG_BACKOFF_INITIAL,
+        backoff_max: float = WATCHDOG_BACKOFF_MAX,
+    ):
+        if check is None or connect is None:
+            from connection import check_connection_status, connect_to_wifi
+            # The watchdog reacts to network changes, so never reuse an old answer
+            check = check or functools.partial(check_connection_status, max_age=0)
+            connect = connect or connect_to_wifi
+
+        self.creds = creds
+        self._check = check
+        self._connect = connect
+        self.monitor = monitor or create_network_monitor()
+        self.on_reconnect = on_reconnect
+        self.check_interval = check_interval
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._backoff = 0.0
+
+        # Session loss bookkeeping (monotonic timestamps / seconds)
+        self.lost_at: Optional[float] = None
+        self.reconnects = 0
+        self.last_downtime: Optional[float] = None
+        self.max_downtime = 0.0
+
+    def start(self) -> None:
+        """Start the watchdog thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the watchdog thread and wait for it to exit."""
+        self._stop.set()
+        self.monitor.wakeup()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def check_now(self) -> None:
+        """Wake the watchdog thread to check the session right away."""
+        self.monitor.wakeup()
+
+    def run_forever(self) -> None:
+        """Run the watchdog loop on the calling thread until stop()."""
+        self._run()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            delay = self.run_once()
+            if self.monitor.wait(delay) and not self._stop.is_set():
+                # Give DHCP / association a moment before probing the portal
+                self._stop.wait(WATCHDOG_SETTLE_DELAY)
+                self._backoff = 0.0
+
+    def run_once(self) -> float:
+        """Check the session once, re-logging in if needed.
+
+        Returns:
+            Seconds to sleep before the next check.
+        """
+        if self._check().success:
+            self.lost_at = None
+            self._backoff = 0.0
+            return self.check_interval
+
+        now = time.monotonic()
+        if self.lost_at is None:
+            self.lost_at = now
+
+        username, password = self.creds.get_last_credentials()
+        if username and password:
+            try:
+                session = self._connect(username, password)
+            except Exception:
+                session = None
+            if session is not None and session.success:
+                self._on_reconnected(session)
+                return self.check_interval
+
+        # Exponential backoff between failed attempts
+        self._backoff = min(self.backoff_max, self._backoff * 2 if self._backoff else self.backoff_initial)
+        return self._backoff
+
+    def _on_reconnected(self, session: SessionInfo) -> None:
+        downtime = time.monotonic() - self.lost_at
+        self.lost_at = None
+        self._backoff = 0.0
+        self.reconnects += 1
+        self.last_downtime = downtime
+        self.max_downtime = max(self.max_downtime, downtime)
+
+        if self.on_reconnect:
+            self.on_reconnect(downtime, session)
@@ -0,0 +1,187 @@
+"""Cold-start pipeline for the application.
+
+Starts the portal status probe and the credential loading (config file
+and keyring) on background threads as early as possible, so both run
+while Tk and the window are still being created. The UI icons are
+decoded alongside them, and the cached dashboard snapshots are read from
+disk. The UI later picks up the results through
+futures.
+
+The heavy modules (requests, keyring, PIL) are imported by the worker threads,
+so importing this module is cheap and main.py can start the pipeline
+before anything else.
+
+In race mode (STARTUP_RACE_MODE) the auto-login for the last used account
+is also started right away, in parallel with the status probe, instead
+of after it.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+from models import SessionInfo
+from config import STARTUP_RACE_MODE
+
+if TYPE_CHECKING:
+    from connection import PortalClient
+
+
+def _check_connection_status() -> SessionInfo:
+    from connection import check_connection_status
+    return check_connection_status()
+
+
+def _create_credential_manager():
+    from credentials import create_credential_manager
+    return create_credential_manager()
+
+
+def _create_client():
+    from connection import create_client
+    return create_client()
+
+
+def _preload_icons() -> None:
+    from ui.icons import preload_icons
+    preload_icons()
+
+
+def _load_session_cache():
+    from config import SESSION_CACHE_FILENAME
+    from credentials import get_app_data_dir
+    from session_cache import SessionCache
+    return SessionCache(get_app_data_dir() / SESSION_CACHE_FILENAME)
+
+
+def _use_client(client) -> None:
+    from connection import use_client
+    use_client(client)
+
+
+class StartupPipeline:
+    """Runs the startup probe and credential fetch concurrently.
+    
+    Attributes (available after start()):
+        status: Future[SessionInfo] of the initial connection probe.
+        manager: Future of the CredentialManager.
+        last_credentials: Future[(username, password)] of the last used account.
+        session: Future[SessionInfo] of the race outcome (race mode only).
+        icons: Future of the icon preload (None without a preload step).
+        session_cache: Future of the SessionCache with the stored snapshots.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], SessionInfo] = _check_connection_status,
+        manager_factory: Callable = _create_credential_manager,
+        race: bool = STARTUP_RACE_MODE,
+        client_factory: Callable = _create_client,
+        preload: Optional[Callable[[], None]] = _preload_icons,
+        session_cache_factory: Callable = _load_session_cache,
+    ):
+        self._probe = probe
+        self._manager_factory = manager_factory
+        self.race = race
+        self._client_factory = client_factory
+        self._preload = preload
+        self._session_cache_factory = session_cache_factory
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Login attempt of the race; guarded so cancellation can close it
+        self._race_lock = threading.Lock()
+        self._race_cancelled = False
+        self._race_client: Optional["PortalClient"] = None
+        
+        self.status: Optional[Future] = None
+        self.manager: Optional[Future] = None
+        self.last_credentials: Optional[Future] = None
+        self.session: Optional[Future] = None
+        self.icons: Optional[Future] = None
+        self.session_cache: Optional[Future] = None
+
+    def start(self) -> "StartupPipeline":
+        """Submit the startup work and return immediately."""
+        self._executor = ThreadPoolExecutor(max_workers=7, thread_name_prefix="startup")
+        self.status = self._executor.submit(self._probe)
+        self.manager = self._executor.submit(self._manager_factory)
+        # A worker task, not a done-callback: if the manager were already
+        # built, add_done_callback would read the keyring on this thread
+        self.last_credentials = self._executor.submit(self._load_credentials)
+        if self._preload is not None:
+            # Icons are decoded while the probe waits on the network
+            self.icons = self._executor.submit(self._preload)
+        self.session_cache = self._executor.submit(self._session_cache_factory)
+        
+        if self.race:
+            login = self._executor.submit(self._race_login)
+            self.session = self._executor.submit(self._resolve_race, login)
+        
+        self._executor.shutdown(wait=False)
+        return self
+
+    def _load_credentials(self) -> Tuple[str, str]:
+        """Read the last used credentials (keyring) once the manager exists."""
+        manager = self.manager.result()
+        credentials = manager.get_last_credentials()
+        # Warm the keyring cache for the other accounts as well
+        manager.prefetch_passwords()
+        return credentials
+
+    def wait_credentials(self, timeout: Optional[float] = None) -> Tuple[str, str]:
+        """Block until the last used credentials are loaded."""
+        return self.last_credentials.result(timeout=timeout)
+
+    # --- Race Mode ---
+
+    def _race_login(self) -> Optional[Tuple["PortalClient", SessionInfo]]:
+        """Log in the last used account on a dedicated client."""
+        try:
+            username, password = self.wait_credentials()
+        except Exception:
+            return None
+        if not username or not password:
+            return None
+        
+        with self._race_lock:
+            if self._race_cancelled:
+                return None
+            client = self._race_client = self._client_factory()
+        
+        try:
+            return client, client.login(username, password)
+        except Exception:
+            # Includes the ClientClosedError of a race cancelled mid-login
+            client.close()
+            return None
+
+    def _cancel_race_login(self) -> None:
+        """Stop the login attempt: a started client sends no further request."""
+        with self._race_lock:
+            self._race_cancelled = True
+            if self._race_client is not None:
+                self._race_client.close()
+
+    def _resolve_race(self, login: Future) -> SessionInfo:
+        """Pick the winner: an existing session beats a fresh login.
+        
+        The login only counts once the probe has ruled out an existing
+        session, so the result never depends on which call returns first.
+        """
+        status = self.status.result()
+        if status.success:
+            self._cancel_race_login()
+            return status
+        
+        outcome = login.result()
+        if outcome is None:
+            return status
+        
+        client, session = outcome
+        if not session.success:
+            client.close()
+            return status
+        
+        # Keep the logged-in connection and cookies for later calls
+        _use_client(client)
+        return session
@@ -1,20 +1,54 @@
-"""Main App Controller handling View switching."""
+"""Main App Controller handling View switching.
+
+Each view is built on first use and then kept: switching raises the
+existing frame and refreshes it in place instead of destroying and
+rebuilding the whole widget tree.
+
+While a session is shown, a ConnectivityWatchdog re-logs in the last used
+account when the session drops. Its logins run as "session" tasks, so they
+never overlap with a logout or account switch clicked in the window.
+"""
+
+import queue
+from concurrent.futures import Future
 
-import threading
 import customtkinter as ctk
 from config import *
-from credentials import CredentialManager
-from connection import check_connection_status, connect_to_wifi
-from ui.frames import LoginFrame, DashboardFrame
+from startup import StartupPipeline
+from ui.tasks import TaskRunner, checkpoint
+
+def _warm_imports():
+    """Import the view modules (requests, PIL, ...) in the background while the loader shows."""
+    import ui.frames  # noqa: F401
 
 class WindowMain:
-    def __init__(self, connect_callback=None):
+    def __init__(self, connect_callback=None, startup=None):
+        # Reuse the pipeline started in main.py, or start one now
+        self.startup = startup or StartupPipeline().start()
+        
         self.root = ctk.CTk()
         self.root.title(WINDOW_TITLE)
         self.root.geometry(WINDOW_GEOMETRY)
         self.root.configure(fg_color=COLOR_BG_MAIN)
+        # Every background action of the window and its frames runs here
+        self.tasks = TaskRunner(self.root)
         
-        self.creds = CredentialManager()
+        from credentials import AsyncCredentialManager
+        # Keyring and config I/O of the views runs off the main thread; the
+        # manager is still being built by the pipeline and awaited there
+        self.accounts = AsyncCredentialManager(self.startup.manager)
+        # Future[SessionCache], read from disk by the pipeline as well
+        self.sessions = self.startup.session_cache
+        self.login_view = None
+        self.dash = None
+        self.current = None
+        
+        self.watchdog = None
+        # Re-login only while a session is shown; logging out disarms it
+        self._keep_connected = False
+        # (username, password, Future) re-login requests of the watchdog thread
+        self._reconnects = queue.SimpleQueue()
+        self._closing = False
         self.container = ctk.CTkFrame(self.root, fg_color="transparent")
         self.container.pack(fill="both", expand=True)
 
@@ -25,41 +59,208 @@ class WindowMain:
         )
         self.lbl_loading.place(relx=0.5, rely=0.5, anchor="center")
         
-        self.root.after(200, self._check_init)
+        # Frames (and PIL) are only needed after the first paint
+        self.tasks.submit(("warm-imports",), _warm_imports)
+        self.root.after(0, self._check_init)
 
     def _check_init(self):
-        threading.Thread(target=self._bg_check, daemon=True).start()
+        # In the "session" group, so a click on the stale dashboard supersedes it
+        self.tasks.submit(("startup",), self._bg_check, group="session", on_done=self._startup_done)
+        
+        # Stale-while-revalidate: show the last known dashboard right away,
+        # _bg_check then refreshes it in place or replaces it
+        self.tasks.watch(self.accounts.get_last_used(), on_done=self._show_cached)
+
+    def _with_sessions(self, callback):
+        """Run callback(session cache) on the main thread once it is loaded."""
+        self.tasks.watch(self.sessions, on_done=callback)
+
+    def _forget_session(self, username):
+        # A removed account's snapshot must not be shown or kept on disk
+        self._with_sessions(lambda sessions: sessions.discard(username))
+
+    def _show_cached(self, username):
+        self._with_sessions(lambda sessions: self._show_snapshot(sessions.get(username)))
+
+    def _show_snapshot(self, cached):
+        # Too late if the startup check has already shown a view
+        if cached and self.current is None:
+            session, age = cached
+            self.show_dash(session, stale_age=age)
 
     def _bg_check(self):
-        # 1. Connected?
-        sess = check_connection_status()
+        """Resolve the startup session (runs on a worker).
+        
+        Returns:
+            The SessionInfo to show, or None for the login view.
+        """
+        if self.startup.race:
+            # Probe and auto-login were started together at process start
+            sess = self.startup.session.result()
+            return sess if sess.success else None
+
+        # 1. Connected? (probe already running since process start)
+        sess = self.startup.status.result()
         if sess.success:
-            self.root.after(0, lambda: self.show_dash(sess))
-            return
+            return sess
 
         # 2. Auto-Connect?
-        u, p = self.creds.get_last_credentials()
+        try:
+            u, p = self.startup.wait_credentials()
+        except Exception:
+            u, p = "", ""
         if u and p:
-            self.root.after(0, lambda: self.lbl_loading.configure(text=f"Connecting {u}..."))
+            from connection import connect_to_wifi
+            # A logout clicked on the stale dashboard supersedes this task
+            checkpoint()
+            self.tasks.call_soon(self._set_progress, f"Connecting {u}...")
             try:
                 ns = connect_to_wifi(u, p)
                 if ns.success:
-                    self.root.after(0, lambda: self.show_dash(ns))
-                    return
+                    return ns
             except Exception: pass
         
-        self.root.after(0, self.show_login)
+        return None
+
+    def _startup_done(self, session):
+        if session is None:
+            self.show_login()
+        else:
+            self._revalidated(session)
+        # Started after the startup check, so its first probe is not a duplicate
+        self.tasks.watch(self.startup.manager, on_done=self._start_watchdog)
+
+    def _set_progress(self, text):
+        if self.current is self.dash is not None:
+            self.dash.set_notice(text.upper())
+        else:
+            self.lbl_loading.configure(text=text)
+
+    def _revalidated(self, session):
+        """Show a freshly fetched session (updates a stale dashboard in place)."""
+        self.show_dash(session)
+
+    # --- Watchdog ---
+
+    def _start_watchdog(self, manager):
+        from session_watchdog import ConnectivityWatchdog
+        self.watchdog = ConnectivityWatchdog(manager, connect=self._request_reconnect)
+        self.watchdog.start()
+        self.root.after(WATCHDOG_UI_POLL_MS, self._poll_reconnects)
+
+    def _request_reconnect(self, username, password):
+        """Watchdog login: run by the Tk thread as a task (blocks the watchdog thread)."""
+        if self._closing:
+            return None
+        done = Future()
+        self._reconnects.put((username, password, done))
+        return done.result()
+
+    def _poll_reconnects(self):
+        while True:
+            try:
+                username, password, done = self._reconnects.get_nowait()
+            except queue.Empty:
+                break
+            self._start_reconnect(username, password, done)
+        if not self._closing:
+            self.root.after(WATCHDOG_UI_POLL_MS, self._poll_reconnects)
+
+    def _start_reconnect(self, username, password, done):
+        # Logged out on purpose, or a logout / switch is running: the
+        # watchdog backs off and asks again later
+        if not self._keep_connected or self.tasks.busy("session"):
+            done.set_result(None)
+            return
+        from connection import connect_to_wifi
+
+        def reconnect():
+            try:
+                session = connect_to_wifi(username, password)
+            except Exception as e:
+                done.set_exception(e)
+                raise
+            done.set_result(session)
+            return session
+
+        task = self.tasks.submit(
+            ("reconnect", username), reconnect, group="session",
+            on_done=self._revalidated, on_error=self._reconnect_failed
+        )
+        # Superseded before it started: the watchdog must not wait forever
+        task.future.add_done_callback(lambda _: done.cancel())
+
+    def _reconnect_failed(self, error):
+        from connection import AuthenticationError
+        if isinstance(error, AuthenticationError):
+            # The stored password stopped working; the user has to step in
+            self.show_login()
+
+    def _session_lost(self):
+        """The dashboard saw the portal end the session."""
+        if self.watchdog is None:
+            self.show_login()
+            return
+        self.dash.set_notice("SESSION ENDED  ·  RECONNECTING")
+        self.watchdog.check_now()
+
+    def _stop_watchdog(self):
+        self._closing = True
+        while True:
+            try:
+                self._reconnects.get_nowait()[2].cancel()
+            except queue.Empty:
+                break
+        if self.watchdog is not None:
+            self.watchdog.stop(timeout=1)
+            self.watchdog.monitor.close()
+
+    # --- Views ---
 
     def show_login(self):
-        self._clear()
-        LoginFrame(self.container, self.creds, self.show_dash).pack(fill="both", expand=True)
+        from ui.frames import LoginFrame
+        self._keep_connected = False
+        if self.dash is not None:
+            self.dash.stop_refresh()
+        if self.login_view is None:
+            self.login_view = LoginFrame(
+                self.container, self.accounts, self.show_dash, self.tasks, on_remove=self._forget_session
+            )
+        else:
+            self.login_view.refresh()
+        self._raise(self.login_view)
 
-    def show_dash(self, session):
-        self._clear()
-        # on_switch calls show_dash recursively
-        DashboardFrame(self.container, session, self.creds, self.show_login, self.show_dash).pack(fill="both", expand=True)
+    def show_dash(self, session, stale_age=None):
+        from ui.frames import DashboardFrame
+        if stale_age is None:
+            self._keep_connected = True
+            self.tasks.watch(
+                self.accounts.get_last_used(),
+                on_done=lambda user: self._with_sessions(lambda sessions: sessions.put(user, session))
+            )
+        if self.dash is None:
+            # on_switch calls show_dash again, which then updates in place
+            self.dash = DashboardFrame(
+                self.container, session, self.accounts, self.show_login, self.show_dash, self.tasks,
+                stale_age=stale_age, on_session_lost=self._session_lost
+            )
+        else:
+            self.dash.show_session(session, stale_age)
+        self._raise(self.dash)
 
-    def _clear(self):
-        for w in self.container.winfo_children(): w.destroy()
+    def _raise(self, view):
+        if self.current is None:
+            self.lbl_loading.place_forget()
+        if not view.winfo_manager():
+            view.place(relx=0, rely=0, relwidth=1, relheight=1)
+        view.tkraise()
+        self.current = view
 
-    def run(self): self.root.mainloop()
+    def run(self):
+        try:
+            self.root.mainloop()
+        finally:
+            # Cancels a queued watchdog login, so the watchdog can exit
+            self.tasks.shutdown()
+            self._stop_watchdog()
+            self.accounts.shutdown()
@@ -104,3 +104,24 @@ class SocialButton(ctk.CTkButton):
             fg_color=color, hover_color=hover_color,
             command=command
         )
+
+
+class WidgetUpdater:
+    """Applies widget options only when they differ from what is shown.
+    
+    CustomTkinter widgets redraw their canvas on every configure() call,
+    even when nothing changed. Views that are kept alive and refreshed
+    with new data go through this so unchanged labels are not touched.
+    """
+    
+    def __init__(self):
+        self._shown = {}
+    
+    def configure(self, widget, **options) -> bool:
+        """configure() the changed options. Returns True if any changed."""
+        shown = self._shown.setdefault(widget, {})
+        changed = {key: value for key, value in options.items() if shown.get(key, self) != value}
+        if changed:
+            widget.configure(**changed)
+            shown.update(changed)
+        return bool(changed)
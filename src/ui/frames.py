@@ -1,41 +1,57 @@
 """Application frames for Login and Dashboard views (Zen Mode - Sharp Edition)."""
 
 import webbrowser
-import threading
-from PIL import Image
 import customtkinter as ctk
 from tkinter import messagebox
 
 from config import *
-from connection import connect_to_wifi, logout, WifiConnectionError, AuthenticationError, NetworkTimeoutError
-from ui.components import CustomDialog, SocialButton
-
-def resource_path(relative_path: str) -> str:
-    """Helper to get resource path."""
-    import sys, os
-    try:
-        base_path = sys._MEIPASS
-    except AttributeError:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+from connection import connect_to_wifi, logout, check_connection_status, WifiConnectionError, AuthenticationError, NetworkTimeoutError
+from quota_refresh import RefreshSchedule
+from ui.components import CustomDialog, SocialButton, WidgetUpdater
+from ui.icons import get_icon
+from ui.tasks import checkpoint
+
+def format_age(seconds: float) -> str:
+    """Short "how long ago" text for stale snapshots, e.g. "5 MIN"."""
+    minutes = int(seconds // 60)
+    if minutes < 1:
+        return "<1 MIN"
+    if minutes < 60:
+        return f"{minutes} MIN"
+    if minutes < 24 * 60:
+        return f"{minutes // 60} H"
+    return f"{minutes // (24 * 60)} D"
 
 class LoginFrame(ctk.CTkFrame):
-    """Minimalist Zen Login Screen."""
+    """Minimalist Zen Login Screen.
+    
+    Built once and kept alive by WindowMain; refresh() brings it up to
+    date each time it is raised again. Account storage goes through the
+    AsyncCredentialManager `accounts`, so no handler waits on the keyring
+    or the config file. `on_remove(username)` is called after an account
+    is removed, for state kept outside the account store.
+    """
     
-    def __init__(self, master, creds_manager, on_connect_success):
+    def __init__(self, master, accounts, on_connect_success, tasks, on_remove=None):
         super().__init__(master, fg_color="transparent")
-        self.creds_manager = creds_manager
+        self.accounts = accounts
         self.on_connect_success = on_connect_success
+        self.tasks = tasks
+        self.on_remove = on_remove
+        self.updater = WidgetUpdater()
+        self._accounts_shown = None
+        self.map_label_to_user = {}
         
         self._load_icons()
         self._setup_ui()
         self._load_accounts()
 
     def _load_icons(self):
+        # Decoded once per process, usually already preloaded at startup
         self.icons = {
-            "github": ctk.CTkImage(light_image=Image.open(resource_path(ICON_GITHUB)), size=(20, 20)),
-            "insta": ctk.CTkImage(light_image=Image.open(resource_path(ICON_INSTAGRAM)), size=(20, 20)),
-            "linkedin": ctk.CTkImage(light_image=Image.open(resource_path(ICON_LINKEDIN)), size=(20, 20))
+            "github": get_icon(ICON_GITHUB, (20, 20)),
+            "insta": get_icon(ICON_INSTAGRAM, (20, 20)),
+            "linkedin": get_icon(ICON_LINKEDIN, (20, 20))
         }
 
     def _setup_ui(self):
@@ -106,15 +122,24 @@ class LoginFrame(ctk.CTkFrame):
         SocialButton(footer, self.icons["insta"], COLOR_INSTAGRAM, COLOR_INSTAGRAM_HOVER, lambda: webbrowser.open(INSTAGRAM_URL)).pack(side="left", padx=5)
         SocialButton(footer, self.icons["linkedin"], COLOR_LINKEDIN, COLOR_LINKEDIN_HOVER, lambda: webbrowser.open(LINKEDIN_URL)).pack(side="left", padx=5)
 
+    def refresh(self):
+        """Re-enable CONNECT and reload the accounts if they changed."""
+        self.updater.configure(self.btn_connect, state="normal", text="CONNECT")
+        self._load_accounts()
+
     def _load_accounts(self):
-        accounts = self.creds_manager.get_all_accounts()
-        last_used = self.creds_manager.get_last_used()
+        self.tasks.watch(self.accounts.get_accounts(), on_done=self._show_accounts)
+
+    def _show_accounts(self, snapshot):
+        if snapshot == self._accounts_shown:
+            return
+        self._accounts_shown = snapshot
+        accounts, last_used = snapshot
         
         display_list = []
         self.map_label_to_user = {}
         
-        for u in accounts:
-            meta = self.creds_manager.get_account_metadata(u)
+        for u, meta in accounts.items():
             quota = meta.get("quota", "---")
             label = f"{u}  |  {quota}" if quota != "---" else u # Pipe separator for sharp look
             display_list.append(label)
@@ -138,24 +163,34 @@ class LoginFrame(ctk.CTkFrame):
 
     def _on_account_selected(self, selection):
         username = self.map_label_to_user.get(selection, selection)
-        pwd = self.creds_manager.get_password(username)
+        self.entry_pwd.delete(0, 'end')
+        self.tasks.watch(
+            self.accounts.select_account(username),
+            on_done=lambda pwd: self._show_password(username, pwd)
+        )
+
+    def _show_password(self, username, pwd):
+        # Another account may have been selected while the keyring answered
+        sel = self.account_var.get()
+        if self.map_label_to_user.get(sel, sel) != username: return
         self.entry_pwd.delete(0, 'end')
         if pwd: self.entry_pwd.insert(0, pwd)
-        self.creds_manager.set_last_used(username)
 
     def _on_add(self):
         u = CustomDialog.ask_string(self, "New Account", "Username:")
         if not u: return
         p = CustomDialog.ask_string(self, "New Account", f"Password for {u}:", is_password=True)
         if not p: return
-        self.creds_manager.add_account(u, p)
+        self.tasks.watch(self.accounts.add_account(u, p))
         self._load_accounts()
 
     def _on_remove(self):
         sel = self.account_var.get()
         user = self.map_label_to_user.get(sel, sel)
         if user and CustomDialog.ask_confirm(self, "Remove Account", f"Remove '{user}'?"):
-            self.creds_manager.remove_account(user)
+            self.tasks.watch(self.accounts.remove_account(user))
+            if self.on_remove:
+                self.on_remove(user)
             self._load_accounts()
 
     def _on_connect(self):
@@ -165,37 +200,106 @@ class LoginFrame(ctk.CTkFrame):
         
         if not user or not pwd: return
 
-        self.creds_manager.add_account(user, pwd)
-        self.btn_connect.configure(state="disabled", text="CONNECTING...")
-        threading.Thread(target=self._connect_thread, args=(user, pwd), daemon=True).start()
-
-    def _connect_thread(self, user, pwd):
-        try:
-            session = connect_to_wifi(user, pwd)
-            self.after(0, lambda: self.on_connect_success(session))
-        except Exception as e:
-            self.after(0, lambda: self._handle_error(e))
+        self.tasks.watch(self.accounts.add_account(user, pwd))
+        self.updater.configure(self.btn_connect, state="disabled", text="CONNECTING...")
+        self.tasks.submit(
+            ("connect", user), connect_to_wifi, user, pwd, group="session",
+            on_done=self.on_connect_success, on_error=self._handle_error
+        )
 
     def _handle_error(self, e):
-        self.btn_connect.configure(state="normal", text="CONNECT")
+        self.updater.configure(self.btn_connect, state="normal", text="CONNECT")
         CustomDialog(self, "Connection Failed", str(e))
 
 
 class DashboardFrame(ctk.CTkFrame):
-    """Zen Mode Dashboard - Sharp Edition"""
+    """Zen Mode Dashboard - Sharp Edition
+    
+    Built once and kept alive by WindowMain; show_session() applies each
+    new session by touching only the widgets whose text or color changed.
+    With `stale_age` (seconds) the session is a cached snapshot: it is
+    drawn muted with a "last seen" notice until a fresh one is shown.
     
-    def __init__(self, master, session, creds_manager, on_logout, on_switch):
+    While a fresh session is shown, one Tk timer re-reads the status page
+    (with the current portal cookie) at the pace RefreshSchedule picks and
+    shows the result in place. The fetch runs on the shared TaskRunner.
+    If the portal has ended the session, `on_session_lost` is called
+    (default: `on_logout`).
+    """
+    
+    def __init__(self, master, session, accounts, on_logout, on_switch, tasks, stale_age=None, on_session_lost=None):
         super().__init__(master, fg_color="transparent")
-        self.session = session
-        self.creds_manager = creds_manager
+        self.accounts = accounts
         self.on_logout = on_logout
+        self.on_session_lost = on_session_lost or on_logout
         self.on_switch = on_switch
+        self.tasks = tasks
+        self.updater = WidgetUpdater()
+        self.session = None
+        self.current_user = None
+        self.map_label = {}
+        self.schedule = RefreshSchedule()
+        self._refresh_job = None
+        self._refresh_task = None
         
-        self.current_user = creds_manager.get_last_used()
-        if self.current_user:
-            creds_manager.update_account_metadata(self.current_user, session.remaining_quota)
-            
         self._setup_ui()
+        self.show_session(session, stale_age)
+
+    def show_session(self, session, stale_age=None):
+        """Display `session`, updating only what differs from the shown one."""
+        self.session = session
+        self.stale = stale_age is not None
+        
+        if not self.stale:
+            self.tasks.watch(self.accounts.record_session(session))
+        # Queued after record_session, so the dropdown shows the new quota
+        self.tasks.watch(self.accounts.get_accounts(), on_done=self._refresh_dropdown)
+        
+        self._show_session()
+        self.set_notice(f"LAST SEEN {format_age(stale_age)} AGO  ·  UPDATING" if self.stale else "")
+        if not self.stale:
+            self._schedule_refresh(self.schedule.observe(session))
+
+    # --- Auto Refresh ---
+
+    def _schedule_refresh(self, delay):
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+        self._refresh_job = self.after(int(delay * 1000), self._auto_refresh)
+
+    def _auto_refresh(self):
+        self._refresh_job = None
+        self._refresh_task = self.tasks.submit(
+            ("refresh",), check_connection_status, on_done=self._on_refreshed,
+            on_error=lambda e: self._on_refreshed(None)
+        )
+
+    def _on_refreshed(self, session):
+        self._refresh_task = None
+        if session is not None and session.success:
+            # WindowMain.show_dash: also updates the cached snapshot
+            self.on_switch(session)
+        elif session is not None and session.message == "Not Connected":
+            # The portal answered: the session is gone, not the network
+            self.stop_refresh()
+            self.on_session_lost()
+        else:
+            self.set_notice("OFFLINE  ·  RETRYING")
+            self._schedule_refresh(self.schedule.min_interval)
+
+    def stop_refresh(self):
+        """Stop auto-refreshing (logout, account switch, view hidden)."""
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        self.schedule.reset()
+
+    def destroy(self):
+        self.stop_refresh()
+        super().destroy()
 
     def _setup_ui(self):
         # Top Bar (Account Switcher - Minimal)
@@ -208,25 +312,27 @@ class DashboardFrame(ctk.CTkFrame):
         hero = ctk.CTkFrame(self, fg_color="transparent")
         hero.place(relx=0.5, rely=0.5, anchor="center")
         
-        percent = int(self.session.quota_percent * 100)
-        ring_color = COLOR_ACCENT_PRIMARY if percent > 20 else COLOR_DANGER
-        
         # Simulated Ring
         self.ring = ctk.CTkButton(
-            hero, text=f"{percent}%",
+            hero, text="",
             font=("Outfit", 54, "bold"), text_color="#FFFFFF",
             width=220, height=220, corner_radius=110, # Keep circular for ring
-            fg_color="transparent", border_width=4, border_color=ring_color,
+            fg_color="transparent", border_width=4,
             hover=False
         )
         self.ring.pack()
         
-        ctk.CTkLabel(hero, text=self.session.remaining_quota, font=("Outfit", 28), text_color=COLOR_TEXT_MAIN).pack(pady=(20, 0))
+        self.lbl_quota = ctk.CTkLabel(hero, text="", font=("Outfit", 28), text_color=COLOR_TEXT_MAIN)
+        self.lbl_quota.pack(pady=(20, 0))
         ctk.CTkLabel(hero, text="REMAINING", font=("Outfit", 12, "bold"), text_color=COLOR_TEXT_MUTED).pack()
 
+        # Stale snapshot / progress notice
+        self.lbl_notice = ctk.CTkLabel(self, text="", font=("Outfit", 11, "bold"), text_color=COLOR_TEXT_MUTED)
+        self.lbl_notice.place(relx=0.5, rely=0.16, anchor="center")
+
         # Bottom details
         self.lbl_renewal = ctk.CTkLabel(
-            self, text=f"RENEWS {self.session.quota_renewal_date}",
+            self, text="",
             font=("Outfit", 13, "bold"), text_color=COLOR_TEXT_MUTED
         )
         self.lbl_renewal.place(relx=0.5, rely=0.85, anchor="center")
@@ -240,23 +346,41 @@ class DashboardFrame(ctk.CTkFrame):
             command=self._on_logout_click
         ).place(relx=0.5, rely=0.93, anchor="center")
 
-    def _setup_dropdown(self, parent):
-        accounts = self.creds_manager.get_all_accounts()
+    def _show_session(self):
+        percent = int(self.session.quota_percent * 100)
+        if self.stale:
+            ring_color = COLOR_BG_SECONDARY
+        else:
+            ring_color = COLOR_ACCENT_PRIMARY if percent > 20 else COLOR_DANGER
+        self.updater.configure(self.ring, text=f"{percent}%", border_color=ring_color)
+        self.updater.configure(self.lbl_quota, text=self.session.remaining_quota)
+        self.updater.configure(self.lbl_renewal, text=f"RENEWS {self.session.quota_renewal_date}")
+
+    def set_notice(self, text):
+        self.updater.configure(self.lbl_notice, text=text)
+
+    def _refresh_dropdown(self, snapshot):
+        accounts, self.current_user = snapshot
         display_list = []
         self.map_label = {}
-        current_disp = self.current_user
+        current_disp = self.current_user or ""
         
-        for u in accounts:
-            meta = self.creds_manager.get_account_metadata(u)
+        for u, meta in accounts.items():
             quota = meta.get("quota", "---")
             label = f"{u} | {quota}" if quota != "---" else u
             display_list.append(label)
             self.map_label[label] = u
             if u == self.current_user: current_disp = label
 
-        self.acc_var = ctk.StringVar(value=current_disp)
+        # The combobox is disabled while a switch is running
+        self.updater.configure(self.cmb, values=display_list, state="normal")
+        if self.acc_var.get() != current_disp:
+            self.acc_var.set(current_disp)
+
+    def _setup_dropdown(self, parent):
+        self.acc_var = ctk.StringVar()
         self.cmb = ctk.CTkComboBox(
-            parent, variable=self.acc_var, values=display_list,
+            parent, variable=self.acc_var, values=[],
             width=220, height=32,
             fg_color=COLOR_BG_SECONDARY, border_width=0, corner_radius=2, # Sharp
             dropdown_fg_color=COLOR_BG_CARD,
@@ -270,19 +394,29 @@ class DashboardFrame(ctk.CTkFrame):
         user = self.map_label.get(sel, sel)
         if user == self.current_user: return
         
-        self.cmb.configure(state="disabled")
-        threading.Thread(target=self._switch_thread, args=(user,), daemon=True).start()
+        self.stop_refresh()
+        self.updater.configure(self.cmb, state="disabled")
+        self.tasks.submit(
+            ("switch", user), self._switch_work, user, group="session",
+            on_done=self.on_switch, on_error=lambda e: self.on_logout()
+        )
 
-    def _switch_thread(self, user):
+    def _switch_work(self, user):
+        """Log out and in as `user` (runs on a worker).
+        
+        Stops between steps if superseded (e.g. by DISCONNECT), so it
+        never logs in again after the logout that replaced it.
+        """
+        checkpoint()
         logout()
-        pwd = self.creds_manager.get_password(user)
-        try:
-            sess = connect_to_wifi(user, pwd)
-            self.creds_manager.set_last_used(user)
-            self.after(0, lambda: self.on_switch(sess))
-        except Exception:
-            self.after(0, lambda: self.on_logout())
+        pwd = self.accounts.get_password(user).result()
+        checkpoint()
+        sess = connect_to_wifi(user, pwd)
+        checkpoint()
+        self.accounts.set_last_used(user).result()
+        return sess
 
     def _on_logout_click(self):
         # NO CONFIRMATION - Instant disconnect
-        threading.Thread(target=lambda: [logout(), self.after(0, self.on_logout)], daemon=True).start()
+        self.stop_refresh()
+        self.tasks.submit(("logout",), logout, group="session", on_done=lambda _: self.on_logout())
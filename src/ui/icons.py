@@ -0,0 +1,100 @@
+"""Process-wide cache of decoded, pre-scaled icons.
+
+Every icon in config.ICON_SIZES is opened, decoded and scaled to its
+display sizes once per process, normally on a startup worker thread
+while the portal probe runs (see StartupPipeline). Frames then get the
+same CTkImage for a given (path, size) instead of decoding the file
+again each time a view is built, and CTkImage keeps the Tk photo image
+it renders for every UI scaling.
+"""
+
+import os
+import sys
+import threading
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from config import ICON_SIZES, ICON_PRESCALE
+
+Size = Tuple[int, int]
+
+# Repository root when running from source (src/ui/icons.py -> ../..)
+_SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@lru_cache(maxsize=None)
+def resource_path(relative_path: str) -> str:
+    """Absolute path of a bundled resource (PyInstaller-aware).
+    
+    Independent of the working directory, so the icons load when the app
+    is started from src/ or anywhere else.
+    """
+    base_path = getattr(sys, "_MEIPASS", None) or _SOURCE_ROOT
+    return os.path.join(base_path, relative_path)
+
+
+class IconCache:
+    """Thread-safe (path, size) -> CTkImage store.
+
+    Building the CTkImage does not touch Tk, so the whole cache can be
+    filled from a worker thread; Tk photo images are created lazily by
+    the widgets on the main thread.
+
+    Args:
+        sizes: Icon path -> display sizes to prepare in preload().
+    """
+
+    def __init__(self, sizes: Optional[Dict[str, list]] = None):
+        self.sizes = ICON_SIZES if sizes is None else sizes
+        self._lock = threading.Lock()
+        self._images: Dict[Tuple[str, Size], object] = {}
+
+    def get(self, path: str, size: Size):
+        """Return the shared CTkImage of `path` displayed at `size`.
+
+        Decodes the file on first use if preload() has not done it yet.
+        Raises OSError if the file cannot be read.
+        """
+        key = (path, tuple(size))
+        image = self._images.get(key)
+        if image is None:
+            with self._lock:
+                image = self._images.get(key)
+                if image is None:
+                    image = self._images[key] = self._load(path, key[1])
+        return image
+
+    def preload(self) -> None:
+        """Decode every configured icon at every configured size."""
+        for path, sizes in self.sizes.items():
+            for size in sizes:
+                try:
+                    self.get(path, size)
+                except OSError as e:
+                    # The frame that shows it reports the error again
+                    print(f"Failed to load icon {path}: {e}")
+
+    @staticmethod
+    def _load(path: str, size: Size):
+        # Deferred: PIL and customtkinter are only needed by the UI
+        import customtkinter as ctk
+        from PIL import Image
+
+        with Image.open(resource_path(path)) as source:
+            scaled = source.convert("RGBA").resize(
+                (size[0] * ICON_PRESCALE, size[1] * ICON_PRESCALE), Image.LANCZOS
+            )
+        return ctk.CTkImage(light_image=scaled, size=size)
+
+
+_icons = IconCache()
+
+
+def get_icon(path: str, size: Size):
+    """Shared CTkImage of `path` at `size` from the process-wide cache."""
+    return _icons.get(path, size)
+
+
+def preload_icons() -> None:
+    """Fill the process-wide cache (meant for a background thread)."""
+    _icons.preload()
@@ -0,0 +1,231 @@
+"""Shared worker pool for the UI's network and storage actions.
+
+Frames submit work here instead of starting a thread per click:
+
+- A bounded ThreadPoolExecutor runs the work.
+- Identical requests already in flight (same key, e.g. ("connect", user))
+  are coalesced into one call whose result goes to every caller.
+- Submitting into a group (e.g. "session") supersedes the group's earlier
+  task: it is cancelled if it has not started, and its result is dropped
+  otherwise. Multi-step work calls checkpoint() between its portal calls
+  so a superseded task also stops making them.
+- Results reach Tk only through one after()-driven dispatch queue, so
+  callbacks always run on the main thread and workers never touch Tk.
+
+Futures from other executors (e.g. AsyncCredentialManager) are delivered
+through the same queue with watch().
+"""
+
+import queue
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional
+
+from config import UI_MAX_WORKERS, UI_DISPATCH_INTERVAL_MS
+
+
+def _reraise(error: Exception) -> None:
+    raise error
+
+
+class TaskCancelled(Exception):
+    """Raised by checkpoint() in a task that was cancelled or superseded."""
+
+
+# Task running on the current worker thread
+_current = threading.local()
+
+
+def checkpoint() -> None:
+    """Stop the calling task here if it has been cancelled.
+    
+    Call before each step with side effects (logout, login). Does
+    nothing outside a TaskRunner worker.
+    """
+    task = getattr(_current, "task", None)
+    if task is not None and task.cancelled:
+        raise TaskCancelled()
+
+
+class Task:
+    """Handle of a submitted operation."""
+
+    def __init__(self, key: Hashable, group: Optional[str]):
+        self.key = key
+        self.group = group
+        self.future = None
+        self.cancelled = False
+        self._callbacks: List[tuple] = []   # (on_done, on_error)
+
+    def cancel(self) -> bool:
+        """Drop the result. Returns True if the work will not run at all."""
+        self.cancelled = True
+        return self.future is not None and self.future.cancel()
+
+
+class TaskRunner:
+    """Bounded executor delivering results to the Tk main thread.
+
+    Args:
+        root: Tk widget used for after() scheduling.
+        max_workers: Worker threads shared by all frames.
+    """
+
+    def __init__(self, root, max_workers: int = UI_MAX_WORKERS):
+        self.root = root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-task")
+        self._results = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Task] = {}
+        self._groups: Dict[str, Task] = {}
+        self._watched = 0
+        self._drain_scheduled = False
+
+    def submit(
+        self,
+        key: Hashable,
+        fn: Callable,
+        *args,
+        group: Optional[str] = None,
+        on_done: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+    ) -> Task:
+        """Run fn(*args) on a worker. Call from the main thread.
+
+        Args:
+            key: Identity of the request, e.g. ("connect", username).
+                While a task with the same key is in flight, it is reused.
+            group: Tasks in the same group supersede each other.
+            on_done: Called with the result on the main thread.
+            on_error: Called with the exception on the main thread.
+        """
+        with self._lock:
+            task = self._inflight.get(key)
+            if task is None or task.cancelled:
+                task = Task(key, group)
+                self._inflight[key] = task
+                if group is not None:
+                    previous = self._groups.get(group)
+                    if previous is not None:
+                        self._supersede(previous)
+                    self._groups[group] = task
+                task.future = self._executor.submit(self._run, task, fn, args)
+            task._callbacks.append((on_done, on_error))
+        self._schedule_drain()
+        return task
+
+    def busy(self, group: str) -> bool:
+        """True while a task of `group` has not finished."""
+        with self._lock:
+            return group in self._groups
+
+    def _supersede(self, task: Task) -> None:
+        # Called with the lock held; a task that never starts never finishes
+        if task.cancel() and self._inflight.get(task.key) is task:
+            del self._inflight[task.key]
+
+    def watch(
+        self,
+        future: Future,
+        on_done: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+    ) -> Future:
+        """Deliver the outcome of `future` on the main thread.
+        
+        Errors without an on_error handler are reported like any other
+        failing Tk callback instead of being dropped.
+        """
+        with self._lock:
+            self._watched += 1
+        
+        def deliver(done: Future) -> None:
+            if not done.cancelled():
+                error = done.exception()
+                if error is not None:
+                    self._results.put((None, on_error or _reraise, (error,)))
+                elif on_done is not None:
+                    self._results.put((None, on_done, (done.result(),)))
+            with self._lock:
+                self._watched -= 1
+        
+        future.add_done_callback(deliver)
+        self._schedule_drain()
+        return future
+
+    def call_soon(self, callback: Callable, *args) -> None:
+        """Run callback(*args) on the main thread.
+        
+        Meant for progress updates from a running task: the queue is only
+        drained while tasks are in flight.
+        """
+        self._results.put((None, callback, args))
+
+    def shutdown(self) -> None:
+        """Cancel pending work and stop accepting new tasks."""
+        with self._lock:
+            for task in list(self._inflight.values()):
+                self._supersede(task)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, task: Task, fn: Callable, args: tuple) -> None:
+        if task.cancelled:
+            self._finish(task)
+            return
+        _current.task = task
+        try:
+            result, error = fn(*args), None
+        except Exception as e:
+            result, error = None, e
+        finally:
+            _current.task = None
+        self._finish(task, result, error)
+
+    def _finish(self, task: Task, result=None, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            if self._inflight.get(task.key) is task:
+                del self._inflight[task.key]
+            if task.group is not None and self._groups.get(task.group) is task:
+                del self._groups[task.group]
+        self._results.put((task, result, error))
+
+    # --- Main Thread ---
+
+    def _pending(self) -> bool:
+        with self._lock:
+            return bool(self._inflight) or self._watched > 0
+
+    def _schedule_drain(self) -> None:
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            self.root.after(UI_DISPATCH_INTERVAL_MS, self._drain)
+
+    def _drain(self) -> None:
+        """Deliver finished tasks; keeps polling only while work is pending."""
+        self._drain_scheduled = False
+        while True:
+            try:
+                task, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if task is None:
+                self._invoke(result, *error)
+            elif not task.cancelled:
+                for on_done, on_error in task._callbacks:
+                    if error is None and on_done is not None:
+                        self._invoke(on_done, result)
+                    elif error is not None and on_error is not None:
+                        self._invoke(on_error, error)
+        if self._pending() or not self._results.empty():
+            self._schedule_drain()
+
+    def _invoke(self, callback: Callable, *args) -> None:
+        # One failing callback must not swallow the rest of the queue
+        try:
+            callback(*args)
+        except Exception:
+            report = getattr(self.root, "report_callback_exception", None)
+            if report is not None:
+                report(*sys.exc_info())
+            else:
+                raise
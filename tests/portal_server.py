@@ -0,0 +1,341 @@
+"""Local stand-in for the GSB WiFi captive portal (wifi.gsb.gov.tr).
+
+Implements just enough of the real portal for the client code in
+src/connection.py to run against it offline:
+
+    GET  /                               login page, issues a JSESSIONID
+    POST /login/j_spring_security_check  form login, returns the dashboard
+    GET  /index.html                     dashboard (logged in) or login page
+    POST /index.html                     JSF "End Session" form (logout)
+
+Latency, failure rates and dashboard page size are configurable, which
+makes it usable for both tests and latency benchmarks.
+
+Run standalone with:
+    python tests/portal_server.py --port 8080 --latency 0.05
+    GSB_PORTAL_BASE_URL=http://127.0.0.1:8080 python src/main.py
+"""
+
+import argparse
+import random
+import secrets
+import ssl
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>GSB - Login</title></head>
+<body>
+    <form action="/login/j_spring_security_check" method="post">
+        <input type="text" name="j_username" />
+        <input type="password" name="j_password" />
+        <button type="submit">Login</button>
+    </form>
+</body>
+</html>
+"""
+
+DASHBOARD_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>GSB - Main Page</title></head>
+<body>
+    <label class="myinfo">Last Login: {last_login}</label>
+    <table>
+        <tr>
+            <td><label>Total Remaining Quota (MB):</label></td>
+            <td><label>{quota}</label></td>
+        </tr>
+        <tr>
+            <td><label>Total Quota (MB):</label></td>
+            <td><label>{total_quota}</label></td>
+        </tr>
+        <tr>
+            <td><label>Next Refresh Date:</label></td>
+            <td><label>01/02/2026 00:00:00</label></td>
+        </tr>
+    </table>
+    {padding}
+    <form id="servisUpdateForm" name="servisUpdateForm" method="post" action="/index.html">
+        <button id="servisUpdateForm:j_idt159" name="servisUpdateForm:j_idt159" type="submit">End Session</button>
+        <input type="hidden" name="javax.faces.ViewState" value="{view_state}" />
+    </form>
+</body>
+</html>
+"""
+
+LOGOUT_BUTTON = "servisUpdateForm:j_idt159"
+
+
+def _padding(size: int) -> str:
+    """Filler service-history table of roughly `size` bytes."""
+    if size <= 0:
+        return ""
+    row = "<tr><td><label>Service {0}</label></td><td><label>{0}.00 MB</label></td></tr>\n"
+    rows, total, i = [], 0, 0
+    while total < size:
+        rows.append(row.format(i))
+        total += len(rows[-1])
+        i += 1
+    return "<table class=\"history\">\n" + "".join(rows) + "</table>"
+
+
+class StandInPortal:
+    """Threaded HTTP(S) server imitating the GSB portal.
+
+    Args:
+        accounts: Valid username -> password pairs.
+        latency: Seconds added before every response.
+        jitter: Extra random latency, uniform in [0, jitter] seconds.
+        failure_rate: Probability of answering 503 Service Unavailable.
+        drop_rate: Probability of closing the connection without a response.
+        page_size: Approximate extra bytes of filler on the dashboard page.
+        certfile/keyfile: Serve HTTPS with this certificate.
+        seed: Seed for the failure/jitter random generator.
+        require_session: Reject logins that do not carry a session cookie
+            issued by an earlier request (e.g. after a server restart).
+    """
+
+    def __init__(
+        self,
+        accounts: Optional[Dict[str, str]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        page_size: int = 0,
+        certfile: Optional[str] = None,
+        keyfile: Optional[str] = None,
+        seed: Optional[int] = None,
+        require_session: bool = False,
+    ):
+        self.accounts = accounts if accounts is not None else {"user1": "pass1", "user2": "pass2"}
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.drop_rate = drop_rate
+        self.page_size = page_size
+        self.certfile = certfile
+        self.keyfile = keyfile
+        self.require_session = require_session
+        self._random = random.Random(seed)
+
+        # JSESSIONID -> {"user": logged in username or None, "views": issued ViewStates}
+        self.sessions: Dict[str, dict] = {}
+        self.requests = Counter()
+        self.connections = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._padding = _padding(page_size)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        scheme = "https" if self.certfile else "http"
+        return f"{scheme}://{host}:{port}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving on a background thread and return the base URL."""
+        portal = self
+
+        class Handler(_PortalHandler):
+            pass
+        Handler.portal = portal
+
+        self._server = _PortalServer((host, port), Handler)
+        if self.certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self.certfile, self.keyfile)
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin-portal", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        """Stop the server and close its socket."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StandInPortal":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # --- Request Handling (called from handler threads) ---
+
+    def _roll(self, rate: float) -> bool:
+        with self._lock:
+            return rate > 0 and self._random.random() < rate
+
+    def _delay(self) -> None:
+        with self._lock:
+            extra = self._random.uniform(0, self.jitter) if self.jitter else 0.0
+        if self.latency or extra:
+            time.sleep(self.latency + extra)
+
+    def _session(self, session_id: Optional[str]):
+        """Return (session_id, session, created), creating a new session if needed."""
+        with self._lock:
+            created = session_id not in self.sessions
+            if created:
+                session_id = secrets.token_hex(16)
+                self.sessions[session_id] = {"user": None, "views": set()}
+            return session_id, self.sessions[session_id], created
+
+    def _dashboard(self, session: dict) -> str:
+        view_state = f"{secrets.randbelow(10**9)}:{secrets.randbelow(10**9)}"
+        with self._lock:
+            session["views"].add(view_state)
+        return DASHBOARD_PAGE.format(
+            last_login="02.01.2026 23:34",
+            quota="32764.83",
+            total_quota="32768.0",
+            padding=self._padding,
+            view_state=view_state,
+        )
+
+    def handle(self, method: str, path: str, session_id: Optional[str], form: Dict[str, str]):
+        """Route a request. Returns (status, body, session_id)."""
+        session_id, session, created = self._session(session_id)
+        path = path.split("?", 1)[0]
+
+        if method == "POST" and path == "/login/j_spring_security_check":
+            if created and self.require_session:
+                return 200, LOGIN_PAGE, session_id
+            user = form.get("j_username")
+            if user in self.accounts and self.accounts[user] == form.get("j_password"):
+                session["user"] = user
+                return 200, self._dashboard(session), session_id
+            return 200, LOGIN_PAGE, session_id
+
+        if path in ("/", "/index.html"):
+            if method == "GET":
+                if session["user"]:
+                    return 200, self._dashboard(session), session_id
+                return 200, LOGIN_PAGE, session_id
+
+            if method == "POST" and path == "/index.html":
+                if not session["user"] or form.get("javax.faces.ViewState") not in session["views"]:
+                    # JSF ViewExpiredException
+                    return 500, "<html><body>View expired</body></html>", session_id
+                if form.get(LOGOUT_BUTTON) == LOGOUT_BUTTON:
+                    session["user"] = None
+                    session["views"].clear()
+                    return 200, LOGIN_PAGE, session_id
+                return 200, self._dashboard(session), session_id
+
+        return 404, "<html><body>Not Found</body></html>", session_id
+
+
+class _PortalServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that ignores clients hanging up mid-response (also over TLS)."""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError, ssl.SSLEOFError)):
+            super().handle_error(request, client_address)
+
+
+class _PortalHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive handler delegating to StandInPortal.handle."""
+
+    protocol_version = "HTTP/1.1"
+    portal: StandInPortal = None
+
+    # Send headers and body in one segment; otherwise Nagle + delayed ACK
+    # add ~40 ms to every keep-alive response and swamp the measurements
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.portal._lock:
+            self.portal.connections += 1
+
+    def _serve(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length).decode("utf-8") if length else ""
+        form = {k: v[0] for k, v in parse_qs(raw, keep_blank_values=True).items()}
+
+        session_id = None
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "JSESSIONID":
+                session_id = value
+
+        portal = self.portal
+        with portal._lock:
+            portal.requests[f"{method} {self.path}"] += 1
+        portal._delay()
+
+        if portal._roll(portal.drop_rate):
+            self.close_connection = True
+            self.connection.close()
+            return
+        if portal._roll(portal.failure_rate):
+            status, body = 503, "<html><body>Service Unavailable</body></html>"
+        else:
+            status, body, new_session_id = portal.handle(method, self.path, session_id, form)
+            session_id = None if new_session_id == session_id else new_session_id
+
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html;charset=UTF-8")
+        self.send_header("Content-Length", str(len(payload)))
+        if session_id:
+            self.send_header("Set-Cookie", f"JSESSIONID={session_id}; Path=/; HttpOnly")
+        self.end_headers()
+        self.wfile.write(payload)
+        with portal._lock:
+            portal.bytes_sent += len(payload)
+
+    def do_GET(self):
+        self._serve("GET")
+
+    def do_POST(self):
+        self._serve("POST")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the GSB WiFi portal.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="probability of a 503 response")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="probability of dropping the connection")
+    parser.add_argument("--page-size", type=int, default=0, help="extra dashboard bytes")
+    parser.add_argument("--certfile", help="serve HTTPS with this certificate (PEM)")
+    parser.add_argument("--keyfile", help="private key for --certfile")
+    args = parser.parse_args()
+
+    portal = StandInPortal(
+        latency=args.latency, jitter=args.jitter,
+        failure_rate=args.failure_rate, drop_rate=args.drop_rate,
+        page_size=args.page_size, certfile=args.certfile, keyfile=args.keyfile,
+    )
+    print(f"Stand-in portal on {portal.start(args.host, args.port)} (accounts: {portal.accounts})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        portal.stop()
+
+
+if __name__ == "__main__":
+    main()
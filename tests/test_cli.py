@@ -0,0 +1,67 @@
+"""Tests for the headless command line entry point.
+
+Run with: pytest tests/test_cli.py -v
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from cli import build_parser
+
+CLI_PATH = Path(__file__).resolve().parent.parent / "src" / "cli.py"
+
+# Modules the headless path must never load
+GUI_MODULES = ("customtkinter", "tkinter", "_tkinter", "PIL", "darkdetect", "ui")
+
+# Generous ceiling for the whole headless import graph (microseconds)
+IMPORT_BUDGET_US = 1_500_000
+
+
+def _import_profile(*args):
+    """Run cli.py under -X importtime; return {module: cumulative_us}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(CLI_PATH), *args],
+        capture_output=True, text=True, timeout=60,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+class TestImportBudget:
+    """The headless entry point must stay free of GUI imports."""
+
+    @pytest.mark.parametrize("args", [("--help",), ("status", "--help")])
+    def test_no_gui_modules_imported(self, args):
+        profile = _import_profile(*args)
+        assert "connection" in profile
+        loaded = [m for m in profile if m.split(".")[0] in GUI_MODULES]
+        assert loaded == []
+
+    def test_status_does_not_load_keyring(self):
+        """Only commands that need a password should import the keyring."""
+        profile = _import_profile("status", "--help")
+        assert not any(m.split(".")[0] == "keyring" for m in profile)
+
+    def test_import_time_budget(self):
+        profile = _import_profile("--help")
+        assert max(profile.values()) < IMPORT_BUDGET_US
+
+
+class TestParser:
+    """Test suite for command line parsing."""
+
+    def test_connect_options(self):
+        args = build_parser().parse_args(["connect", "--user", "user2", "--force"])
+        assert args.user == "user2"
+        assert args.force
+
+    def test_command_is_required(self):
+        with pytest.raises(SystemExit):
+            build_parser().parse_args([])
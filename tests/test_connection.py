@@ -3,8 +3,16 @@
 Run with: pytest tests/test_connection.py -v
 """
 
+import atexit
+
 import pytest
-from connection import _parse_dashboard
+import connection
+import credentials
+from config import COOKIE_JAR_FILENAME, STREAM_DRAIN_LIMIT
+from connection import (
+    _parse_dashboard, _extract_dashboard, _dashboard_html, _stream_dashboard, get_client, create_client,
+    PortalClient,
+)
 
 
 # Sample HTML snippet from GSB portal (based on real captured HTML)
@@ -35,6 +43,45 @@ SAMPLE_DASHBOARD_HTML = """
 
 EMPTY_HTML = "<html><body></body></html>"
 
+# Dashboard with the JSF logout form, as served after login
+DASHBOARD_WITH_FORM_HTML = SAMPLE_DASHBOARD_HTML.replace("</body>", """
+    <form id="servisUpdateForm" name="servisUpdateForm" method="post">
+        <button id="servisUpdateForm:j_idt159" name="servisUpdateForm:j_idt159">End Session</button>
+        <input type="hidden" name="javax.faces.ViewState" value="-123:456" />
+    </form>
+</body>""")
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, text, status_code=200, encoding="utf-8"):
+        self.content = text.encode(encoding)
+        self.status_code = status_code
+        self.headers = {"Content-Type": f"text/html;charset={encoding}", "Content-Length": str(len(self.content))}
+        self.chunk_size = None
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        size = self.chunk_size or chunk_size
+        for i in range(0, len(self.content), size):
+            yield self.content[i:i + size]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    """Records requests and replays scripted responses."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, data=None, **kwargs):
+        self.calls.append((method, url, data))
+        return self.responses.pop(0)
+
 
 class TestParseDashboard:
     """Test suite for the _parse_dashboard function."""
@@ -74,3 +121,237 @@ class TestParseDashboard:
         # Should not crash, may return partial or default values
         assert isinstance(result, dict)
         assert "quota" in result
+
+    def test_value_label_nested_in_sibling_cell(self):
+        """Should find the value label anywhere inside the next sibling cell."""
+        html = """
+        <table><tr>
+            <td><div><label>Total Remaining Quota (MB):</label></div></td>
+            <td><span><label> 1024.5 </label></span></td>
+        </tr></table>
+        """
+        result = _parse_dashboard(html)
+        assert result["quota"] == "1024.5 MB"
+
+    def test_label_without_sibling_cell_is_not_found(self):
+        """Should not borrow a value from a different table row."""
+        html = """
+        <table>
+            <tr><td><label>Total Quota (MB):</label></td></tr>
+            <tr><td><label>Other</label></td><td><label>99</label></td></tr>
+        </table>
+        """
+        result = _parse_dashboard(html)
+        assert result["total_quota"] == "Not Found"
+
+
+    def test_wrapped_labels_match_like_soup_string(self):
+        """A label whose only child is a tag matches through .string."""
+        html = SAMPLE_DASHBOARD_HTML.replace(
+            "<label>Total Remaining Quota (MB):</label>", "<label><b>Total Remaining Quota (MB):</b></label>"
+        ).replace(
+            '<label class="myinfo">Last Login: 02.01.2026 23:34</label>',
+            '<label class="myinfo"><span><i>Last Login: 02.01.2026 23:34</i></span></label>',
+        )
+        result = _parse_dashboard(html)
+        assert result == _parse_dashboard(SAMPLE_DASHBOARD_HTML)
+
+    def test_label_with_several_children_does_not_match(self):
+        """Text next to a tag or a <br/> leaves .string empty, as in soup."""
+        for label in (
+            "<label> <b>Total Quota (MB):</b></label>",
+            "<label><br/>Total Quota (MB):</label>",
+            "<label>Total Quota (MB):<!-- note --></label>",
+        ):
+            html = SAMPLE_DASHBOARD_HTML.replace("<label>Total Quota (MB):</label>", label)
+            assert _parse_dashboard(html)["total_quota"] == "Not Found", label
+
+    def test_comment_only_label_does_not_match(self):
+        html = SAMPLE_DASHBOARD_HTML.replace(
+            "<label>Total Quota (MB):</label>", "<label><!--Total Quota (MB):--></label>"
+        )
+        assert _parse_dashboard(html)["total_quota"] == "Not Found"
+
+
+class TestDashboardDetection:
+    """Test suite for the bytes-level dashboard detection."""
+
+    WELCOME_HTML = "<html><body><h1>Hoşgeldiniz, Eren</h1></body></html>"
+
+    def test_login_page_is_not_decoded(self):
+        """Pages without the markers should yield None."""
+        assert _dashboard_html(FakeResponse(EMPTY_HTML)) is None
+
+    def test_dashboard_is_decoded(self):
+        """Dashboard pages should come back as text."""
+        assert _dashboard_html(FakeResponse(SAMPLE_DASHBOARD_HTML)) == SAMPLE_DASHBOARD_HTML
+
+    def test_turkish_marker_in_iso_8859_9(self):
+        """Should detect and decode a Turkish page without a charset header."""
+        response = FakeResponse(self.WELCOME_HTML, encoding="iso-8859-9")
+        response.headers = {"Content-Type": "text/html"}
+        assert _dashboard_html(response) == self.WELCOME_HTML
+
+    def test_charset_header_wins(self):
+        """The declared charset should be used for decoding."""
+        response = FakeResponse(self.WELCOME_HTML, encoding="utf-8")
+        assert _dashboard_html(response) == self.WELCOME_HTML
+
+
+class TestStreamDashboard:
+    """Test suite for the incremental dashboard reader."""
+
+    def test_tiny_chunks_match_full_parse(self):
+        """Markers and multi-byte characters split across chunks are handled."""
+        html = SAMPLE_DASHBOARD_HTML.replace("Last Login", "Hoşgeldiniz. Last Login")
+        response = FakeResponse(html)
+        response.chunk_size = 3
+
+        extractor = _stream_dashboard(response)
+        assert extractor.data == _parse_dashboard(html)
+        assert response.closed
+
+    def test_stops_reading_after_last_field(self):
+        """The filler after the quota table should not be read."""
+        html = SAMPLE_DASHBOARD_HTML.replace("</body>", "<p>filler</p>" * 10_000 + "</body>")
+        response = FakeResponse(html)
+        response.chunk_size = 1024
+
+        extractor = _stream_dashboard(response)
+        assert extractor.data["date"] == "01/02/2026"
+        assert extractor.bytes_read < 4096
+
+    def test_short_rest_is_drained_for_reuse(self):
+        """A small remainder is read so the keep-alive connection is reused."""
+        html = SAMPLE_DASHBOARD_HTML.replace("</body>", "<p>filler</p>" * 100 + "</body>")
+        response = FakeResponse(html)
+        response.chunk_size = 1024
+
+        extractor = _stream_dashboard(response)
+        assert extractor.bytes_read == len(response.content)
+        assert response.closed
+
+    def test_unknown_length_drains_at_most_the_limit(self):
+        html = SAMPLE_DASHBOARD_HTML.replace("</body>", "<p>filler</p>" * 100_000 + "</body>")
+        response = FakeResponse(html)
+        response.chunk_size = 1024
+        del response.headers["Content-Length"]
+
+        extractor = _stream_dashboard(response)
+        assert extractor.bytes_read < STREAM_DRAIN_LIMIT + 8192
+
+    def test_logout_form_is_searched_within_the_drain_limit(self):
+        """The form is read on a normal page but not after a long filler."""
+        response = FakeResponse(DASHBOARD_WITH_FORM_HTML)
+        assert _stream_dashboard(response, want_logout_form=True).view_state == "-123:456"
+
+        form = DASHBOARD_WITH_FORM_HTML[DASHBOARD_WITH_FORM_HTML.index("<form"):]
+        html = SAMPLE_DASHBOARD_HTML.replace("</body>", "<p>filler</p>" * 100_000 + form)
+        response = FakeResponse(html)
+        response.chunk_size = 1024
+        extractor = _stream_dashboard(response, want_logout_form=True)
+        assert not extractor.view_state_found
+        assert extractor.bytes_read < STREAM_DRAIN_LIMIT + 8192
+
+    def test_login_page_returns_none(self):
+        """Pages without the markers are read to the end and rejected."""
+        assert _stream_dashboard(FakeResponse(EMPTY_HTML)) is None
+
+
+@pytest.fixture
+def app_dir(tmp_path, monkeypatch):
+    """Point the shared client at a temp app-data dir instead of ~/.config."""
+    monkeypatch.setattr(credentials, "get_app_data_dir", lambda: tmp_path)
+    monkeypatch.setattr(connection, "_client", None)
+    monkeypatch.setattr(connection, "_latency", None)
+    return tmp_path
+
+
+class TestPortalClient:
+    """Test suite for the shared PortalClient."""
+
+    def test_get_client_returns_shared_instance(self, app_dir):
+        """Module-level helpers should all reuse one pooled client."""
+        client = get_client()
+        assert isinstance(client, PortalClient)
+        assert get_client() is client
+        assert client.cookie_path == app_dir / COOKIE_JAR_FILENAME
+
+    def test_created_clients_share_jar_and_latency(self, app_dir):
+        """A raced login client must persist like the shared one."""
+        shared, raced = get_client(), create_client()
+        assert raced is not shared
+        assert raced.cookie_path == shared.cookie_path
+        assert raced.latency is shared.latency
+
+    def test_closed_client_does_not_save_at_exit(self, app_dir, monkeypatch):
+        """A replaced client must not overwrite the jar with its cookies."""
+        registered = []
+        monkeypatch.setattr(atexit, "register", registered.append)
+        monkeypatch.setattr(atexit, "unregister", registered.remove)
+        client = create_client()
+        assert client.save_cookies in registered
+        client.close()
+        assert client.save_cookies not in registered
+
+    def test_closed_client_does_not_write_the_jar(self, app_dir):
+        """A login finishing after close() must not replace the shared cookies."""
+        client = create_client()
+        client.close()
+        client.save_cookies()
+        assert not (app_dir / COOKIE_JAR_FILENAME).exists()
+
+    def test_logout_is_single_post_with_cached_form(self):
+        """Logout should reuse the ViewState of the last dashboard page."""
+        client = PortalClient()
+        client._session_from_dashboard(DASHBOARD_WITH_FORM_HTML, "Already Connected")
+        client._session = FakeSession([FakeResponse(EMPTY_HTML)])
+
+        assert client.logout() is True
+        assert [c[0] for c in client._session.calls] == ["POST"]
+        assert client._session.calls[0][2]["javax.faces.ViewState"] == "-123:456"
+
+    def test_streamed_status_refreshes_cached_form(self):
+        """Auto-refreshes must replace a ViewState that may have expired."""
+        client = PortalClient(stream_status=True)
+        client._logout_form = ("-1:1", "servisUpdateForm:j_idt159")
+        client._session = FakeSession([FakeResponse(DASHBOARD_WITH_FORM_HTML)])
+
+        assert client.check_status(max_age=0).success
+        assert client._logout_form == ("-123:456", "servisUpdateForm:j_idt159")
+
+    def test_logout_falls_back_when_cached_form_is_rejected(self):
+        """An expired view should trigger the GET + parse path."""
+        client = PortalClient()
+        client._session_from_dashboard(DASHBOARD_WITH_FORM_HTML, "Already Connected")
+        client._session = FakeSession([
+            FakeResponse(SAMPLE_DASHBOARD_HTML),  # still logged in
+            FakeResponse(DASHBOARD_WITH_FORM_HTML),
+            FakeResponse(EMPTY_HTML),
+        ])
+
+        assert client.logout() is True
+        assert [c[0] for c in client._session.calls] == ["POST", "GET", "POST"]
+
+
+class TestExtractLogoutForm:
+    """Test suite for capturing the JSF logout form during the parse."""
+
+    def test_captures_view_state_and_button(self):
+        """Should find the ViewState and the End Session button name."""
+        extractor = _extract_dashboard(DASHBOARD_WITH_FORM_HTML, want_logout_form=True)
+        assert extractor.view_state == "-123:456"
+        assert extractor.logout_button == "servisUpdateForm:j_idt159"
+        assert extractor.data == _parse_dashboard(SAMPLE_DASHBOARD_HTML)
+
+    def test_falls_back_to_known_button_id(self):
+        """Should use the j_idt159 button when no text matches."""
+        html = DASHBOARD_WITH_FORM_HTML.replace("End Session", "<span>Exit</span>")
+        extractor = _extract_dashboard(html, want_logout_form=True)
+        assert extractor.logout_button == "servisUpdateForm:j_idt159"
+
+    def test_missing_form(self):
+        """Should report a missing ViewState."""
+        extractor = _extract_dashboard(SAMPLE_DASHBOARD_HTML, want_logout_form=True)
+        assert not extractor.view_state_found
+        assert extractor.logout_button is None
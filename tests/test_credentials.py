@@ -0,0 +1,388 @@
+"""Unit tests for the credentials module's config caching.
+
+Run with: pytest tests/test_credentials.py -v
+"""
+
+import datetime
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+import keyring
+import pytest
+from keyring.backend import KeyringBackend
+from config import KEYRING_SERVICE_ID
+from credentials import AsyncCredentialManager, CredentialManager, SQLiteCredentialManager
+from models import SessionInfo
+
+SESSION = SessionInfo(
+    success=True, message="Login Successful",
+    remaining_quota="1024.5 MB", total_quota="32768.0 MB",
+    quota_renewal_date="01/02/2026", last_login="02.01.2026 23:34",
+)
+
+
+class MemoryKeyring(KeyringBackend):
+    """In-memory keyring backend that counts reads."""
+
+    # Never picked by keyring's own backend selection; only set_keyring() installs it
+    priority = 0
+
+    def __init__(self):
+        super().__init__()
+        self.passwords = {}
+        self.reads = 0
+
+    def get_password(self, service, username):
+        self.reads += 1
+        return self.passwords.get((service, username))
+
+    def set_password(self, service, username, password):
+        self.passwords[(service, username)] = password
+
+    def delete_password(self, service, username):
+        self.passwords.pop((service, username), None)
+
+
+@pytest.fixture
+def memory_keyring():
+    """Install an in-memory keyring for the duration of a test."""
+    previous = keyring.get_keyring()
+    backend = MemoryKeyring()
+    keyring.set_keyring(backend)
+    yield backend
+    keyring.set_keyring(previous)
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """CredentialManager whose config file lives in a temp directory."""
+    config_file = tmp_path / "user_preferences.json"
+    config_file.write_text(json.dumps({
+        "accounts": {
+            "user1": {"quota": "15.4 MB", "last_update": "03.01.2026 14:00"},
+            "user2": {"quota": "---", "last_update": "---"},
+        },
+        "last_used": "user1"
+    }), encoding="utf-8")
+    monkeypatch.setattr(CredentialManager, "_get_config_path", lambda self: config_file)
+    return CredentialManager()
+
+
+class TestConfigCache:
+    """Test suite for the in-memory config cache."""
+
+    def test_bulk_metadata_lookup(self, manager):
+        """Should return every account with its metadata in saved order."""
+        accounts = manager.get_accounts_with_metadata()
+        assert list(accounts) == ["user1", "user2"]
+        assert accounts["user1"]["quota"] == "15.4 MB"
+
+    def test_unchanged_file_is_read_once(self, manager, monkeypatch):
+        """Repeated lookups should not re-open an unchanged config file."""
+        manager.get_all_accounts()
+        opened = []
+        real_open = open
+        monkeypatch.setattr("builtins.open", lambda *a, **k: opened.append(a) or real_open(*a, **k))
+
+        for user in manager.get_all_accounts():
+            manager.get_account_metadata(user)
+        manager.get_last_used()
+
+        assert opened == []
+
+    def test_external_edit_invalidates_cache(self, manager):
+        """Should reload when the file changes on disk."""
+        assert manager.get_last_used() == "user1"
+        manager.config_path.write_text(json.dumps({
+            "accounts": {"user3": {"quota": "---", "last_update": "---"}},
+            "last_used": "user3"
+        }), encoding="utf-8")
+
+        assert manager.get_all_accounts() == ["user3"]
+        assert manager.get_last_used() == "user3"
+
+    def test_returned_metadata_is_a_copy(self, manager):
+        """Mutating returned metadata should not leak into the cache."""
+        manager.get_account_metadata("user1")["quota"] = "tampered"
+        assert manager.get_account_metadata("user1")["quota"] == "15.4 MB"
+
+
+class TestWriteBehind:
+    """Test suite for delayed, coalesced config writes."""
+
+    def test_burst_of_updates_is_one_write(self, manager, monkeypatch):
+        """Several mutations before the delay expires should write once."""
+        manager.save_delay = 60
+        writes = []
+        real_replace = os.replace
+        monkeypatch.setattr(os, "replace", lambda *a: writes.append(a) or real_replace(*a))
+
+        manager.set_last_used("user2")
+        manager.update_account_metadata("user2", "100.0 MB")
+        manager.set_last_used("user1")
+        assert writes == []
+
+        manager.flush()
+        assert len(writes) == 1
+
+    def test_pending_changes_are_visible_before_flush(self, manager):
+        """Reads should see unsaved changes, not the stale file."""
+        manager.save_delay = 60
+        manager.set_last_used("user2")
+        assert manager.get_last_used() == "user2"
+        assert json.loads(manager.config_path.read_text(encoding="utf-8"))["last_used"] == "user1"
+
+    def test_flush_writes_atomically(self, manager):
+        """Flush should replace the file and leave no temp files behind."""
+        manager.save_delay = 60
+        manager.update_account_metadata("user1", "1.0 MB")
+        manager.flush()
+
+        saved = json.loads(manager.config_path.read_text(encoding="utf-8"))
+        assert saved["accounts"]["user1"]["quota"] == "1.0 MB"
+        assert [p.name for p in manager.config_path.parent.iterdir()] == [manager.config_path.name]
+
+
+    def test_flush_races_with_updates(self, manager, monkeypatch):
+        """Timer flushes while another thread changes the config never fail."""
+        errors = []
+        monkeypatch.setattr(threading, "excepthook", errors.append)
+        manager.save_delay = 0.001
+
+        def update():
+            for i in range(300):
+                manager.update_account_session("user1", SESSION)
+                manager.update_account_metadata("user2", f"{i}.0 MB")
+        threads = [threading.Thread(target=update) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        manager.flush()
+
+        assert errors == []
+        saved = json.loads(manager.config_path.read_text(encoding="utf-8"))
+        assert saved["accounts"]["user2"]["quota"] == "299.0 MB"
+
+    def test_failed_flush_keeps_changes(self, manager, monkeypatch, capsys):
+        """Unexpected errors are reported, not raised on the timer thread."""
+        manager.save_delay = 60
+        manager.set_last_used("user2")
+        dump = json.dump
+        monkeypatch.setattr(json, "dump", lambda *a, **k: 1 / 0)
+        manager.flush()
+        assert "Failed to write config file" in capsys.readouterr().out
+
+        monkeypatch.setattr(json, "dump", dump)
+        manager.flush()
+        assert json.loads(manager.config_path.read_text(encoding="utf-8"))["last_used"] == "user2"
+
+class TestAccountSession:
+    """Test suite for storing typed session fields in the JSON store."""
+
+    def test_update_session_stores_typed_fields(self, manager):
+        manager.update_account_session("user1", SESSION)
+        meta = manager.get_accounts_with_metadata()["user1"]
+        assert meta["quota"] == "1024.5 MB"
+        assert meta["total_bytes"] == 32768 * 1024 * 1024
+        assert meta["renewal_date"] == "2026-02-01"
+
+    def test_typed_fields_survive_flush(self, manager):
+        manager.update_account_session("user1", SESSION)
+        manager.flush()
+        saved = json.loads(manager.config_path.read_text(encoding="utf-8"))
+        assert saved["accounts"]["user1"]["remaining_bytes"] == SESSION.remaining_bytes
+
+
+@pytest.fixture
+def sqlite_manager(manager):
+    """SQLiteCredentialManager sharing the temp config of `manager`."""
+    store = SQLiteCredentialManager()
+    yield store
+    store.close()
+
+
+class TestSQLiteStore:
+    """Test suite for the SQLite account store."""
+
+    def test_imports_existing_json_accounts(self, sqlite_manager):
+        """Should import accounts and last_used from the JSON config."""
+        assert sqlite_manager.get_all_accounts() == ["user1", "user2"]
+        assert sqlite_manager.get_last_used() == "user1"
+        assert sqlite_manager.get_account_metadata("user1")["quota"] == "15.4 MB"
+
+    def test_import_keeps_typed_fields(self, manager):
+        """Typed session fields in the JSON store should survive the migration."""
+        manager.update_account_session("user2", SESSION)
+        manager.flush()
+        store = SQLiteCredentialManager()
+        meta = store.get_account_metadata("user2")
+        store.close()
+        assert meta["remaining_bytes"] == SESSION.remaining_bytes
+        assert meta["total_bytes"] == SESSION.total_bytes
+        assert meta["renewal_date"] == "2026-02-01"
+        assert meta["last_login"] == "2026-01-02T23:34:00"
+
+    def test_import_runs_only_once(self, sqlite_manager):
+        """Accounts removed from the DB should not come back from JSON."""
+        with sqlite_manager._db:
+            sqlite_manager._db.execute("DELETE FROM accounts WHERE username = 'user2'")
+        reopened = SQLiteCredentialManager()
+        assert reopened.get_all_accounts() == ["user1"]
+        reopened.close()
+
+    def test_update_metadata(self, sqlite_manager):
+        """Should update quota and timestamp of a single account."""
+        sqlite_manager.update_account_metadata("user2", "100.0 MB")
+        meta = sqlite_manager.get_accounts_with_metadata()["user2"]
+        assert meta["quota"] == "100.0 MB"
+        assert meta["last_update"] != "---"
+
+    def test_update_session_stores_typed_fields(self, sqlite_manager):
+        """Numeric quotas and dates should come back without string parsing."""
+        sqlite_manager.update_account_session("user2", SESSION)
+        meta = sqlite_manager.get_account_metadata("user2")
+        assert meta["quota"] == "1024.5 MB"
+        assert meta["remaining_bytes"] == 1024.5 * 1024 * 1024
+        assert meta["total_bytes"] == 32768 * 1024 * 1024
+        assert meta["renewal_date"] == "2026-02-01"
+        assert meta["last_login"] == "2026-01-02T23:34:00"
+        assert "remaining_bytes" not in sqlite_manager.get_account_metadata("user1")
+
+    def test_old_database_gets_session_columns(self, sqlite_manager):
+        """Databases created before the typed columns should be migrated."""
+        with sqlite_manager._db:
+            sqlite_manager._db.execute("ALTER TABLE accounts DROP COLUMN remaining_bytes")
+        reopened = SQLiteCredentialManager()
+        reopened.update_account_session("user1", SESSION)
+        assert reopened.get_account_metadata("user1")["remaining_bytes"] == SESSION.remaining_bytes
+        reopened.close()
+
+    def test_recency_uses_epoch_column(self, sqlite_manager):
+        """updated_at should be indexed and sort chronologically."""
+        epoch = dict(sqlite_manager._db.execute("SELECT username, updated_at FROM accounts"))
+        assert epoch["user1"] == datetime.datetime(2026, 1, 3, 14, 0).timestamp()
+        assert epoch["user2"] is None
+
+        sqlite_manager.update_account_metadata("user2", "100.0 MB")
+        newest = sqlite_manager._db.execute(
+            "SELECT username FROM accounts ORDER BY updated_at DESC LIMIT 1"
+        ).fetchone()[0]
+        assert newest == "user2"
+        plan = " ".join(str(row) for row in sqlite_manager._db.execute(
+            "EXPLAIN QUERY PLAN SELECT username FROM accounts ORDER BY updated_at DESC LIMIT 1"
+        ))
+        assert "idx_accounts_updated_at" in plan
+
+    def test_old_index_is_replaced(self, sqlite_manager):
+        with sqlite_manager._db:
+            sqlite_manager._db.execute("CREATE INDEX idx_accounts_last_update ON accounts(last_update)")
+        SQLiteCredentialManager().close()
+        names = {row[0] for row in sqlite_manager._db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_accounts_last_update" not in names
+
+    def test_set_last_used_ignores_unknown_account(self, sqlite_manager):
+        """Should only point last_used at saved accounts."""
+        sqlite_manager.set_last_used("nobody")
+        assert sqlite_manager.get_last_used() == "user1"
+
+
+class TestPasswordCache:
+    """Test suite for the keyring password cache."""
+
+    def test_repeated_lookups_hit_keyring_once(self, manager, memory_keyring):
+        """Should serve repeated lookups from memory."""
+        memory_keyring.set_password(KEYRING_SERVICE_ID, "user1", "secret")
+        assert manager.get_password("user1") == "secret"
+        assert manager.get_password("user1") == "secret"
+        assert memory_keyring.reads == 1
+
+    def test_add_and_remove_update_cache(self, manager, memory_keyring):
+        """add_account/remove_account should keep the cache consistent."""
+        manager.add_account("user1", "first")
+        manager.add_account("user1", "second")
+        assert manager.get_password("user1") == "second"
+        assert memory_keyring.reads == 0
+
+        manager.remove_account("user1")
+        assert manager.get_password("user1") is None
+
+    def test_expired_entries_are_reloaded(self, manager, memory_keyring, monkeypatch):
+        """Should go back to the keyring after the TTL."""
+        manager.get_password("user1")
+        monkeypatch.setattr(time, "monotonic", lambda: float("inf"))
+        manager.get_password("user1")
+        assert memory_keyring.reads == 2
+
+    def test_prefetch_loads_all_accounts(self, manager, memory_keyring):
+        """Prefetch should warm the cache for every saved account."""
+        manager.prefetch_passwords().join()
+        assert memory_keyring.reads == 2
+
+        manager.get_password("user1")
+        manager.get_password("user2")
+        assert memory_keyring.reads == 2
+
+
+class SlowKeyring(MemoryKeyring):
+    """MemoryKeyring that answers like a slow Secret Service backend."""
+
+    def get_password(self, service, username):
+        time.sleep(0.2)
+        return super().get_password(service, username)
+
+
+class TestAsyncCredentialManager:
+    """Test suite for the background credential facade."""
+
+    @pytest.fixture
+    def accounts(self, manager):
+        accounts = AsyncCredentialManager(manager)
+        yield accounts
+        accounts.shutdown()
+
+    def test_calls_return_before_the_keyring_answers(self, manager, accounts, monkeypatch):
+        backend = SlowKeyring()
+        backend.passwords[(KEYRING_SERVICE_ID, "user2")] = "secret"
+        monkeypatch.setattr(keyring, "get_keyring", lambda: backend)
+        monkeypatch.setattr(keyring, "get_password", backend.get_password)
+
+        started = time.perf_counter()
+        future = accounts.select_account("user2")
+        assert time.perf_counter() - started < 0.016
+        assert future.result(timeout=2) == "secret"
+        assert manager.get_last_used() == "user2"
+
+    def test_calls_run_in_submission_order(self, accounts, memory_keyring):
+        """A read queued after a write should see the write."""
+        accounts.add_account("user3", "pw")
+        accounts.set_last_used("user3")
+        names, last_used = accounts.get_accounts().result(timeout=2)
+        assert "user3" in names
+        assert last_used == "user3"
+
+    def test_record_session_updates_last_used_account(self, manager, accounts):
+        accounts.record_session(SESSION).result(timeout=2)
+        assert manager.get_account_metadata("user1")["remaining_bytes"] == SESSION.remaining_bytes
+
+    def test_errors_surface_in_future(self, manager, accounts, monkeypatch):
+        def broken(username):
+            raise OSError("keyring locked")
+        monkeypatch.setattr(manager, "get_password", broken)
+        with pytest.raises(OSError):
+            accounts.get_password("user1").result(timeout=2)
+
+    def test_manager_future_is_awaited_on_the_worker(self, manager):
+        """Calls can be queued while the manager is still being built."""
+        pending = Future()
+        accounts = AsyncCredentialManager(pending)
+        try:
+            last_used = accounts.get_last_used()
+            assert not last_used.done()
+            pending.set_result(manager)
+            assert last_used.result(timeout=2) == "user1"
+        finally:
+            accounts.shutdown()
@@ -0,0 +1,69 @@
+"""Unit tests for latency tracking and adaptive timeouts.
+
+Run with: pytest tests/test_latency.py -v
+"""
+
+from latency import EndpointLatency, LatencyTracker
+
+
+class TestAdaptiveTimeout:
+    """Test suite for LatencyTracker.timeout."""
+
+    def test_unknown_endpoint_uses_ceiling(self):
+        tracker = LatencyTracker()
+        assert tracker.timeout("status", 0.3, 3) == 3
+
+    def test_fast_portal_gives_sub_second_timeout(self):
+        tracker = LatencyTracker()
+        for _ in range(20):
+            tracker.record("status", 0.05)
+        assert 0.3 <= tracker.timeout("status", 0.3, 3) < 1
+
+    def test_timeout_is_clamped_to_ceiling(self):
+        tracker = LatencyTracker()
+        for _ in range(20):
+            tracker.record("login", 8.0)
+        assert tracker.timeout("login", 1, 10) == 10
+
+    def test_outliers_raise_the_timeout(self):
+        tracker = LatencyTracker()
+        for _ in range(20):
+            tracker.record("status", 0.1)
+        before = tracker.timeout("status", 0.3, 3)
+        tracker.record("status", 0.6)
+        assert tracker.timeout("status", 0.3, 3) > before
+
+
+class TestPersistence:
+    """Estimates should survive a restart."""
+
+    def test_save_and_reload(self, tmp_path):
+        path = tmp_path / "latency_stats.json"
+        tracker = LatencyTracker(path)
+        for ms in (40, 50, 60, 70, 80):
+            tracker.record("status", ms / 1000)
+        tracker.save()
+
+        reloaded = LatencyTracker(path)
+        assert reloaded.timeout("status", 0.3, 3) == tracker.timeout("status", 0.3, 3)
+        assert list(reloaded.stats("status").samples) == list(tracker.stats("status").samples)
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        path = tmp_path / "latency_stats.json"
+        path.write_text("{not json", encoding="utf-8")
+        assert LatencyTracker(path).timeout("status", 0.3, 3) == 3
+
+
+def test_percentile_nearest_rank():
+    stats = EndpointLatency()
+    for value in range(1, 51):
+        stats.add(value / 100)
+    assert stats.percentile(0.5) == 0.25
+    assert stats.percentile(0.99) == 0.5
+
+
+def test_window_keeps_recent_samples_only():
+    stats = EndpointLatency()
+    for value in range(1000):
+        stats.add(value)
+    assert min(stats.samples) == 1000 - len(stats.samples)
@@ -0,0 +1,50 @@
+"""Unit tests for the SessionInfo model.
+
+Run with: pytest tests/test_models.py -v
+"""
+
+import datetime
+
+import pytest
+from models import SessionInfo, parse_quota
+
+SESSION = SessionInfo(
+    success=True, message="Already Connected",
+    remaining_quota="32764.83 MB", total_quota="32768.0 MB",
+    quota_renewal_date="01/02/2026", last_login="02.01.2026 23:34",
+)
+
+
+class TestSessionInfo:
+    """Test suite for the typed SessionInfo fields."""
+
+    def test_fields_are_parsed_once_on_creation(self):
+        assert SESSION.remaining_bytes == int(32764.83 * 1024 * 1024)
+        assert SESSION.total_bytes == 32768 * 1024 * 1024
+        assert SESSION.renewal_date == datetime.date(2026, 2, 1)
+        assert SESSION.last_login_at == datetime.datetime(2026, 1, 2, 23, 34)
+
+    def test_quota_percent(self):
+        assert SESSION.quota_percent == pytest.approx(32764.83 / 32768.0)
+
+    def test_unparseable_strings_give_none(self):
+        session = SessionInfo(success=True, message="", remaining_quota="Not Found", quota_renewal_date="Not Found")
+        assert session.remaining_bytes is None
+        assert session.renewal_date is None
+        assert session.quota_percent == 0.0
+
+    def test_quota_parsing_is_exact(self):
+        assert parse_quota("0.01 MB") == 10485
+        assert parse_quota("---") is None
+
+    def test_non_finite_quota_gives_none(self):
+        """A scraped "NaN MB" or "Infinity MB" must not break SessionInfo()."""
+        for text in ("NaN MB", "Infinity MB", "-Infinity MB", "sNaN MB"):
+            assert parse_quota(text) is None
+        assert SessionInfo(success=True, message="", remaining_quota="NaN MB").quota_percent == 0.0
+
+    def test_uses_slots(self):
+        assert not hasattr(SESSION, "__dict__")
+
+    def test_dict_round_trip(self):
+        assert SessionInfo.from_dict(SESSION.to_dict()) == SESSION
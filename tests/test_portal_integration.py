@@ -0,0 +1,246 @@
+"""Integration tests for PortalClient against the local stand-in portal.
+
+Run with: pytest tests/test_portal_integration.py -v
+"""
+
+import os
+import time
+
+import pytest
+from connection import PortalClient, AuthenticationError, CircuitOpenError, WifiConnectionError
+from portal_server import StandInPortal
+from resilience import RetryPolicy, CircuitBreaker
+
+
+@pytest.fixture
+def portal():
+    """Stand-in portal running on a free local port."""
+    with StandInPortal() as server:
+        yield server
+
+
+@pytest.fixture
+def client(portal):
+    """PortalClient pointed at the stand-in portal."""
+    client = PortalClient(base_url=portal.base_url)
+    yield client
+    client.close()
+
+
+class TestPortalClient:
+    """End-to-end flows of PortalClient."""
+
+    def test_login_status_logout(self, client):
+        """Should log in, see the session, and end it again."""
+        assert not client.check_status().success
+
+        session = client.login("user1", "pass1")
+        assert session.success
+        assert session.remaining_quota == "32764.83 MB"
+
+        assert client.check_status().message == "Already Connected"
+        assert client.logout()
+        assert not client.check_status().success
+
+    def test_wrong_password(self, client):
+        """Should raise AuthenticationError for bad credentials."""
+        with pytest.raises(AuthenticationError):
+            client.login("user1", "wrong")
+
+    def test_logout_after_login_is_one_request(self, portal, client):
+        """Logout should reuse the ViewState from the login response."""
+        client.login("user1", "pass1")
+        portal.requests.clear()
+
+        assert client.logout()
+        assert dict(portal.requests) == {"POST /index.html": 1}
+
+    def test_unresponsive_portal_detected_quickly_once_latency_known(self, portal, client):
+        """With known fast latency, a hanging portal fails in well under 3 s."""
+        for _ in range(10):
+            client.check_status(max_age=0)
+
+        portal.latency = 2.0
+        started = time.monotonic()
+        assert client.check_status(max_age=0).message == "Connection Error"
+        assert time.monotonic() - started < 1.0
+
+
+class TestRetries:
+    """Retry and circuit breaker behaviour against a failing portal."""
+
+    @staticmethod
+    def _client(portal, threshold=100):
+        return PortalClient(
+            base_url=portal.base_url,
+            retry=RetryPolicy(max_attempts=5, base_delay=0.01, max_delay=0.05),
+            breaker=CircuitBreaker(failure_threshold=threshold, reset_timeout=60),
+        )
+
+    def test_login_survives_intermittent_503(self):
+        """Should retry 503 answers until the portal lets the login through."""
+        with StandInPortal(failure_rate=0.4, seed=3) as portal:
+            client = self._client(portal)
+            for _ in range(10):
+                assert client.login("user1", "pass1").success
+            assert portal.requests["POST /login/j_spring_security_check"] > 10
+            client.close()
+
+    def test_login_survives_dropped_connections(self):
+        """Should retry when the portal closes the connection without answering."""
+        with StandInPortal(drop_rate=0.3, seed=5) as portal:
+            client = self._client(portal)
+            for _ in range(10):
+                assert client.login("user1", "pass1").success
+            client.close()
+
+    def test_wrong_password_is_not_retried(self, portal):
+        """AuthenticationError is fatal: one login POST only."""
+        client = self._client(portal)
+        with pytest.raises(AuthenticationError):
+            client.login("user1", "wrong")
+        assert portal.requests["POST /login/j_spring_security_check"] == 1
+        client.close()
+
+    def test_circuit_opens_after_repeated_failures(self):
+        """A failing portal should stop receiving requests once the circuit opens."""
+        with StandInPortal(failure_rate=1.0) as portal:
+            client = self._client(portal, threshold=4)
+            with pytest.raises(WifiConnectionError):
+                client.login("user1", "pass1")
+            sent = sum(portal.requests.values())
+
+            with pytest.raises(CircuitOpenError):
+                client.login("user1", "pass1")
+            assert client.check_status().message == "Connection Error"
+            assert sum(portal.requests.values()) == sent
+            client.close()
+
+
+class TestCookieReuse:
+    """Skipping the preflight GET with a fresh session cookie."""
+
+    def test_fresh_cookie_skips_preflight(self, portal, client):
+        """A login right after a status check should be a single POST."""
+        client.check_status()
+        portal.requests.clear()
+
+        assert client.login("user1", "pass1").success
+        assert dict(portal.requests) == {"POST /login/j_spring_security_check": 1}
+
+    def test_cookie_jar_survives_restart(self, portal, tmp_path):
+        """The saved cookie should let a new client log in with one request."""
+        path = tmp_path / "cookies.txt"
+        first = PortalClient(base_url=portal.base_url, cookie_path=path)
+        first.login("user1", "pass1")
+        first.close()
+
+        portal.requests.clear()
+        second = PortalClient(base_url=portal.base_url, cookie_path=path)
+        assert second.login("user1", "pass1").success
+        assert dict(portal.requests) == {"POST /login/j_spring_security_check": 1}
+        second.close()
+
+    def test_rejected_cookie_falls_back_to_preflight(self, tmp_path):
+        """A login rejected for a stale session should preflight and post again."""
+        with StandInPortal(require_session=True) as portal:
+            path = tmp_path / "cookies.txt"
+            first = PortalClient(base_url=portal.base_url, cookie_path=path)
+            first.login("user1", "pass1")
+            first.close()
+
+            portal.sessions.clear()  # portal restarted, cookie no longer known
+            portal.requests.clear()
+            second = PortalClient(base_url=portal.base_url, cookie_path=path)
+            assert second.login("user1", "pass1").success
+            assert dict(portal.requests) == {"POST /login/j_spring_security_check": 2, "GET /": 1}
+            second.close()
+
+    def test_expired_cookie_is_not_reused(self, portal, tmp_path):
+        """A cookie older than COOKIE_MAX_AGE should not skip the preflight."""
+        path = tmp_path / "cookies.txt"
+        first = PortalClient(base_url=portal.base_url, cookie_path=path)
+        first.login("user1", "pass1")
+        first.close()
+        os.utime(path, (0, 0))
+
+        portal.requests.clear()
+        second = PortalClient(base_url=portal.base_url, cookie_path=path)
+        assert second.login("user1", "pass1").success
+        assert portal.requests["GET /"] == 1
+        second.close()
+
+
+class TestStreamingStatus:
+    """Status checks against large dashboard pages."""
+
+    def test_large_page_status_and_logout(self):
+        """Streaming should parse the fields and keep the logout form from the login."""
+        with StandInPortal(page_size=500_000) as portal:
+            client = PortalClient(base_url=portal.base_url, stream_status=True)
+            client.login("user1", "pass1")
+
+            session = client.check_status()
+            assert session.success
+            assert session.remaining_quota == "32764.83 MB"
+
+            portal.requests.clear()
+            assert client.logout()
+            assert dict(portal.requests) == {"POST /index.html": 1}
+            client.close()
+
+    def test_streamed_status_keeps_the_connection(self, portal, client):
+        """A short page rest is drained, so later requests reuse the connection."""
+        client.login("user1", "pass1")
+        for _ in range(5):
+            assert client.check_status(max_age=0).success
+        assert client.logout()
+        assert portal.connections == 1
+
+    def test_long_page_rest_drops_the_connection(self):
+        """Past STREAM_DRAIN_LIMIT the download costs more than a reconnect."""
+        with StandInPortal(page_size=500_000) as portal:
+            client = PortalClient(base_url=portal.base_url, stream_status=True)
+            client.login("user1", "pass1")
+            client.check_status(max_age=0)
+            client.check_status(max_age=0)
+            assert portal.connections == 2
+            client.close()
+
+    def test_full_download_mode_still_works(self, portal):
+        """stream_status=False should keep the old behaviour."""
+        client = PortalClient(base_url=portal.base_url, stream_status=False)
+        assert not client.check_status().success
+        client.login("user1", "pass1")
+        assert client.check_status().message == "Already Connected"
+        client.close()
+
+
+class TestStatusCache:
+    """Status answers reused within the TTL."""
+
+    def test_repeated_checks_hit_portal_once(self, portal, client):
+        """Polling within the TTL should cost a single portal request."""
+        client.login("user1", "pass1")
+        client.logout()
+        portal.requests.clear()
+
+        for _ in range(20):
+            assert not client.check_status().success
+        assert dict(portal.requests) == {"GET /index.html": 1}
+
+    def test_login_primes_and_logout_clears(self, portal, client):
+        """A login answers the next status check; a logout forgets it."""
+        client.login("user1", "pass1")
+        portal.requests.clear()
+        assert client.check_status().message == "Already Connected"
+        assert not portal.requests
+
+        client.logout()
+        assert not client.check_status().success
+
+    def test_max_age_zero_asks_portal(self, portal, client):
+        client.check_status()
+        portal.requests.clear()
+        client.check_status(max_age=0)
+        assert dict(portal.requests) == {"GET /index.html": 1}
@@ -0,0 +1,100 @@
+"""Unit tests for the adaptive dashboard refresh interval.
+
+Run with: pytest tests/test_quota_refresh.py -v
+"""
+
+import pytest
+from models import SessionInfo, BYTES_PER_MB
+from quota_refresh import RefreshSchedule
+
+TOTAL_MB = 10000
+
+
+def _session(remaining_mb):
+    return SessionInfo(True, "Already Connected", f"{remaining_mb} MB", f"{TOTAL_MB} MB")
+
+
+@pytest.fixture
+def schedule():
+    return RefreshSchedule(min_interval=15, max_interval=300, low_interval=30)
+
+
+class TestRefreshSchedule:
+    """Test suite for RefreshSchedule."""
+
+    def test_first_refresh_uses_idle_interval(self, schedule):
+        assert schedule.observe(_session(8000), now=0) == 300
+
+    def test_idle_account_stays_slow(self, schedule):
+        schedule.observe(_session(8000), now=0)
+        assert schedule.observe(_session(8000), now=300) == 300
+        assert schedule.rate == 0
+
+    def test_faster_when_quota_falls_quickly(self, schedule):
+        """1% of the quota (100 MB) used per 50 s should refresh every 50 s."""
+        schedule.observe(_session(8000), now=0)
+        assert schedule.observe(_session(7800), now=100) == pytest.approx(50)
+        assert schedule.rate == pytest.approx(2 * BYTES_PER_MB)
+
+    def test_interval_is_clamped(self, schedule):
+        schedule.observe(_session(8000), now=0)
+        assert schedule.observe(_session(2000), now=15) == 15
+
+    def test_low_quota_refreshes_faster(self, schedule):
+        """At or below 20% left, an idle account is still checked every 30 s."""
+        schedule.observe(_session(1500), now=0)
+        assert schedule.observe(_session(1500), now=300) == 30
+
+    def test_renewal_resets_rate(self, schedule):
+        schedule.observe(_session(8000), now=0)
+        schedule.observe(_session(7800), now=100)
+        assert schedule.observe(_session(TOTAL_MB), now=200) == 300
+        assert schedule.rate is None
+
+    def test_rate_is_smoothed(self, schedule):
+        schedule.observe(_session(8000), now=0)
+        schedule.observe(_session(7800), now=100)      # 2 MB/s
+        schedule.observe(_session(7800), now=200)      # 0 MB/s
+        assert schedule.rate == pytest.approx(1 * BYTES_PER_MB)
+
+    def test_unknown_quota_uses_idle_interval(self, schedule):
+        assert schedule.observe(SessionInfo(True, "Already Connected"), now=0) == 300
+
+    def test_reset_forgets_history(self, schedule):
+        schedule.observe(_session(8000), now=0)
+        schedule.observe(_session(7800), now=100)
+        schedule.reset()
+        assert schedule.rate is None
+        assert schedule.observe(_session(5000), now=200) == 300
+
+
+class _Dashboard:
+    """DashboardFrame stand-in recording the refresh outcome, without Tk."""
+
+    def __init__(self):
+        from ui.frames import DashboardFrame
+        self.view = DashboardFrame.__new__(DashboardFrame)
+        self.events = []
+        self.view._refresh_task = None
+        self.view.schedule = RefreshSchedule(min_interval=15)
+        self.view.on_logout = lambda: self.events.append("logout")
+        self.view.on_session_lost = self.view.on_logout
+        self.view.on_switch = lambda session: self.events.append("switch")
+        self.view.set_notice = lambda text: self.events.append(text)
+        self.view.stop_refresh = lambda: self.events.append("stop")
+        self.view._schedule_refresh = lambda delay: self.events.append(delay)
+
+
+class TestDashboardRefreshOutcome:
+    """Test suite for DashboardFrame._on_refreshed."""
+
+    def test_ended_session_logs_out(self):
+        dash = _Dashboard()
+        dash.view._on_refreshed(SessionInfo(False, "Not Connected"))
+        assert dash.events == ["stop", "logout"]
+
+    def test_connection_error_retries(self):
+        dash = _Dashboard()
+        dash.view._on_refreshed(SessionInfo(False, "Connection Error"))
+        dash.view._on_refreshed(None)
+        assert dash.events == ["OFFLINE  ·  RETRYING", 15] * 2
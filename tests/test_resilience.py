@@ -0,0 +1,66 @@
+"""Unit tests for the retry policy and circuit breaker.
+
+Run with: pytest tests/test_resilience.py -v
+"""
+
+import time
+
+from resilience import RetryPolicy, CircuitBreaker
+
+
+class TestRetryPolicy:
+    """Test suite for RetryPolicy.delay."""
+
+    def test_delay_grows_exponentially_within_cap(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.3)
+        for _ in range(50):
+            assert 0 <= policy.delay(1) <= 0.1
+            assert 0 <= policy.delay(2) <= 0.2
+            assert 0 <= policy.delay(5) <= 0.3
+
+    def test_delay_is_jittered(self):
+        policy = RetryPolicy(base_delay=1.0)
+        assert len({policy.delay(1) for _ in range(10)}) > 1
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker state transitions."""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+        assert breaker.retry_after() > 0
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_single_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
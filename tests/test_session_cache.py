@@ -0,0 +1,107 @@
+"""Unit tests for the per-account SessionInfo snapshots.
+
+Run with: pytest tests/test_session_cache.py -v
+"""
+
+import json
+import time
+from concurrent.futures import Future
+
+from models import SessionInfo
+from session_cache import SessionCache
+
+SESSION = SessionInfo(
+    success=True, message="Already Connected",
+    remaining_quota="32764.83 MB", total_quota="32768.0 MB",
+    quota_renewal_date="01/02/2026", last_login="02.01.2026 23:34",
+)
+
+
+class TestSessionCache:
+    """Test suite for SessionCache."""
+
+    def test_put_and_get(self):
+        cache = SessionCache()
+        cache.put("user1", SESSION)
+        session, age = cache.get("user1")
+        assert session == SESSION
+        assert 0 <= age < 1
+
+    def test_failed_sessions_are_ignored(self):
+        cache = SessionCache()
+        cache.put("user1", SessionInfo(success=False, message="Not Connected"))
+        assert cache.get("user1") is None
+        assert cache.get(None) is None
+
+    def test_snapshots_survive_restart_with_age(self, tmp_path):
+        path = tmp_path / "session_cache.json"
+        cache = SessionCache(path, save_delay=0)
+        cache.put("user1", SESSION)
+
+        data = json.loads(path.read_text())
+        data["user1"]["time"] -= 600
+        path.write_text(json.dumps(data))
+
+        session, age = SessionCache(path).get("user1")
+        assert session == SESSION
+        assert age >= 600
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        path = tmp_path / "session_cache.json"
+        path.write_text("{not json")
+        assert SessionCache(path).get("user1") is None
+
+    def test_incompatible_snapshot_is_ignored(self, tmp_path):
+        path = tmp_path / "session_cache.json"
+        path.write_text(json.dumps({"user1": {"time": 0, "session": {"quota": 1}}}))
+        assert SessionCache(path).get("user1") is None
+
+    def test_put_is_written_behind(self, tmp_path):
+        path = tmp_path / "session_cache.json"
+        cache = SessionCache(path, save_delay=0.1)
+        cache.put("user1", SESSION)
+        cache.put("user2", SESSION)
+        assert not path.exists()
+
+        deadline = time.monotonic() + 2
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert set(json.loads(path.read_text())) == {"user1", "user2"}
+
+    def test_discard_is_persisted(self, tmp_path):
+        path = tmp_path / "session_cache.json"
+        cache = SessionCache(path, save_delay=0)
+        cache.put("user1", SESSION)
+        cache.discard("user1")
+        assert cache.get("user1") is None
+        assert SessionCache(path).get("user1") is None
+
+    def test_failed_write_is_retried(self, tmp_path, monkeypatch):
+        path = tmp_path / "session_cache.json"
+        cache = SessionCache(path, save_delay=0)
+        monkeypatch.setattr(json, "dump", lambda *a, **k: (_ for _ in ()).throw(OSError("disk full")))
+        cache.put("user1", SESSION)
+        monkeypatch.undo()
+        cache.save()
+        assert SessionCache(path).get("user1")[0] == SESSION
+
+
+class _Tasks:
+    """TaskRunner stand-in that delivers finished futures at once."""
+
+    def watch(self, future, on_done=None):
+        on_done(future.result())
+
+
+def test_removed_account_snapshot_is_discarded():
+    from ui.app import WindowMain
+
+    cache = SessionCache()
+    cache.put("user1", SESSION)
+    sessions = Future()
+    sessions.set_result(cache)
+    window = WindowMain.__new__(WindowMain)
+    window.tasks, window.sessions = _Tasks(), sessions
+
+    window._forget_session("user1")
+    assert cache.get("user1") is None
@@ -0,0 +1,219 @@
+"""Unit tests for the connectivity watchdog.
+
+Run with: pytest tests/test_session_watchdog.py -v
+"""
+
+import errno
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+from models import SessionInfo
+from session_watchdog import ConnectivityWatchdog, NetlinkMonitor, PollingMonitor, create_network_monitor
+
+
+CONNECTED = SessionInfo(success=True, message="Already Connected", remaining_quota="1.0 MB")
+NOT_CONNECTED = SessionInfo(success=False, message="Not Connected")
+
+
+class FakeCreds:
+    def get_last_credentials(self):
+        return "user1", "pass1"
+
+
+class FakeMonitor(PollingMonitor):
+    """Monitor whose network events are triggered by the test."""
+
+    def __init__(self):
+        super().__init__()
+        self.event = False
+        self.waits = []
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        super().wait(timeout)
+        event, self.event = self.event, False
+        return event
+
+    def trigger(self):
+        self.event = True
+        self.wakeup()
+
+
+def _watchdog(statuses, logins, **kwargs):
+    """Watchdog replaying scripted status / login results."""
+    statuses, logins = list(statuses), list(logins)
+
+    def connect(username, password):
+        result = logins.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return ConnectivityWatchdog(
+        FakeCreds(), check=lambda: statuses.pop(0), connect=connect,
+        monitor=FakeMonitor(), check_interval=60, backoff_initial=2, backoff_max=8, **kwargs
+    )
+
+
+class TestRunOnce:
+    """Test suite for a single watchdog step."""
+
+    def test_connected_sleeps_for_check_interval(self):
+        watchdog = _watchdog([CONNECTED], [])
+        assert watchdog.run_once() == 60
+        assert watchdog.reconnects == 0
+
+    def test_backoff_doubles_up_to_max(self):
+        failures = [OSError("down")] * 4
+        watchdog = _watchdog([NOT_CONNECTED] * 4, failures)
+        assert [watchdog.run_once() for _ in range(4)] == [2, 4, 8, 8]
+
+    def test_reconnect_reports_downtime(self):
+        reports = []
+        watchdog = _watchdog(
+            [NOT_CONNECTED, NOT_CONNECTED], [NOT_CONNECTED, CONNECTED],
+            on_reconnect=lambda downtime, session: reports.append((downtime, session)),
+        )
+        assert watchdog.run_once() == 2
+        time.sleep(0.05)
+        assert watchdog.run_once() == 60
+
+        assert watchdog.reconnects == 1
+        assert reports[0][1] is CONNECTED
+        assert 0.05 <= reports[0][0] == watchdog.last_downtime
+        assert watchdog.lost_at is None
+
+
+class TestWatchdogThread:
+    """Test suite for the background loop."""
+
+    def test_network_event_wakes_the_watchdog(self, monkeypatch):
+        monkeypatch.setattr("session_watchdog.WATCHDOG_SETTLE_DELAY", 0)
+        checked = threading.Event()
+        calls = []
+
+        def check():
+            calls.append(time.monotonic())
+            if len(calls) == 2:
+                checked.set()
+            return CONNECTED
+
+        watchdog = ConnectivityWatchdog(FakeCreds(), check=check, connect=lambda u, p: CONNECTED,
+                                        monitor=FakeMonitor(), check_interval=60)
+        watchdog.start()
+        time.sleep(0.05)
+        watchdog.monitor.trigger()
+        assert checked.wait(1)
+        watchdog.stop(timeout=1)
+        assert watchdog._thread is None
+
+    def test_check_now_skips_the_wait(self):
+        checked = threading.Event()
+        statuses = [CONNECTED]
+
+        def check():
+            if not statuses:
+                checked.set()
+            return statuses.pop() if statuses else CONNECTED
+
+        watchdog = ConnectivityWatchdog(FakeCreds(), check=check, connect=lambda u, p: CONNECTED,
+                                        monitor=FakeMonitor(), check_interval=60)
+        watchdog.start()
+        time.sleep(0.05)
+        watchdog.check_now()
+        assert checked.wait(1)
+        watchdog.stop(timeout=1)
+
+    def test_stop_interrupts_long_sleep(self):
+        watchdog = _watchdog([CONNECTED], [])
+        watchdog.start()
+        time.sleep(0.05)
+        started = time.monotonic()
+        watchdog.stop(timeout=1)
+        assert time.monotonic() - started < 0.5
+
+
+def test_create_network_monitor_has_wait_and_wakeup():
+    """Should fall back gracefully where netlink is unavailable."""
+    monitor = create_network_monitor()
+    assert monitor.wait(0) in (True, False)
+    monitor.close()
+
+
+def test_netlink_overrun_counts_as_event():
+    """ENOBUFS during a burst of route changes must not kill the watchdog."""
+    class OverrunSocket:
+        def recv(self, size):
+            raise OSError(errno.ENOBUFS, "No buffer space available")
+
+    monitor = NetlinkMonitor.__new__(NetlinkMonitor)
+    monitor._sock = OverrunSocket()
+    monitor._drain()  # returns instead of raising
+
+
+class FakeRoot:
+    """Tk stand-in: after() callbacks are recorded, not run."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback, *args):
+        self.scheduled.append(callback)
+
+
+class TestWindowReconnect:
+    """Test suite for the watchdog logins of WindowMain."""
+
+    @pytest.fixture
+    def window(self, monkeypatch):
+        import connection
+        from ui.app import WindowMain
+        from ui.tasks import TaskRunner
+
+        monkeypatch.setattr(connection, "connect_to_wifi", lambda u, p: CONNECTED)
+        window = WindowMain.__new__(WindowMain)
+        window.root = FakeRoot()
+        window.tasks = TaskRunner(window.root, max_workers=1)
+        window._keep_connected = True
+        window._closing = False
+        window._reconnects = queue.SimpleQueue()
+        yield window
+        window.tasks.shutdown()
+
+    def test_request_runs_as_session_task(self, window):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(window._request_reconnect("user1", "pass1")))
+        thread.start()
+        while window._reconnects.empty():
+            time.sleep(0.01)
+        window._poll_reconnects()
+        thread.join(1)
+        assert result == [CONNECTED]
+        assert window._poll_reconnects in window.root.scheduled
+
+    def test_logged_out_window_does_not_reconnect(self, window):
+        window._keep_connected = False
+        done = Future()
+        window._start_reconnect("user1", "pass1", done)
+        assert done.result(timeout=0) is None
+        assert not window.tasks.busy("session")
+
+    def test_running_session_action_is_not_superseded(self, window):
+        release = threading.Event()
+        window.tasks.submit(("switch", "user2"), release.wait, group="session")
+        done = Future()
+        window._start_reconnect("user1", "pass1", done)
+        assert done.result(timeout=0) is None
+        release.set()
+
+    def test_superseded_login_releases_the_watchdog(self, window):
+        release = threading.Event()
+        window.tasks.submit(("busy",), release.wait)  # occupies the only worker
+        done = Future()
+        window._start_reconnect("user1", "pass1", done)
+        window.tasks.submit(("logout",), lambda: True, group="session")
+        assert done.cancelled()
+        release.set()
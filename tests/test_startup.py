@@ -0,0 +1,262 @@
+"""Unit tests for the cold-start pipeline.
+
+Run with: pytest tests/test_startup.py -v
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import credentials
+from connection import PortalClient
+from models import SessionInfo
+from portal_server import StandInPortal
+import startup
+from startup import StartupPipeline
+
+
+class SlowManager:
+    """CredentialManager stand-in with a slow keyring."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.prefetched = False
+
+    def get_last_credentials(self):
+        time.sleep(self.delay)
+        return "user1", "secret"
+
+    def prefetch_passwords(self):
+        self.prefetched = True
+
+
+class FakeClient:
+    """PortalClient stand-in with a configurable login."""
+
+    def __init__(self, delay=0.0, success=True):
+        self.delay = delay
+        self.success = success
+        self.closed = False
+        self.logins = 0
+
+    def login(self, username, password):
+        self.logins += 1
+        time.sleep(self.delay)
+        return SessionInfo(success=self.success, message="Login Successful")
+
+    def close(self):
+        self.closed = True
+
+
+def _probe(delay, success):
+    def probe():
+        time.sleep(delay)
+        return SessionInfo(success=success, message="Already Connected" if success else "Not Connected")
+    return probe
+
+
+@pytest.fixture(autouse=True)
+def app_dir(tmp_path, monkeypatch):
+    """Keep the default session cache loader out of ~/.config."""
+    monkeypatch.setattr(credentials, "get_app_data_dir", lambda: tmp_path)
+    return tmp_path
+
+
+class TestStartupPipeline:
+    """Test suite for StartupPipeline."""
+
+    def test_probe_and_credentials_run_concurrently(self):
+        """Total wait should be the slower task, not the sum of both."""
+        def probe():
+            time.sleep(0.3)
+            return SessionInfo(success=False, message="Not Connected")
+
+        started = time.perf_counter()
+        pipeline = StartupPipeline(probe=probe, manager_factory=lambda: SlowManager(0.3)).start()
+        assert pipeline.status.result().message == "Not Connected"
+        assert pipeline.wait_credentials() == ("user1", "secret")
+        assert time.perf_counter() - started < 0.5
+
+    def test_start_does_not_block(self):
+        """start() should return before the probe finishes."""
+        def probe():
+            time.sleep(0.3)
+            return SessionInfo(success=True, message="Already Connected")
+
+        started = time.perf_counter()
+        pipeline = StartupPipeline(probe=probe, manager_factory=lambda: SlowManager(0)).start()
+        assert time.perf_counter() - started < 0.1
+        assert pipeline.status.result().success
+
+    def test_manager_errors_surface_in_credentials_future(self):
+        """A failing credential load should not hang the UI."""
+        def broken_factory():
+            raise OSError("config dir not writable")
+
+        pipeline = StartupPipeline(probe=lambda: None, manager_factory=broken_factory).start()
+        with pytest.raises(OSError):
+            pipeline.wait_credentials(timeout=1)
+
+    def test_keyring_is_never_read_on_calling_thread(self):
+        """Even an instantly built manager must not read the keyring in start()."""
+        readers = []
+
+        class RecordingManager(SlowManager):
+            def get_last_credentials(self):
+                readers.append(threading.get_ident())
+                return super().get_last_credentials()
+
+        manager = RecordingManager(0)
+        pipeline = StartupPipeline(probe=_probe(0, False), manager_factory=lambda: manager, preload=None).start()
+        assert pipeline.wait_credentials(timeout=1) == ("user1", "secret")
+        assert readers and threading.get_ident() not in readers
+        assert manager.prefetched
+
+    def test_icons_preload_alongside_probe(self):
+        """The preload step should run without waiting for the probe."""
+        preloaded = []
+        pipeline = StartupPipeline(
+            probe=_probe(0.3, False), manager_factory=lambda: SlowManager(0),
+            preload=lambda: preloaded.append(True)
+        ).start()
+        pipeline.icons.result(timeout=0.2)
+        assert preloaded == [True]
+        assert not pipeline.status.done()
+
+    def test_preload_can_be_disabled(self):
+        pipeline = StartupPipeline(probe=_probe(0, True), manager_factory=lambda: SlowManager(0), preload=None).start()
+        assert pipeline.icons is None
+
+    def test_session_cache_loads_alongside_probe(self):
+        """The snapshot file is read on a worker, not by WindowMain."""
+        readers = []
+        pipeline = StartupPipeline(
+            probe=_probe(0.3, False), manager_factory=lambda: SlowManager(0), preload=None,
+            session_cache_factory=lambda: readers.append(threading.get_ident()) or "cache",
+        ).start()
+        assert pipeline.session_cache.result(timeout=0.2) == "cache"
+        assert readers != [threading.get_ident()]
+
+
+class TestRaceMode:
+    """Test suite for the startup race between probe and auto-login."""
+
+    @pytest.fixture(autouse=True)
+    def adopted(self, monkeypatch):
+        adopted = []
+        monkeypatch.setattr(startup, "_use_client", adopted.append)
+        return adopted
+
+    def test_login_wins_when_not_connected(self, adopted):
+        """Time-to-connected should be the max of both calls, not the sum."""
+        client = FakeClient(delay=0.3)
+        started = time.perf_counter()
+        pipeline = StartupPipeline(
+            probe=_probe(0.3, False), manager_factory=lambda: SlowManager(0),
+            race=True, client_factory=lambda: client
+        ).start()
+
+        session = pipeline.session.result()
+        assert session.message == "Login Successful"
+        assert time.perf_counter() - started < 0.5
+        assert adopted == [client]
+
+    def test_existing_session_beats_faster_login(self, adopted):
+        """A login is only used after the probe rules out a session."""
+        client = FakeClient(delay=0)
+        pipeline = StartupPipeline(
+            probe=_probe(0.2, True), manager_factory=lambda: SlowManager(0),
+            race=True, client_factory=lambda: client
+        ).start()
+
+        session = pipeline.session.result()
+        assert session.message == "Already Connected"
+        assert client.closed
+        assert adopted == []
+
+    def test_cancelled_login_sends_no_post(self, adopted):
+        """Against a slow portal: the losing login stops after its preflight."""
+        with StandInPortal(latency=0.3) as portal:
+            client = PortalClient(base_url=portal.base_url)
+            pipeline = StartupPipeline(
+                probe=_probe(0.1, True), manager_factory=lambda: SlowManager(0), preload=None,
+                race=True, client_factory=lambda: client
+            ).start()
+
+            assert pipeline.session.result().message == "Already Connected"
+            pipeline._executor.shutdown(wait=True)
+            assert client._closed
+            assert portal.requests["POST /login/j_spring_security_check"] == 0
+        assert adopted == []
+
+    def test_failed_login_falls_back_to_probe_result(self, adopted):
+        """Should report the probe outcome when the login fails."""
+        client = FakeClient(success=False)
+        pipeline = StartupPipeline(
+            probe=_probe(0, False), manager_factory=lambda: SlowManager(0),
+            race=True, client_factory=lambda: client
+        ).start()
+
+        assert pipeline.session.result().message == "Not Connected"
+        assert adopted == []
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Process start to first window paint, GUI path (seconds)
+FIRST_PAINT_BUDGET = 2.0
+
+# Mirrors main.py; the probe, the credential store and the snapshot file
+# never load in time, so only the loader is painted
+FIRST_PAINT_SCRIPT = """
+import os, sys, time
+from startup import StartupPipeline
+
+startup = StartupPipeline(
+    probe=lambda: time.sleep(30), manager_factory=lambda: time.sleep(30),
+    session_cache_factory=lambda: time.sleep(30),
+).start()
+from ui import WindowMain
+window = WindowMain(startup=startup)
+window.root.update()
+print(time.time(), flush=True)
+os._exit(0)
+"""
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("linux") and not os.environ.get("DISPLAY"),
+    reason="needs a display for Tk"
+)
+class TestFirstPaint:
+    """Regression test for GUI time-to-first-paint."""
+
+    def test_first_paint_within_budget(self):
+        started = time.time()
+        result = subprocess.run(
+            [sys.executable, "-c", FIRST_PAINT_SCRIPT],
+            cwd=SRC_DIR, capture_output=True, text=True, timeout=30,
+        )
+        assert result.returncode == 0, result.stderr
+        assert float(result.stdout.strip()) - started < FIRST_PAINT_BUDGET
+
+
+class TestLazyImports:
+    """Heavy modules must stay off the main thread's pre-paint import path."""
+
+    def test_gui_import_path_defers_network_and_keyring(self):
+        """main.py's imports before WindowMain() should not pull these in."""
+        script = (
+            "import sys, startup, ui; "
+            "print(sorted(m for m in ('requests', 'keyring', 'bs4', 'ui.frames', 'credentials') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=SRC_DIR, capture_output=True, text=True, timeout=30,
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
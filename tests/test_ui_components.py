@@ -0,0 +1,48 @@
+"""Unit tests for the UI component helpers.
+
+Run with: pytest tests/test_ui_components.py -v
+"""
+
+from ui.components import WidgetUpdater
+
+
+class FakeWidget:
+    """Records every configure() call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def configure(self, **options):
+        self.calls.append(options)
+
+
+class TestWidgetUpdater:
+    """Tests for applying only changed widget options."""
+
+    def test_first_configure_applies_everything(self):
+        widget = FakeWidget()
+        assert WidgetUpdater().configure(widget, text="42%", border_color="#fff") is True
+        assert widget.calls == [{"text": "42%", "border_color": "#fff"}]
+
+    def test_unchanged_options_are_skipped(self):
+        updater, widget = WidgetUpdater(), FakeWidget()
+        updater.configure(widget, text="42%", border_color="#fff")
+        assert updater.configure(widget, text="42%", border_color="#fff") is False
+        assert len(widget.calls) == 1
+
+    def test_only_changed_options_are_applied(self):
+        updater, widget = WidgetUpdater(), FakeWidget()
+        updater.configure(widget, text="42%", border_color="#fff")
+        updater.configure(widget, text="41%", border_color="#fff")
+        assert widget.calls[-1] == {"text": "41%"}
+
+    def test_widgets_are_tracked_separately(self):
+        updater, first, second = WidgetUpdater(), FakeWidget(), FakeWidget()
+        updater.configure(first, text="")
+        updater.configure(second, text="")
+        assert first.calls == second.calls == [{"text": ""}]
+
+    def test_none_is_a_value(self):
+        updater, widget = WidgetUpdater(), FakeWidget()
+        updater.configure(widget, image=None)
+        assert widget.calls == [{"image": None}]
@@ -0,0 +1,60 @@
+"""Unit tests for the shared icon cache.
+
+Run with: pytest tests/test_ui_icons.py -v
+"""
+
+import os
+
+import pytest
+from config import ICON_GITHUB, ICON_LINKEDIN, ICON_PRESCALE
+from ui import icons
+from ui.icons import IconCache
+
+
+@pytest.fixture(autouse=True)
+def elsewhere(tmp_path, monkeypatch):
+    """Run outside the repository: icons must not depend on the working directory."""
+    monkeypatch.chdir(tmp_path)
+    icons.resource_path.cache_clear()
+    yield
+    icons.resource_path.cache_clear()
+
+
+class TestIconCache:
+    """Tests for decoding icons once per path and size."""
+
+    def test_same_image_is_shared(self):
+        cache = IconCache(sizes={})
+        assert cache.get(ICON_GITHUB, (20, 20)) is cache.get(ICON_GITHUB, [20, 20])
+
+    def test_sizes_are_cached_separately(self):
+        cache = IconCache(sizes={})
+        small, large = cache.get(ICON_GITHUB, (20, 20)), cache.get(ICON_GITHUB, (40, 40))
+        assert small is not large
+        assert large.cget("size") == (40, 40)
+
+    def test_icons_are_prescaled(self):
+        """The decoded image is already at the display size (times ICON_PRESCALE)."""
+        image = IconCache(sizes={}).get(ICON_LINKEDIN, (20, 20))
+        assert image.cget("light_image").size == (20 * ICON_PRESCALE, 20 * ICON_PRESCALE)
+
+    def test_file_is_decoded_once(self, monkeypatch):
+        cache = IconCache(sizes={ICON_GITHUB: [(20, 20)]})
+        loads = []
+        original = IconCache._load
+        monkeypatch.setattr(IconCache, "_load", staticmethod(lambda *a: loads.append(a) or original(*a)))
+        cache.preload()
+        cache.get(ICON_GITHUB, (20, 20))
+        assert loads == [(ICON_GITHUB, (20, 20))]
+
+    def test_preload_skips_missing_files(self, capsys):
+        cache = IconCache(sizes={"icons/missing.png": [(20, 20)], ICON_GITHUB: [(20, 20)]})
+        cache.preload()
+        assert "Failed to load icon icons/missing.png" in capsys.readouterr().out
+        with pytest.raises(OSError):
+            cache.get("icons/missing.png", (20, 20))
+
+
+def test_resource_path_is_relative_to_the_repository():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert icons.resource_path(ICON_GITHUB) == os.path.join(root, ICON_GITHUB)
@@ -0,0 +1,133 @@
+"""UI responsiveness test: no main-thread callback may block on storage.
+
+Drives the login and dashboard frames against a keyring that takes
+200 ms per read and checks that every event handler and every callback
+delivered by the TaskRunner returns within one frame (~16 ms).
+
+Run with: pytest tests/test_ui_responsiveness.py -v
+"""
+
+import os
+import sys
+import time
+
+import keyring
+import pytest
+from config import KEYRING_SERVICE_ID
+from credentials import AsyncCredentialManager
+from models import SessionInfo
+from test_credentials import SESSION, SlowKeyring, manager  # noqa: F401  (fixture)
+
+# One frame at 60 Hz (seconds)
+FRAME_BUDGET = 0.016
+
+pytestmark = pytest.mark.skipif(
+    sys.platform.startswith("linux") and not os.environ.get("DISPLAY"),
+    reason="needs a display for Tk"
+)
+
+
+@pytest.fixture
+def slow_keyring(monkeypatch):
+    backend = SlowKeyring()
+    backend.passwords[(KEYRING_SERVICE_ID, "user1")] = "secret1"
+    backend.passwords[(KEYRING_SERVICE_ID, "user2")] = "secret2"
+    monkeypatch.setattr(keyring, "get_keyring", lambda: backend)
+    monkeypatch.setattr(keyring, "get_password", backend.get_password)
+    monkeypatch.setattr(keyring, "set_password", backend.set_password)
+    monkeypatch.setattr(keyring, "delete_password", backend.delete_password)
+    return backend
+
+
+@pytest.fixture
+def ui(manager, slow_keyring, monkeypatch):  # noqa: F811
+    import customtkinter as ctk
+    from ui import frames
+    from ui.tasks import TaskRunner
+
+    monkeypatch.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    monkeypatch.setattr(frames, "connect_to_wifi", lambda u, p: SessionInfo(True, "Login Successful"))
+
+    root = ctk.CTk()
+    runner = TaskRunner(root)
+    accounts = AsyncCredentialManager(manager)
+    
+    # Time every callback the runner delivers on the main thread
+    durations = []
+    invoke = runner._invoke
+
+    def timed_invoke(callback, *args):
+        started = time.perf_counter()
+        invoke(callback, *args)
+        durations.append((time.perf_counter() - started, callback))
+
+    runner._invoke = timed_invoke
+
+    def settle(timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while (runner._pending() or not runner._results.empty()) and time.monotonic() < deadline:
+            root.update()
+            time.sleep(0.005)
+        root.update()
+
+    yield root, runner, accounts, durations, settle
+    runner.shutdown()
+    accounts.shutdown()
+    root.destroy()
+
+
+def _timed(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+class TestResponsiveness:
+    """Handlers and callbacks must never wait on the keyring or the config file."""
+
+    def test_login_view(self, ui, monkeypatch):
+        from ui.components import CustomDialog
+        from ui.frames import LoginFrame
+        root, runner, accounts, durations, settle = ui
+
+        connected = []
+        view = LoginFrame(root, accounts, connected.append, runner)
+        settle()
+        assert view.entry_pwd.get() == "secret1"
+
+        handlers = [_timed(view._on_account_selected, "user2")]
+        settle()
+        assert view.entry_pwd.get() == "secret2"
+
+        answers = iter(["user3", "pw3"])
+        monkeypatch.setattr(CustomDialog, "ask_string", staticmethod(lambda *a, **k: next(answers)))
+        monkeypatch.setattr(CustomDialog, "ask_confirm", staticmethod(lambda *a, **k: True))
+        handlers.append(_timed(view._on_add))
+        settle()
+        assert "user3" in view.map_label_to_user.values()
+
+        handlers.append(_timed(view._on_remove))
+        handlers.append(_timed(view.refresh))
+        settle()
+        handlers.append(_timed(view._on_connect))
+        settle()
+        assert connected
+
+        assert max(handlers) < FRAME_BUDGET
+        slowest = max(durations, key=lambda d: d[0])
+        assert slowest[0] < FRAME_BUDGET, f"{slowest[1]} blocked for {slowest[0] * 1e3:.1f} ms"
+
+    def test_dashboard_view(self, ui):
+        from ui.frames import DashboardFrame
+        root, runner, accounts, durations, settle = ui
+
+        view = DashboardFrame(root, SESSION, accounts, lambda: None, lambda s: None, runner)
+        settle()
+        assert view.current_user == "user1"
+
+        handlers = [_timed(view.show_session, SESSION), _timed(view.show_session, SESSION, 60)]
+        settle()
+
+        assert max(handlers) < FRAME_BUDGET
+        slowest = max(durations, key=lambda d: d[0])
+        assert slowest[0] < FRAME_BUDGET, f"{slowest[1]} blocked for {slowest[0] * 1e3:.1f} ms"
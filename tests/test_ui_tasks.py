@@ -0,0 +1,144 @@
+"""Unit tests for the UI task runner.
+
+Run with: pytest tests/test_ui_tasks.py -v
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+from ui.tasks import TaskRunner, checkpoint
+
+
+class FakeRoot:
+    """Records after() callbacks; pump() runs them like the Tk main loop."""
+
+    def __init__(self):
+        self.scheduled = []
+        self.main_thread = threading.get_ident()
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def pump(self, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while self.scheduled and time.monotonic() < deadline:
+            callbacks, self.scheduled = self.scheduled, []
+            for callback in callbacks:
+                callback()
+            time.sleep(0.001)
+
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+
+@pytest.fixture
+def runner(root):
+    runner = TaskRunner(root, max_workers=1)
+    yield runner
+    runner.shutdown()
+
+
+class TestTaskRunner:
+    """Test suite for TaskRunner."""
+
+    def test_result_delivered_on_main_thread(self, root, runner):
+        results = []
+        runner.submit("op", lambda: 42, on_done=lambda r: results.append((r, threading.get_ident())))
+        root.pump()
+        assert results == [(42, root.main_thread)]
+
+    def test_errors_go_to_on_error(self, root, runner):
+        errors = []
+        runner.submit("op", lambda: 1 / 0, on_error=errors.append)
+        root.pump()
+        assert isinstance(errors[0], ZeroDivisionError)
+
+    def test_identical_requests_are_coalesced(self, root, runner):
+        release = threading.Event()
+        calls, results = [], []
+
+        def work():
+            calls.append(1)
+            release.wait(2)
+            return "session"
+
+        runner.submit(("connect", "user1"), work, on_done=results.append)
+        runner.submit(("connect", "user1"), work, on_done=results.append)
+        release.set()
+        root.pump()
+        assert calls == [1]
+        assert results == ["session", "session"]
+
+    def test_superseded_task_is_cancelled_or_dropped(self, root, runner):
+        release = threading.Event()
+        ran, results = [], []
+
+        def work(name):
+            ran.append(name)
+            if name == "connect":
+                release.wait(2)
+            return name
+
+        runner.submit("connect", work, "connect", group="session", on_done=results.append)
+        runner.submit("queued", work, "queued", group="session", on_done=results.append)
+        runner.submit("switch", work, "switch", group="session", on_done=results.append)
+        release.set()
+        root.pump()
+
+        assert "queued" not in ran          # never started
+        assert results == ["switch"]       # running "connect" finished, result dropped
+
+    def test_polling_stops_when_idle(self, root, runner):
+        runner.submit("op", lambda: None)
+        root.pump()
+        assert root.scheduled == []
+
+    def test_call_soon_from_worker(self, root, runner):
+        progress = []
+        runner.submit("op", lambda: runner.call_soon(progress.append, "halfway"))
+        root.pump()
+        assert progress == ["halfway"]
+
+    def test_watched_future_delivered_on_main_thread(self, root, runner):
+        future, results = Future(), []
+        runner.watch(future, on_done=lambda r: results.append((r, threading.get_ident())))
+        threading.Thread(target=future.set_result, args=("accounts",)).start()
+        root.pump()
+        assert results == [("accounts", root.main_thread)]
+        assert root.scheduled == []
+
+    def test_watched_error_without_handler_is_reported(self, root, runner):
+        reported = []
+        root.report_callback_exception = lambda *exc: reported.append(exc[1])
+        future = Future()
+        runner.watch(future)
+        future.set_exception(OSError("keyring locked"))
+        root.pump()
+        assert isinstance(reported[0], OSError)
+
+    def test_superseded_task_stops_at_checkpoint(self, root):
+        """A running task must not make its later portal calls once superseded."""
+        runner = TaskRunner(root, max_workers=2)
+        started, release = threading.Event(), threading.Event()
+        steps = []
+
+        def bg_check():
+            started.set()
+            release.wait(2)
+            checkpoint()
+            steps.append("connect")
+
+        runner.submit("startup", bg_check, group="session")
+        started.wait(2)
+        runner.submit("logout", lambda: steps.append("logout"), group="session")
+        release.set()
+        root.pump()
+        runner.shutdown()
+        assert steps == ["logout"]
+
+    def test_checkpoint_outside_tasks_is_a_no_op(self):
+        checkpoint()